@@ -1,12 +1,15 @@
 """go-e Charger Cloud main integration file."""
 
 import asyncio
-import logging
+from collections import Counter
 from collections.abc import Callable
 from datetime import timedelta
+from functools import partial
+import logging
+import time
 
-import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
+
 from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN
 from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
 from homeassistant.components.select import DOMAIN as SELECT_DOMAIN
@@ -14,19 +17,54 @@ from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_TOKEN, CONF_HOST, CONF_NAME, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .cache import StateCache
 from .const import (
     CHARGERS_API,
+    COMMAND_QUEUES,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CHANGE_EVENTS,
     CONF_CHARGERS,
+    CONF_FLEET_COORDINATOR,
+    CONF_LOCAL_HOST,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METRICS,
+    CONF_PROFILING,
+    CONF_RATE_LIMIT,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SITE_CURRENT_LIMIT,
+    CONF_STATE_CACHE,
     DOMAIN,
+    FLEET_COORDINATOR,
     INIT_STATE,
+    LOAD_MANAGER,
+    STATE_CACHE,
+    STATE_FETCHERS,
+    SUPPRESSED_WRITES,
     UNSUB_OPTIONS_UPDATE_LISTENER,
 )
-from .controller import ChargerController, ping_charger
-from .state import StateFetcher, init_state
+from .controller import BATCH_CHANGE_CHARGING_SCHEMA, ChargerController, ping_charger
+from .coordinator import ChargerDataUpdateCoordinator
+from .diagnostics import DIAGNOSTICS_SCHEMA, async_handle_diagnostics_service
+from .load_balancer import LoadManager
+from .metrics import (
+    async_setup_metrics,
+    async_track_coordinator,
+    async_untrack_coordinator,
+)
+from .profiling import TIMINGS_SCHEMA, async_handle_timings_service, async_set_profiling
+from .rate_limiter import DEFAULT_RATE_LIMIT
+from .scheduler import AdaptivePollScheduler
+from .state import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT,
+    StateFetcher,
+    init_state,
+)
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -54,6 +92,7 @@ CONFIG_SCHEMA: vol.Schema = vol.Schema(
                                 vol.Required(CONF_NAME): vol.All(cv.string),
                                 vol.Required(CONF_HOST): vol.All(cv.string),
                                 vol.Required(CONF_API_TOKEN): vol.All(cv.string),
+                                vol.Optional(CONF_LOCAL_HOST): vol.All(cv.string),
                             }
                         ),
                     ],
@@ -64,6 +103,23 @@ CONFIG_SCHEMA: vol.Schema = vol.Schema(
                     cv.time_period,
                     vol.Clamp(min=MIN_UPDATE_INTERVAL, max=MAX_UPDATE_INTERVAL),
                 ),
+                vol.Optional(CONF_FLEET_COORDINATOR, default=False): cv.boolean,
+                vol.Optional(CONF_ADAPTIVE_POLLING, default=False): cv.boolean,
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                ): cv.positive_int,
+                vol.Optional(CONF_RATE_LIMIT, default=DEFAULT_RATE_LIMIT): vol.All(
+                    cv.positive_float, vol.Range(min=0.01)
+                ),
+                vol.Optional(
+                    CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT
+                ): cv.positive_float,
+                vol.Optional(CONF_SITE_CURRENT_LIMIT): cv.positive_int,
+                vol.Optional(CONF_STATE_CACHE, default=True): cv.boolean,
+                vol.Optional(CONF_CHANGE_EVENTS, default=False): cv.boolean,
+                vol.Optional(CONF_METRICS, default=False): cv.boolean,
+                vol.Optional(CONF_PROFILING, default=False): cv.boolean,
             }
         )
     },
@@ -75,23 +131,200 @@ def _setup_coordinator(
     hass: HomeAssistant,
     scan_interval: timedelta,
     coordinator_name: str,
-) -> DataUpdateCoordinator:
-    _LOGGER.debug("Configuring coordinator=%s", coordinator_name)
+    charger_names: list[str],
+    domain_config: dict | None = None,
+) -> ChargerDataUpdateCoordinator:
+    """
+    Set up a coordinator polling only the given chargers.
+
+    Every charger gets its coordinator registered as "<charger_name>_coordinator",
+    so entities can look it up regardless of whether it is shared by more chargers.
+    """
+    _LOGGER.debug(
+        "Configuring coordinator=%s for chargers=%s", coordinator_name, charger_names
+    )
 
-    state_fetcher: StateFetcher = StateFetcher(hass)
-    coordinator: DataUpdateCoordinator[dict] = DataUpdateCoordinator(
+    domain_config = domain_config if domain_config else {}
+    state_fetcher: StateFetcher = StateFetcher(
+        hass,
+        charger_names,
+        domain_config.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        domain_config.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+        AdaptivePollScheduler(scan_interval)
+        if domain_config.get(CONF_ADAPTIVE_POLLING, False)
+        else None,
+    )
+    coordinator: ChargerDataUpdateCoordinator = ChargerDataUpdateCoordinator(
         hass,
         _LOGGER,
         name=DOMAIN,
         update_method=state_fetcher.fetch_states,
         update_interval=scan_interval,
+        change_events=domain_config.get(CONF_CHANGE_EVENTS, False),
     )
     state_fetcher.coordinator = coordinator
     hass.data[DOMAIN][coordinator_name] = coordinator
+    async_track_coordinator(hass, coordinator_name, coordinator)
+
+    for charger_name in charger_names:
+        hass.data[DOMAIN][f"{charger_name}_coordinator"] = coordinator
+        hass.data[DOMAIN][INIT_STATE][STATE_FETCHERS][charger_name] = state_fetcher
 
     return coordinator
 
 
+def _restore_cached_data(hass: HomeAssistant, charger_names: list[str]) -> dict | None:
+    """Return the cached states of the chargers, None if any of them isn't cached."""
+    state_cache: StateCache | None = hass.data[DOMAIN][INIT_STATE].get(
+        STATE_CACHE, None
+    )
+
+    return state_cache.restore(charger_names) if state_cache is not None else None
+
+
+def _start_from_cache(
+    hass: HomeAssistant, coordinator: ChargerDataUpdateCoordinator, cached_data: dict
+) -> None:
+    """Start the coordinator with the stale cached states, the live refresh runs in the background."""
+    _LOGGER.debug("Restored cached states of the chargers=%s", list(cached_data))
+    coordinator.async_set_updated_data(cached_data)
+    hass.async_create_task(coordinator.async_refresh())
+
+
+async def _async_start_coordinator(
+    hass: HomeAssistant,
+    coordinator: ChargerDataUpdateCoordinator,
+    charger_names: list[str],
+) -> None:
+    """
+    Provide the first data of the coordinator.
+
+    If all its chargers are cached, the coordinator starts with the stale cached states and
+    the live refresh runs in the background. Otherwise the chargers are pinged and the setup
+    waits for the first refresh.
+    """
+    cached_data: dict | None = _restore_cached_data(hass, charger_names)
+
+    if cached_data is not None:
+        _start_from_cache(hass, coordinator, cached_data)
+        return
+
+    for charger_name in charger_names:
+        # handle platform not ready
+        await ping_charger(hass, charger_name)
+
+    await coordinator.async_config_entry_first_refresh()
+
+
+async def _async_ping_isolated(
+    hass: HomeAssistant,
+    charger_name: str,
+    semaphore: asyncio.Semaphore,
+    request_timeout: float,
+) -> bool:
+    """Ping the charger, if it fails log an error and return False instead of raising."""
+    try:
+        async with semaphore:
+            await asyncio.wait_for(ping_charger(hass, charger_name), request_timeout)
+    except (ConfigEntryNotReady, asyncio.TimeoutError) as ex:
+        _LOGGER.error(
+            "Can't reach the charger=%s, skipping its setup: %s", charger_name, repr(ex)
+        )
+        return False
+
+    return True
+
+
+async def _async_start_yaml_chargers(
+    hass: HomeAssistant,
+    scan_interval: timedelta,
+    charger_names: list[str],
+    domain_config: dict,
+) -> list[str]:
+    """
+    Set up coordinators of the YAML chargers concurrently and return the chargers which started.
+
+    At most max_concurrent_requests chargers are initialized at once. Cached chargers start
+    without waiting for the API. An unreachable charger is logged and skipped,
+    it doesn't prevent the setup of the other chargers.
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(
+        domain_config.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    )
+    request_timeout: float = domain_config.get(
+        CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+    )
+
+    if domain_config.get(CONF_FLEET_COORDINATOR, False):
+        # one shared coordinator, a single fetch feeds entities of all chargers
+        cached_data: dict | None = _restore_cached_data(hass, charger_names)
+
+        if cached_data is not None:
+            _start_from_cache(
+                hass,
+                _setup_coordinator(
+                    hass, scan_interval, FLEET_COORDINATOR, charger_names, domain_config
+                ),
+                cached_data,
+            )
+            return charger_names
+
+        reachable: list[bool] = await asyncio.gather(
+            *[
+                _async_ping_isolated(hass, charger_name, semaphore, request_timeout)
+                for charger_name in charger_names
+            ]
+        )
+        started_names: list[str] = [
+            charger_name
+            for charger_name, is_reachable in zip(charger_names, reachable)
+            if is_reachable
+        ]
+
+        if started_names:
+            await _setup_coordinator(
+                hass, scan_interval, FLEET_COORDINATOR, started_names, domain_config
+            ).async_refresh()
+
+        return started_names
+
+    async def start_charger(charger_name: str) -> bool:
+        cached_data: dict | None = _restore_cached_data(hass, [charger_name])
+
+        if cached_data is None and not await _async_ping_isolated(
+            hass, charger_name, semaphore, request_timeout
+        ):
+            return False
+
+        coordinator: ChargerDataUpdateCoordinator = _setup_coordinator(
+            hass,
+            scan_interval,
+            f"{charger_name}_coordinator",
+            [charger_name],
+            domain_config,
+        )
+
+        if cached_data is not None:
+            _start_from_cache(hass, coordinator, cached_data)
+        else:
+            async with semaphore:
+                await coordinator.async_refresh()
+
+        return True
+
+    started: list[bool] = await asyncio.gather(
+        *[start_charger(charger_name) for charger_name in charger_names]
+    )
+
+    return [
+        charger_name
+        for charger_name, is_started in zip(charger_names, started)
+        if is_started
+    ]
+
+
 def _setup_apis(hass: HomeAssistant, config: ConfigType) -> dict:
     chargers_api: dict = {}
 
@@ -110,7 +343,14 @@ def _setup_apis(hass: HomeAssistant, config: ConfigType) -> dict:
             token: str = charger[0][CONF_API_TOKEN]
 
             _LOGGER.debug("Configuring API for the charger=%s", name)
-            chargers_api[name] = init_state(name, url, token)
+            chargers_api[name] = init_state(
+                hass,
+                name,
+                url,
+                token,
+                config[DOMAIN].get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                charger[0].get(CONF_LOCAL_HOST, None),
+            )
 
     else:
         _LOGGER.warning("Missing %s entry in the config", DOMAIN)
@@ -125,7 +365,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     Set up a charger defined via the UI. This includes.
 
     - setup of the API
-    - coordinator
+    - coordinator, with the adaptive polling and request timeout from the options
     - sensors
     - buttons
     - number inputs
@@ -146,17 +386,23 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     url: str = options[CONF_HOST]
     token: str = options[CONF_API_TOKEN]
 
+    setup_start: float = time.monotonic()
     _LOGGER.debug("Configuring API for the charger=%s", entry_id)
-    hass.data[DOMAIN][INIT_STATE][CHARGERS_API][entry_id] = init_state(name, url, token)
-
-    # handle platform not ready
-    await ping_charger(hass, entry_id)
+    hass.data[DOMAIN][INIT_STATE][CHARGERS_API][entry_id] = init_state(
+        hass, name, url, token, local_host=options.get(CONF_LOCAL_HOST, None) or None
+    )
 
-    await _setup_coordinator(
+    await _async_start_coordinator(
         hass,
-        scan_interval,
-        f"{entry_id}_coordinator",
-    ).async_config_entry_first_refresh()
+        _setup_coordinator(
+            hass,
+            scan_interval,
+            f"{entry_id}_coordinator",
+            [entry_id],
+            dict(options),
+        ),
+        [entry_id],
+    )
 
     hass.data[DOMAIN][entry_id] = data
 
@@ -172,7 +418,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         entry_id
     ] = unsub_options_update_listener
 
-    _LOGGER.debug("Entry setup for %s completed", entry_id)
+    _LOGGER.debug(
+        "Entry setup for %s completed in %.2f s",
+        entry_id,
+        time.monotonic() - setup_start,
+    )
 
     return True
 
@@ -210,6 +460,16 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     # Remove config entry from the domain.
     if unload_ok:
         hass.data[DOMAIN][INIT_STATE][CHARGERS_API].pop(entry_id)
+        hass.data[DOMAIN][INIT_STATE][STATE_FETCHERS].pop(entry_id, None)
+        command_queue = hass.data[DOMAIN][INIT_STATE][COMMAND_QUEUES].pop(
+            entry_id, None
+        )
+
+        if command_queue is not None:
+            command_queue.cancel()
+
+        async_untrack_coordinator(hass, f"{entry_id}_coordinator")
+        hass.data[DOMAIN].pop(f"{entry_id}_coordinator", None)
 
     _LOGGER.debug("Unloaded the entry=%s", entry_id)
 
@@ -223,7 +483,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     hass.data[DOMAIN] = hass.data[DOMAIN] if DOMAIN in hass.data else {}
     domain_config: dict = config[DOMAIN] if DOMAIN in config else {}
-    charger_controller: ChargerController = ChargerController(hass)
+    charger_controller: ChargerController = ChargerController(
+        hass,
+        domain_config.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+    )
 
     # expose services for other integrations
     hass.services.async_register(
@@ -239,12 +504,38 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.services.async_register(
         DOMAIN, "set_transaction", charger_controller.set_transaction
     )
+    hass.services.async_register(
+        DOMAIN,
+        "batch_change_charging",
+        charger_controller.batch_change_charging,
+        schema=BATCH_CHANGE_CHARGING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "timings",
+        partial(async_handle_timings_service, hass),
+        schema=TIMINGS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "diagnostics",
+        partial(async_handle_diagnostics_service, hass),
+        schema=DIAGNOSTICS_SCHEMA,
+    )
+
+    if domain_config.get(CONF_PROFILING, False):
+        async_set_profiling(hass, True)
 
-    scan_interval: timedelta = DEFAULT_UPDATE_INTERVAL
+    scan_interval: timedelta = domain_config.get(
+        CONF_SCAN_INTERVAL, DEFAULT_UPDATE_INTERVAL
+    )
     chargers_api: dict = _setup_apis(hass, config)
 
     hass.data[DOMAIN][INIT_STATE] = {
         CHARGERS_API: chargers_api,
+        COMMAND_QUEUES: {},
+        STATE_FETCHERS: {},
+        SUPPRESSED_WRITES: Counter(),
         UNSUB_OPTIONS_UPDATE_LISTENER: {},
     }
 
@@ -252,14 +543,34 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         charger[0][CONF_NAME] for charger in domain_config.get(CONF_CHARGERS, [])
     ]
 
-    for charger_name in charger_names:
-        # handle platform not ready
-        await ping_charger(hass, charger_name)
-        await _setup_coordinator(
-            hass,
-            scan_interval,
-            f"{charger_name}_coordinator",
-        ).async_config_entry_first_refresh()
+    if domain_config.get(CONF_METRICS, False):
+        async_setup_metrics(hass)
+
+    if domain_config.get(CONF_STATE_CACHE, True):
+        state_cache: StateCache = StateCache(hass)
+        await state_cache.async_load()
+        hass.data[DOMAIN][INIT_STATE][STATE_CACHE] = state_cache
+
+    setup_start: float = time.monotonic()
+    configured_count: int = len(charger_names)
+    charger_names = await _async_start_yaml_chargers(
+        hass, scan_interval, charger_names, domain_config
+    )
+
+    if configured_count:
+        _LOGGER.info(
+            "Set up %s of %s chargers in %.2f s",
+            len(charger_names),
+            configured_count,
+            time.monotonic() - setup_start,
+        )
+
+    if CONF_SITE_CURRENT_LIMIT in domain_config and charger_names:
+        load_manager: LoadManager = LoadManager(
+            hass, domain_config[CONF_SITE_CURRENT_LIMIT], charger_names
+        )
+        load_manager.async_setup()
+        hass.data[DOMAIN][INIT_STATE][LOAD_MANAGER] = load_manager
 
     # load all platforms
     for platform in PLATFORMS:
@@ -0,0 +1,320 @@
+"""Asynchronous go-e Charger Cloud API (v2) client."""
+
+import asyncio
+from http import HTTPStatus
+import json
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from goechargerv2.goecharger import GoeChargerStatusMapper
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import (
+    API_SESSIONS,
+    CAR_STATUS,
+    CHARGER_ACCESS,
+    CHARGER_FORCE_CHARGING,
+    CHARGER_MAX_CURRENT,
+    CHARGING_ALLOWED,
+    CURRENT_L1,
+    CURRENT_L2,
+    CURRENT_L3,
+    ENERGY_SINCE_CAR_CONNECTED,
+    ENERGY_TOTAL,
+    MAX_CHARGING_CURRENT_LIMIT,
+    MIN_CHARGING_CURRENT_LIMIT,
+    PHASE_SWITCH_MODE,
+    PHASES_NUMBER_CONNECTED,
+    TRANSACTION,
+)
+from .rate_limiter import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    RateLimitedError,
+    TokenBucket,
+    parse_retry_after,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT: int = 5
+DEFAULT_LOCAL_TIMEOUT: int = 2
+# after a failure of the local API, requests go to the cloud for this period (in seconds)
+LOCAL_RETRY_INTERVAL: float = 60.0
+
+TRANSPORT_CLOUD: str = "cloud"
+TRANSPORT_LOCAL: str = "local"
+MAX_CURRENT: int = 32
+
+# mapping of the human readable status attributes to the API keys they are read from
+STATUS_API_KEYS: dict[str, str] = {
+    CAR_STATUS: "car",
+    CHARGER_ACCESS: "acs",
+    CHARGER_FORCE_CHARGING: "frc",
+    CHARGER_MAX_CURRENT: "amp",
+    CHARGING_ALLOWED: "alw",
+    CURRENT_L1: "nrg",
+    CURRENT_L2: "nrg",
+    CURRENT_L3: "nrg",
+    ENERGY_SINCE_CAR_CONNECTED: "wh",
+    ENERGY_TOTAL: "eto",
+    MAX_CHARGING_CURRENT_LIMIT: "ama",
+    MIN_CHARGING_CURRENT_LIMIT: "mca",
+    PHASE_SWITCH_MODE: "psm",
+    PHASES_NUMBER_CONNECTED: "pnp",
+    TRANSACTION: "trx",
+}
+
+
+def map_parameters(parameters: dict[str, Any]) -> dict:
+    """Map API parameters (e.g. from a set request) into human readable status attributes."""
+    mapped_parameters: dict = GoeChargerStatusMapper().map_api_status_response(
+        parameters
+    )
+
+    return {
+        key: mapped_parameters[key]
+        for key, api_key in STATUS_API_KEYS.items()
+        if api_key in parameters
+    }
+
+
+def clamp_current(current: int) -> int:
+    """Clamp the current in Amperes to the range supported by the API (0 - 32 A)."""
+    return min(max(current, 0), MAX_CURRENT)
+
+
+@callback
+def async_get_host_session(hass: HomeAssistant, host: str) -> aiohttp.ClientSession:
+    """
+    Return a keep-alive session shared by all API clients talking to the same host.
+
+    Sessions are HTTP/1.1 and use the Home Assistant connector pool, so subsequent
+    requests to the host re-use the already opened connection. They are closed
+    automatically when Home Assistant stops.
+    """
+
+    sessions: dict[str, aiohttp.ClientSession] = hass.data.setdefault(API_SESSIONS, {})
+    session: aiohttp.ClientSession | None = sessions.get(host, None)
+
+    if session is not None and not session.closed:
+        return session
+
+    _LOGGER.debug("Creating API session for the host=%s", host)
+    new_session: aiohttp.ClientSession = async_create_clientsession(
+        hass, version=aiohttp.HttpVersion11
+    )
+    sessions[host] = new_session
+
+    return new_session
+
+
+class GoeChargerAsyncApi:
+    """
+    Async counterpart of the goechargerv2 GoeChargerApi.
+
+    Provides methods for querying the status and setting of the parameters via API calls.
+    Responses are mapped into the same human readable format as by the goechargerv2 library.
+
+    If status keys are provided, only these are requested via the filter query parameter.
+    In case the filtered response is incomplete, the client falls back to the full status.
+
+    If a rate limiter is provided, every cloud request takes a token from it, set requests
+    with the command priority. A 429 response pauses the rate limiter for the Retry-After period.
+
+    If a local host is provided, requests go straight to the local API (v2) of the wallbox
+    in the LAN, which has the same endpoints and responses as the cloud API. If the local
+    API fails, the request falls back to the cloud, which is used for the next
+    LOCAL_RETRY_INTERVAL seconds before the local API is tried again.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        session: aiohttp.ClientSession,
+        timeout: int = DEFAULT_TIMEOUT,
+        status_keys: list[str] | None = None,
+        rate_limiter: TokenBucket | None = None,
+        local_host: str | None = None,
+        local_session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        """Construct the API client with a (shared) session."""
+        self.host: str = host
+        self.local_host: str | None = local_host
+        self.transport: str = TRANSPORT_LOCAL if local_host else TRANSPORT_CLOUD
+        self._local_session: aiohttp.ClientSession = local_session or session
+        self._local_timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(
+            total=min(timeout, DEFAULT_LOCAL_TIMEOUT)
+        )
+        self._local_retry_at: float = 0
+        self._headers: dict[str, str] = {"Authorization": f"Basic {token}"}
+        self._session: aiohttp.ClientSession = session
+        self.rate_limiter: TokenBucket | None = rate_limiter
+        self._timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=timeout)
+        self._status_keys: list[str] = [
+            key for key in status_keys or [] if key in STATUS_API_KEYS
+        ]
+        self._status_filter: str | None = (
+            # more attributes can be read from the same API key, e.g. nrg
+            ",".join(dict.fromkeys(STATUS_API_KEYS[key] for key in self._status_keys))
+            if self._status_keys
+            else None
+        )
+
+    async def _request_local(
+        self, path: str, params: dict[str, str] | None = None
+    ) -> Any:
+        """Call the local API of the wallbox and return the decoded JSON response body."""
+        try:
+            async with self._local_session.get(
+                f"{self.local_host}{path}",
+                params=params,
+                timeout=self._local_timeout,
+            ) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except asyncio.TimeoutError as ex:
+            raise RuntimeError(f"Request to {self.local_host}{path} timed out") from ex
+
+    async def _request(
+        self,
+        path: str,
+        params: dict[str, str] | None = None,
+        priority: int = PRIORITY_POLL,
+    ) -> Any:
+        """Call the API and return the decoded JSON response body."""
+        if self.local_host is not None and time.monotonic() >= self._local_retry_at:
+            try:
+                local_response: Any = await self._request_local(path, params)
+                self.transport = TRANSPORT_LOCAL
+                return local_response
+            except (aiohttp.ClientError, RuntimeError, json.JSONDecodeError) as ex:
+                _LOGGER.warning(
+                    "Local API of the host=%s failed, falling back to the cloud: %s",
+                    self.local_host,
+                    repr(ex),
+                )
+                self._local_retry_at = time.monotonic() + LOCAL_RETRY_INTERVAL
+
+        self.transport = TRANSPORT_CLOUD
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.async_acquire(priority)
+
+        try:
+            async with self._session.get(
+                f"{self.host}{path}",
+                headers=self._headers,
+                params=params,
+                timeout=self._timeout,
+            ) as response:
+                if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                    retry_after: float = parse_retry_after(
+                        response.headers.get("Retry-After", None)
+                    )
+                    _LOGGER.warning(
+                        "API quota of the host=%s exceeded, pausing requests for %s s",
+                        self.host,
+                        retry_after,
+                    )
+
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.pause(retry_after)
+
+                    raise RateLimitedError(f"Request to {self.host}{path} was rejected")
+
+                return await response.json(content_type=None)
+        except asyncio.TimeoutError as ex:
+            raise RuntimeError(f"Request to {self.host}{path} timed out") from ex
+        except json.JSONDecodeError:
+            return {}
+
+    async def set_parameters(self, parameters: dict[str, Any]) -> dict:
+        """Set one or more API parameters with a single API call. Values are JSON encoded."""
+        set_response: Any = await self._request(
+            "/api/set",
+            {key: json.dumps(value) for key, value in parameters.items()},
+            PRIORITY_COMMAND,
+        )
+
+        mapped_response: dict = GoeChargerStatusMapper().map_api_status_response(
+            set_response or {}
+        )
+
+        return mapped_response
+
+    async def _request_filtered_status(self, status_filter: str) -> Any:
+        """
+        Request only the filtered status keys.
+
+        If the response is incomplete, the full status is requested instead, only for this
+        request. The filter is used again by the next one.
+        """
+        status: Any = await self._request("/api/status", {"filter": status_filter})
+
+        if not status:
+            # non-JSON or empty response, e.g. from a failing proxy
+            raise RuntimeError(f"Filtered status request to {self.host} failed")
+
+        if isinstance(status, dict) and (
+            set(status_filter.split(",")).issubset(status.keys())
+            or status.get("reason", None) == "Data is outdated"
+        ):
+            return status
+
+        _LOGGER.warning(
+            "Filtered status request for the host=%s is incomplete, falling back to the full status",
+            self.host,
+        )
+
+        return await self._request("/api/status")
+
+    async def request_status(self) -> dict:
+        """Call the status API to retrieve a car status."""
+        status_filter: str | None = self._status_filter
+        status: Any = (
+            await self._request("/api/status")
+            if status_filter is None
+            else await self._request_filtered_status(status_filter)
+        )
+
+        if not status or status.get("success") is False:
+            if status and status.get("reason", None) == "Data is outdated":
+                return {"success": False, "msg": "Wallbox is offline"}
+
+            raise RuntimeError(f"Request failed with: {status}")
+
+        mapped_status: dict = GoeChargerStatusMapper().map_api_status_response(status)
+
+        if status_filter is None:
+            return mapped_status
+
+        # other attributes would contain only default values of the mapper
+        return {key: mapped_status[key] for key in self._status_keys}
+
+    async def set_force_charging(self, allow: bool) -> dict:
+        """Set the force charging. Possible values: 0 (neutral), 1 (off), 2 (on)."""
+        return await self.set_parameters({"frc": 2 if allow else 1})
+
+    async def set_max_current(self, current: int) -> dict:
+        """Set the current in Amperes. Minimum is 0, maximum is 32 Amperes."""
+        return await self.set_parameters({"amp": clamp_current(current)})
+
+    async def set_phase(self, phase: int) -> dict:
+        """Set the phase. Possible values: 0 (auto), 1 (1 phase), 2 (3 phases)."""
+        if phase not in [0, 1, 2]:
+            raise ValueError(f"phase={phase} is unsupported")
+
+        return await self.set_parameters({"psm": phase})
+
+    async def set_transaction(self, status: int | None) -> dict:
+        """Set the transaction. Possible values: None (no transaction), 0 (all users)."""
+        if status not in [None, 0]:
+            raise ValueError(f"transaction status={status} is unsupported")
+
+        return await self.set_parameters({"trx": status})
@@ -15,22 +15,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import (
-    CAR_STATUS,
-    CONF_CHARGERS,
-    DOMAIN,
-    OFFLINE,
-    ONLINE,
-    STATUS,
-    WALLBOX_CONTROL,
-    CarStatus,
-)
+from .const import CONF_CHARGERS, DOMAIN, OFFLINE, ONLINE, WALLBOX_CONTROL, CarStatus
 from .controller import ChargerController, init_service_data
+from .entity import ChargerEntity
+from .model import ChargerState
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -42,7 +32,7 @@ class BaseButtonDescription(ButtonEntityDescription):
     press_args: None = None
 
 
-class WallboxControlButton(CoordinatorEntity, ButtonEntity):
+class WallboxControlButton(ChargerEntity, ButtonEntity):
     """Representation of a Charge Button."""
 
     def __init__(
@@ -65,25 +55,25 @@ class WallboxControlButton(CoordinatorEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press. Start/stop charging or authenticate the user."""
 
-        data: dict = self.coordinator.data[self._device_id]
+        data: ChargerState = self.coordinator.data[self._device_id]
 
-        if data[STATUS] == OFFLINE:
+        if data.status == OFFLINE:
             return
 
         # service_data = init_service_data({"device_name": self._device_id})
 
-        if data[CAR_STATUS] == CarStatus.CAR_CHARGING:
+        if data.car_status == CarStatus.CAR_CHARGING:
             # car status is 2 - stop charging
             await self._charger_controller.stop_charging(
                 init_service_data({"device_name": self._device_id}, "stop_charging")
             )
-        elif data[CAR_STATUS] == CarStatus.CAR_CONNECTED_AUTH_REQUIRED:
+        elif data.car_status == CarStatus.CAR_CONNECTED_AUTH_REQUIRED:
             # car status is 3 - authenticate
             service_data = init_service_data(
                 {"device_name": self._device_id, "status": 0}, "set_transaction"
             )
             await self._charger_controller.set_transaction(service_data)
-        elif data[CAR_STATUS] == CarStatus.CHARGING_FINISHED_DISCONNECT:
+        elif data.car_status == CarStatus.CHARGING_FINISHED_DISCONNECT:
             # car status is 4 - start charging
             await self._charger_controller.start_charging(
                 init_service_data({"device_name": self._device_id}, "start_charging")
@@ -96,18 +86,18 @@ class WallboxControlButton(CoordinatorEntity, ButtonEntity):
     def name(self) -> str:
         """Return the name of the sensor."""
 
-        data: dict = self.coordinator.data[self._device_id]
+        data: ChargerState = self.coordinator.data[self._device_id]
 
-        if data[STATUS] == OFFLINE:
+        if data.status == OFFLINE:
             return "Wallbox is offline"
 
-        if data[CAR_STATUS] == CarStatus.CAR_CHARGING:
+        if data.car_status == CarStatus.CAR_CHARGING:
             # car status is 2 - stop charging
             return "Stop charging"
-        if data[CAR_STATUS] == CarStatus.CAR_CONNECTED_AUTH_REQUIRED:
+        if data.car_status == CarStatus.CAR_CONNECTED_AUTH_REQUIRED:
             # car status is 3 - authenticate
             return "Authenticate car"
-        if data[CAR_STATUS] == CarStatus.CHARGING_FINISHED_DISCONNECT:
+        if data.car_status == CarStatus.CHARGING_FINISHED_DISCONNECT:
             # car status is 4 - start charging
             return "Start charging"
 
@@ -118,11 +108,10 @@ class WallboxControlButton(CoordinatorEntity, ButtonEntity):
     def available(self) -> Any:
         """Make the button (un)available based on the status."""
 
-        data: dict = self.coordinator.data[self._device_id]
+        data: ChargerState = self.coordinator.data[self._device_id]
 
         return (
-            data[STATUS] == ONLINE
-            and data[CAR_STATUS] != CarStatus.CHARGER_READY_NO_CAR
+            data.status == ONLINE and data.car_status != CarStatus.CHARGER_READY_NO_CAR
         )
 
     @property
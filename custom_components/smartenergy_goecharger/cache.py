@@ -0,0 +1,75 @@
+"""Persistent cache of the last good charger states."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, ONLINE, STALE
+from .model import ChargerState
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+STORAGE_KEY: str = f"{DOMAIN}.state_cache"
+STORAGE_VERSION: int = 1
+SAVE_DELAY: float = 60.0
+
+
+class StateCache:
+    """
+    Last good (online) state of each charger, persisted via the Home Assistant storage.
+
+    On boot, coordinators are restored from the cache, so entities come up immediately
+    with the stale flag set, while the live refresh runs in the background. Writes are
+    delayed and merged, so polling doesn't hit the disk on every tick.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Construct the cache, call async_load before restoring states."""
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots: dict[str, dict] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    async def async_load(self) -> None:
+        """Load the cached states from the storage."""
+        self._snapshots = await self._store.async_load() or {}
+        _LOGGER.debug("Loaded cached states of %s chargers", len(self._snapshots))
+
+    def restore(self, charger_names: list[str]) -> dict[str, ChargerState] | None:
+        """
+        Return the stale states of the chargers, or None if any of them isn't cached.
+
+        Restored chargers are counted as hits, chargers which weren't restored as misses.
+        """
+        if not all(charger_name in self._snapshots for charger_name in charger_names):
+            self.misses += len(charger_names)
+            return None
+
+        self.hits += len(charger_names)
+
+        return {
+            charger_name: ChargerState.from_status(
+                self._snapshots[charger_name],
+                self._snapshots[charger_name].get("name", None),
+                ONLINE,
+            ).replace(**{STALE: True})
+            for charger_name in charger_names
+        }
+
+    @callback
+    def async_save_states(self, data: dict[str, ChargerState]) -> None:
+        """Update the cache with the fetched online states and schedule the write."""
+        changed: bool = False
+
+        for charger_name, state in data.items():
+            if state.status != ONLINE or state.stale:
+                continue
+
+            self._snapshots[charger_name] = {
+                key: value for key, value in state.items() if key != STALE
+            }
+            changed = True
+
+        if changed:
+            self._store.async_delay_save(lambda: self._snapshots, SAVE_DELAY)
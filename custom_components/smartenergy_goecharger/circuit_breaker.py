@@ -0,0 +1,103 @@
+"""Circuit breaker of the go-e Charger Cloud chargers polling."""
+
+from datetime import datetime, timedelta
+import random
+
+from homeassistant.util import dt as dt_util
+
+BREAKER_CLOSED: str = "closed"
+BREAKER_OPEN: str = "open"
+BREAKER_HALF_OPEN: str = "half_open"
+
+# diagnostic sensor of the breaker and its attributes
+ATTR_CIRCUIT_BREAKER: str = "circuit_breaker"
+ATTR_CONSECUTIVE_FAILURES: str = "consecutive_failures"
+ATTR_NEXT_PROBE: str = "next_probe"
+
+DEFAULT_FAILURE_THRESHOLD: int = 3
+DEFAULT_BASE_BACKOFF: timedelta = timedelta(seconds=30)
+DEFAULT_MAX_BACKOFF: timedelta = timedelta(minutes=10)
+# +/- share of the backoff, so chargers failing together don't probe together
+DEFAULT_JITTER: float = 0.2
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a single charger.
+
+    - closed: requests pass, consecutive failures are counted. Once they reach
+      the failure threshold, the breaker opens.
+    - open: requests are skipped until the backoff elapses, then a single probe is let through
+      and the breaker is half-open.
+    - half-open: a successful probe closes the breaker, a failed one opens it again
+      with a doubled backoff.
+
+    The backoff grows exponentially from the base backoff up to the max backoff, with jitter.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_backoff: timedelta = DEFAULT_BASE_BACKOFF,
+        max_backoff: timedelta = DEFAULT_MAX_BACKOFF,
+        jitter: float = DEFAULT_JITTER,
+    ) -> None:
+        """Construct a closed breaker."""
+        self._failure_threshold: int = failure_threshold
+        self._base_backoff: timedelta = base_backoff
+        self._max_backoff: timedelta = max_backoff
+        self._jitter: float = jitter
+        self._trips: int = 0
+        self.state: str = BREAKER_CLOSED
+        self.consecutive_failures: int = 0
+        self.next_probe: datetime | None = None
+
+    def _backoff(self) -> timedelta:
+        """Return the jittered backoff of the current trip."""
+        backoff: timedelta = min(
+            self._base_backoff * 2 ** (self._trips - 1), self._max_backoff
+        )
+
+        return backoff * random.uniform(1 - self._jitter, 1 + self._jitter)
+
+    def allow_request(self) -> bool:
+        """Return True if the charger should be requested now."""
+        if self.state == BREAKER_CLOSED:
+            return True
+
+        if (
+            self.state == BREAKER_OPEN
+            and self.next_probe is not None
+            and dt_util.utcnow() >= self.next_probe
+        ):
+            self.state = BREAKER_HALF_OPEN
+            return True
+
+        return False
+
+    def release_probe(self) -> None:
+        """Let the next request probe again, e.g. if the probe wasn't sent at all."""
+        if self.state == BREAKER_HALF_OPEN:
+            self.state = BREAKER_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.next_probe = None
+        self._trips = 0
+
+    def record_failure(self) -> bool:
+        """Count the failure, return True if the breaker opened because of it."""
+        self.consecutive_failures += 1
+
+        if (
+            self.state == BREAKER_HALF_OPEN
+            or self.consecutive_failures >= self._failure_threshold
+        ):
+            self._trips += 1
+            self.state = BREAKER_OPEN
+            self.next_probe = dt_util.utcnow() + self._backoff()
+            return True
+
+        return False
@@ -0,0 +1,190 @@
+"""Debounced command queue for the go-e Charger Cloud writes."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .api import GoeChargerAsyncApi, map_parameters
+from .const import API, CHARGERS_API, DOMAIN, INIT_STATE, STATE_FETCHERS
+
+if TYPE_CHECKING:
+    from .model import ChargerState
+    from .state import StateFetcher
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_DELAY: float = 0.3
+DEFAULT_MAX_DEBOUNCE_DELAY: float = 1.0
+CONFIRMATION_DELAY: float = 5.0
+
+
+class ChargerCommandQueue:
+    """
+    Per-charger queue merging pending writes into a single API call.
+
+    Every queued write (re)starts the debounce timer, but the first pending write is never
+    delayed by more than max_delay. Pending parameters are merged, so only the latest
+    value of each parameter is sent. After the write, the coordinator data are patched
+    optimistically and all callers waiting for the merged write are resolved.
+
+    A delayed confirmation fetch of the charger then checks the patched attributes. If the
+    charger disagrees, the patch is rolled back to the fetched state.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        charger_name: str,
+        delay: float = DEFAULT_DEBOUNCE_DELAY,
+        max_delay: float = DEFAULT_MAX_DEBOUNCE_DELAY,
+    ) -> None:
+        """Construct the queue for a single charger."""
+        self._hass: HomeAssistant = hass
+        self._charger_name: str = charger_name
+        self._delay: float = delay
+        self._max_delay: float = max_delay
+        self._pending: dict[str, Any] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._first_pending_at: float | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unconfirmed: dict[str, Any] = {}
+        self._unsub_confirm: CALLBACK_TYPE | None = None
+
+    @property
+    def _coordinator(self) -> DataUpdateCoordinator:
+        return self._hass.data[DOMAIN][f"{self._charger_name}_coordinator"]
+
+    def cancel(self) -> None:
+        """Cancel scheduled writes and confirmations, e.g. when the charger is unloaded."""
+        for unsub in (self._unsub_flush, self._unsub_confirm):
+            if unsub is not None:
+                unsub()
+
+        self._unsub_flush = None
+        self._unsub_confirm = None
+
+        for waiter in self._waiters:
+            waiter.cancel()
+
+    async def async_set(self, parameters: dict[str, Any]) -> None:
+        """Queue parameters and wait until they are written."""
+        loop: asyncio.AbstractEventLoop = self._hass.loop
+        waiter: asyncio.Future = loop.create_future()
+
+        self._pending.update(parameters)
+        self._waiters.append(waiter)
+
+        if self._first_pending_at is None:
+            self._first_pending_at = loop.time()
+
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+
+        self._unsub_flush = async_call_later(
+            self._hass,
+            max(
+                min(
+                    self._delay, self._first_pending_at + self._max_delay - loop.time()
+                ),
+                0,
+            ),
+            self._async_flush,
+        )
+
+        await waiter
+
+    def _patch_state(self, patch: dict[str, Any]) -> None:
+        """Patch the charger attributes in the coordinator data and notify listeners."""
+        if (
+            not self._coordinator.data
+            or self._charger_name not in self._coordinator.data
+        ):
+            # nothing fetched yet, the next poll brings the state
+            return
+
+        self._replace_state(self._coordinator.data[self._charger_name].replace(**patch))
+
+    def _replace_state(self, state: ChargerState) -> None:
+        """Replace the charger state in the coordinator data and notify listeners."""
+        updated_data: dict = dict(self._coordinator.data or {})
+        updated_data[self._charger_name] = state
+        self._coordinator.async_set_updated_data(updated_data)
+
+    async def _async_confirm(self, _now: datetime) -> None:
+        """Fetch the charger state and roll back the optimistic patch if it differs."""
+        unconfirmed: dict[str, Any] = self._unconfirmed
+        self._unconfirmed = {}
+        self._unsub_confirm = None
+
+        state_fetcher: StateFetcher = self._hass.data[DOMAIN][INIT_STATE][
+            STATE_FETCHERS
+        ][self._charger_name]
+        fetched_data: ChargerState = await state_fetcher.fetch_charger_state(
+            self._charger_name, self._coordinator.data
+        )
+        # attributes which weren't fetched (e.g. filtered out) can't confirm the change
+        fetched_status: dict = state_fetcher.last_status.get(self._charger_name, {})
+        rejected: dict[str, Any] = {
+            key: fetched_data.get(key, None)
+            for key, value in unconfirmed.items()
+            if key in fetched_status and fetched_data.get(key, None) != value
+        }
+
+        if rejected:
+            _LOGGER.warning(
+                "Device=%s didn't confirm the change=%s, rolling back to=%s",
+                self._charger_name,
+                unconfirmed,
+                rejected,
+            )
+            self._replace_state(fetched_data)
+
+    async def _async_flush(self, _now: datetime) -> None:
+        """Send all pending parameters with one API call and patch the state."""
+        parameters: dict[str, Any] = self._pending
+        waiters: list[asyncio.Future] = self._waiters
+        self._pending = {}
+        self._waiters = []
+        self._first_pending_at = None
+        self._unsub_flush = None
+
+        _LOGGER.debug(
+            "Sending merged parameters=%s of %s commands to the device=%s",
+            parameters,
+            len(waiters),
+            self._charger_name,
+        )
+
+        api: GoeChargerAsyncApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
+            self._charger_name
+        ][API]
+
+        try:
+            await api.set_parameters(parameters)
+        except Exception as ex:  # pylint: disable=broad-except
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(ex)
+            return
+
+        patch: dict[str, Any] = map_parameters(parameters)
+        self._patch_state(patch)
+        self._unconfirmed.update(patch)
+
+        if self._unsub_confirm is not None:
+            self._unsub_confirm()
+
+        self._unsub_confirm = async_call_later(
+            self._hass, CONFIRMATION_DELAY, self._async_confirm
+        )
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
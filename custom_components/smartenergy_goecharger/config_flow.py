@@ -4,7 +4,6 @@ import logging
 import re
 from typing import Any, Literal
 
-from goechargerv2.goecharger import GoeChargerApi
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
@@ -13,10 +12,18 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .api import GoeChargerAsyncApi, async_get_host_session
+from .const import CONF_ADAPTIVE_POLLING, CONF_LOCAL_HOST, CONF_REQUEST_TIMEOUT, DOMAIN
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
+# optional fields, they aren't submitted if left empty
+OPTIONAL_KEYS: list[str] = [
+    CONF_LOCAL_HOST,
+    CONF_ADAPTIVE_POLLING,
+    CONF_REQUEST_TIMEOUT,
+]
+
 
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
@@ -34,6 +41,24 @@ def _get_config_schema(default_values: dict) -> vol.Schema:
                 CONF_SCAN_INTERVAL,
                 default=default_values.get(CONF_SCAN_INTERVAL, 10),
             ): vol.All(vol.Coerce(int), vol.Range(10, 60000)),
+            # local API of the wallbox in the LAN, the cloud is used as a fallback
+            vol.Optional(
+                CONF_LOCAL_HOST,
+                description={"suggested_value": default_values.get(CONF_LOCAL_HOST)},
+            ): str,
+            # polling settings of the YAML config, defaults are used if not set
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                description={
+                    "suggested_value": default_values.get(CONF_ADAPTIVE_POLLING)
+                },
+            ): bool,
+            vol.Optional(
+                CONF_REQUEST_TIMEOUT,
+                description={
+                    "suggested_value": default_values.get(CONF_REQUEST_TIMEOUT)
+                },
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
         }
     )
 
@@ -54,10 +79,12 @@ def _validate_host(host: str) -> None:
 
 async def _ping_host(hass: HomeAssistant, host: str, token: str) -> None:
     """Do a simple status request to check if the authentication works properly."""
-    api: GoeChargerApi = GoeChargerApi(host, token, wait=True)
+    api: GoeChargerAsyncApi = GoeChargerAsyncApi(
+        host, token, async_get_host_session(hass, host)
+    )
 
     try:
-        await hass.async_add_executor_job(api.request_status)
+        await api.request_status()
     except Exception as exc:
         raise InvalidAuth from exc
 
@@ -68,6 +95,13 @@ async def _validate_user_input(hass: HomeAssistant, user_input: dict) -> dict:
 
     try:
         _validate_host(user_input[CONF_HOST])
+
+        if user_input.get(CONF_LOCAL_HOST, None):
+            try:
+                _validate_host(user_input[CONF_LOCAL_HOST])
+            except ValueError as exc:
+                raise ValueError("invalid_local_host") from exc
+
         await _ping_host(hass, user_input[CONF_HOST], user_input[CONF_API_TOKEN])
     except InvalidAuth:
         errors["base"] = "invalid_auth"
@@ -111,6 +145,9 @@ class GoeChargerConfigFlow(ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg]
                     CONF_HOST: user_input.get(CONF_HOST),
                     CONF_API_TOKEN: user_input.get(CONF_API_TOKEN),
                     CONF_SCAN_INTERVAL: user_input.get(CONF_SCAN_INTERVAL),
+                    CONF_LOCAL_HOST: user_input.get(CONF_LOCAL_HOST),
+                    CONF_ADAPTIVE_POLLING: user_input.get(CONF_ADAPTIVE_POLLING),
+                    CONF_REQUEST_TIMEOUT: user_input.get(CONF_REQUEST_TIMEOUT),
                 }
             )
 
@@ -147,6 +184,13 @@ class GoeChargerOptionsFlowHandler(OptionsFlow):
                 CONF_HOST: self.config_entry.options.get(CONF_HOST),
                 CONF_API_TOKEN: self.config_entry.options.get(CONF_API_TOKEN),
                 CONF_SCAN_INTERVAL: self.config_entry.options.get(CONF_SCAN_INTERVAL),
+                CONF_LOCAL_HOST: self.config_entry.options.get(CONF_LOCAL_HOST),
+                CONF_ADAPTIVE_POLLING: self.config_entry.options.get(
+                    CONF_ADAPTIVE_POLLING
+                ),
+                CONF_REQUEST_TIMEOUT: self.config_entry.options.get(
+                    CONF_REQUEST_TIMEOUT
+                ),
             }
         )
 
@@ -161,10 +205,17 @@ class GoeChargerOptionsFlowHandler(OptionsFlow):
                     CONF_HOST: user_input.get(CONF_HOST),
                     CONF_API_TOKEN: user_input.get(CONF_API_TOKEN),
                     CONF_SCAN_INTERVAL: user_input.get(CONF_SCAN_INTERVAL),
+                    CONF_LOCAL_HOST: user_input.get(CONF_LOCAL_HOST),
+                    CONF_ADAPTIVE_POLLING: user_input.get(CONF_ADAPTIVE_POLLING),
+                    CONF_REQUEST_TIMEOUT: user_input.get(CONF_REQUEST_TIMEOUT),
                 }
             )
 
             if not errors:
+                # empty optional fields aren't submitted, they reset to the defaults
+                for key in OPTIONAL_KEYS:
+                    self.options.pop(key, None)
+
                 self.options.update(user_input)
                 return self.async_create_entry(title="", data=self.options)
 
@@ -3,13 +3,35 @@
 from enum import Enum
 
 API = "api"
+API_SESSIONS = "smartenergy_goecharger_api_sessions"
 CHARGERS_API = "chargers_api"
+COMMAND_QUEUES = "command_queues"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_CHANGE_EVENTS = "change_events"
 CONF_CHARGERS = "chargers"
+CONF_FLEET_COORDINATOR = "fleet_coordinator"
+CONF_LOCAL_HOST = "local_host"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_METRICS = "metrics"
+PROFILER = "smartenergy_goecharger_profiler"
+CONF_PROFILING = "profiling"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_SITE_CURRENT_LIMIT = "site_current_limit"
+CONF_STATE_CACHE = "state_cache"
 DOMAIN = "smartenergy_goecharger"
+FLEET_COORDINATOR = "fleet_coordinator"
 INIT_STATE = "init"
+LOAD_MANAGER = "load_manager"
 MANUFACTURER = "go-e GmbH"
+METRICS = "metrics"
+RATE_LIMITERS = "smartenergy_goecharger_rate_limiters"
+STATE_CACHE = "state_cache"
+STATE_FETCHERS = "state_fetchers"
+SUPPRESSED_WRITES = "suppressed_writes"
 UNSUB_OPTIONS_UPDATE_LISTENER = "unsub_options_update_listener"
 STATUS = "status"
+STALE = "stale"
 ONLINE = "online"
 OFFLINE = "offline"
 
@@ -20,6 +42,10 @@ CHARGER_ACCESS = "charger_access"
 CHARGER_FORCE_CHARGING = "charger_force_charging"
 CHARGER_MAX_CURRENT = "charger_max_current"
 CHARGING_ALLOWED = "charging_allowed"
+# measured current of each phase in A
+CURRENT_L1 = "i_l1"
+CURRENT_L2 = "i_l2"
+CURRENT_L3 = "i_l3"
 ENERGY_SINCE_CAR_CONNECTED = "energy_since_car_connected"
 ENERGY_TOTAL = "energy_total"
 MIN_CHARGING_CURRENT_LIMIT = "min_charging_current_limit"
@@ -31,6 +57,10 @@ TRANSACTION = "transaction"
 # Custom attributes
 
 WALLBOX_CONTROL = "wallbox_control"
+CHARGING_POWER = "charging_power"
+SESSION_ENERGY = "session_energy"
+SESSION_AVERAGE_POWER = "session_average_power"
+SESSION_PEAK_CURRENT = "session_peak_current"
 
 # Car param status values
 
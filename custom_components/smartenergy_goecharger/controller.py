@@ -1,17 +1,44 @@
 """API controller configuration for go-e Charger Cloud integration."""
 
+import asyncio
 import logging
 
 import aiohttp
-from goechargerv2.goecharger import GoeChargerApi
+import voluptuous as vol
 
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import API, CAR_STATUS, CHARGERS_API, CHARGING_ALLOWED, DOMAIN, INIT_STATE
+from .api import GoeChargerAsyncApi, clamp_current
+from .commands import ChargerCommandQueue
+from .const import API, CHARGERS_API, COMMAND_QUEUES, DOMAIN, INIT_STATE, CarStatus
+from .model import ChargerState
+from .profiling import async_span, timed_service
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_CONCURRENCY: int = 10
+EVENT_BATCH_RESULT: str = f"{DOMAIN}_batch_result"
+
+BATCH_CHANGE_CHARGING_SCHEMA: vol.Schema = vol.Schema(
+    {
+        vol.Required("targets"): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required("device_name"): cv.string,
+                        vol.Optional("charging_power"): vol.Coerce(int),
+                        vol.Optional("charging"): cv.boolean,
+                    }
+                )
+            ],
+        )
+    }
+)
+
 
 def init_service_data(data: dict, service: str) -> ServiceCall:
     """Initialize Home Assistant service call dict with data attribute and initial values."""
@@ -24,8 +51,11 @@ def init_service_data(data: dict, service: str) -> ServiceCall:
 async def fetch_status(hass: HomeAssistant, charger_name: str) -> dict:
     """Fetch go-e Charger Cloud car status via API."""
 
-    api: GoeChargerApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][API]
-    fetched_status: dict = await hass.async_add_executor_job(api.request_status)
+    api: GoeChargerAsyncApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][
+        API
+    ]
+    with async_span(hass, charger_name, "fetch_status"):
+        fetched_status: dict = await api.request_status()
 
     return fetched_status
 
@@ -33,45 +63,57 @@ async def fetch_status(hass: HomeAssistant, charger_name: str) -> dict:
 async def start_charging(hass: HomeAssistant, charger_name: str) -> None:
     """Start charging of a car via API, no state refresh."""
 
-    api: GoeChargerApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][API]
-    await hass.async_add_executor_job(api.set_force_charging, True)
+    api: GoeChargerAsyncApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][
+        API
+    ]
+    await api.set_force_charging(True)
 
 
 async def stop_charging(hass: HomeAssistant, charger_name: str) -> None:
     """Stop charging of a car via API, no state refresh."""
 
-    api: GoeChargerApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][API]
-    await hass.async_add_executor_job(api.set_force_charging, False)
+    api: GoeChargerAsyncApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][
+        API
+    ]
+    await api.set_force_charging(False)
 
 
 async def ping_charger(hass: HomeAssistant, charger_name: str) -> None:
     """Make a call to the charger device. If it fails raise an error."""
 
     try:
-        api: GoeChargerApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][
-            API
-        ]
-        await hass.async_add_executor_job(api.request_status)
+        api: GoeChargerAsyncApi = hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
+            charger_name
+        ][API]
+        await api.request_status()
     except (aiohttp.ClientError, RuntimeError) as ex:
         raise ConfigEntryNotReady(ex) from ex
 
 
 class ChargerController:
-    """Represents go-e Charger Cloud controller, abstracting API calls into methods."""
+    """
+    Represents go-e Charger Cloud controller, abstracting API calls into methods.
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    Writes are sent via a per-charger command queue, which merges writes coming shortly
+    after each other into a single API call and updates the state optimistically.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> None:
         """Construct controller with hass property."""
         self._hass: HomeAssistant = hass
+        self._batch_concurrency: int = batch_concurrency
 
     def _is_charging_allowed(self, charger_name: str) -> bool:
         """Check if charging is allowed. If not, log an error and return False, otherwise True."""
-        data: dict = self._hass.data[DOMAIN][f"{charger_name}_coordinator"].data[
-            charger_name
-        ]
+        data: ChargerState = self._hass.data[DOMAIN][
+            f"{charger_name}_coordinator"
+        ].data[charger_name]
 
         if (
-            data[CHARGING_ALLOWED] == "off"
-            or data[CAR_STATUS] == "Charger ready, no car connected"
+            data.charging_allowed == "off"
+            or data.car_status == CarStatus.CHARGER_READY_NO_CAR
         ):
             _LOGGER.error(
                 """Charging for the %s is not allowed, please authenticate the car
@@ -82,6 +124,18 @@ class ChargerController:
 
         return True
 
+    async def _set_parameters(self, charger_name: str, parameters: dict) -> None:
+        """Queue API parameters for the charger and wait until they are written."""
+        command_queues: dict[str, ChargerCommandQueue] = self._hass.data[DOMAIN][
+            INIT_STATE
+        ][COMMAND_QUEUES]
+
+        if charger_name not in command_queues:
+            command_queues[charger_name] = ChargerCommandQueue(self._hass, charger_name)
+
+        await command_queues[charger_name].async_set(parameters)
+
+    @timed_service
     async def start_charging(self, call: ServiceCall) -> None:
         """
         Get name and assigned power from the service call and call the API accordingly.
@@ -89,11 +143,8 @@ class ChargerController:
         In case charging is not allowed, log a warning and early escape.
         """
 
-        charger_name: str | None = call.data.get("device_name", None)
+        charger_name: str = call.data["device_name"]
         charging_power: int | None = call.data.get("charging_power", None)
-        api: GoeChargerApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
-            charger_name
-        ][API]
 
         _LOGGER.debug(
             "Starting charging for the device=%s with power=%s",
@@ -101,12 +152,14 @@ class ChargerController:
             charging_power,
         )
 
+        parameters: dict = {"frc": 2}
+
         if charging_power is not None:
-            await self._hass.async_add_executor_job(api.set_max_current, charging_power)
+            parameters["amp"] = clamp_current(charging_power)
 
-        await self._hass.async_add_executor_job(api.set_force_charging, True)
-        await self._hass.data[DOMAIN][f"{charger_name}_coordinator"].async_refresh()
+        await self._set_parameters(charger_name, parameters)
 
+    @timed_service
     async def stop_charging(self, call: ServiceCall) -> None:
         """
         Get name and assigned power from the service call and call the API accordingly.
@@ -114,16 +167,27 @@ class ChargerController:
         In case charging is not allowed, log a warning and early escape.
         """
 
-        charger_name: str | None = call.data.get("device_name", None)
-        api: GoeChargerApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
-            charger_name
-        ][API]
+        charger_name: str = call.data["device_name"]
 
         _LOGGER.debug("Stopping charging for the device=%s", charger_name)
 
-        await self._hass.async_add_executor_job(api.set_force_charging, False)
-        await self._hass.data[DOMAIN][f"{charger_name}_coordinator"].async_refresh()
+        await self._set_parameters(charger_name, {"frc": 1})
+
+    @timed_service
+    async def release_charging(self, call: ServiceCall) -> None:
+        """
+        Get name from the service call and reset the force charging to neutral.
+
+        The charger decides about charging on its own again, e.g. after a pause.
+        """
+
+        charger_name: str = call.data["device_name"]
+
+        _LOGGER.debug("Releasing charging for the device=%s", charger_name)
 
+        await self._set_parameters(charger_name, {"frc": 0})
+
+    @timed_service
     async def change_charging_power(self, call: ServiceCall) -> None:
         """
         Get name and power from the service call and call the API accordingly.
@@ -131,11 +195,8 @@ class ChargerController:
         In case charging is not allowed, log an error and early escape.
         """
 
-        charger_name: str | None = call.data.get("device_name", None)
-        charging_power: int | None = call.data.get("charging_power", None)
-        api: GoeChargerApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
-            charger_name
-        ][API]
+        charger_name: str = call.data["device_name"]
+        charging_power: int = call.data["charging_power"]
 
         _LOGGER.debug(
             "Changing charging power for the device=%s to power=%s",
@@ -143,9 +204,9 @@ class ChargerController:
             charging_power,
         )
 
-        await self._hass.async_add_executor_job(api.set_max_current, charging_power)
-        await self._hass.data[DOMAIN][f"{charger_name}_coordinator"].async_refresh()
+        await self._set_parameters(charger_name, {"amp": clamp_current(charging_power)})
 
+    @timed_service
     async def set_phase(self, call: ServiceCall) -> None:
         """
         Get name and phase from the service call and call the API accordingly.
@@ -154,11 +215,8 @@ class ChargerController:
         Possible phase values: 0 (Auto), 1 (1-phased), 2 (3-phased).
         """
 
-        charger_name: str | None = call.data.get("device_name", None)
+        charger_name: str = call.data["device_name"]
         phase: int | None = call.data.get("phase", None)
-        api: GoeChargerApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
-            charger_name
-        ][API]
 
         if not phase in [0, 1, 2]:
             return
@@ -169,9 +227,9 @@ class ChargerController:
             phase,
         )
 
-        await self._hass.async_add_executor_job(api.set_phase, phase)
-        await self._hass.data[DOMAIN][f"{charger_name}_coordinator"].async_refresh()
+        await self._set_parameters(charger_name, {"psm": phase})
 
+    @timed_service
     async def set_transaction(self, call: ServiceCall) -> None:
         """
         Get name and status from the service call and call the API accordingly.
@@ -182,11 +240,8 @@ class ChargerController:
         - 0 (authenticate all users).
         """
 
-        charger_name: str | None = call.data.get("device_name", None)
+        charger_name: str = call.data["device_name"]
         status: int | None = call.data.get("status", None)
-        api: GoeChargerApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][
-            charger_name
-        ][API]
 
         if not status in [None, 0]:
             return
@@ -197,5 +252,77 @@ class ChargerController:
             status,
         )
 
-        await self._hass.async_add_executor_job(api.set_transaction, status)
-        await self._hass.data[DOMAIN][f"{charger_name}_coordinator"].async_refresh()
+        await self._set_parameters(charger_name, {"trx": status})
+
+    async def _set_batch_target(
+        self, semaphore: asyncio.Semaphore, target: dict
+    ) -> tuple[str, str]:
+        """Write settings of a single batch target. Return the charger name and the result."""
+
+        charger_name: str = target["device_name"]
+        parameters: dict = {}
+
+        if "charging_power" in target:
+            parameters["amp"] = clamp_current(target["charging_power"])
+
+        if "charging" in target:
+            parameters["frc"] = 2 if target["charging"] else 1
+
+        chargers_api: dict = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API]
+
+        if charger_name not in chargers_api:
+            return charger_name, "unknown device"
+
+        if not parameters:
+            return charger_name, "nothing to change"
+
+        try:
+            async with semaphore:
+                with async_span(self._hass, charger_name, "batch_change_charging"):
+                    await chargers_api[charger_name][API].set_parameters(parameters)
+        except (aiohttp.ClientError, RuntimeError) as ex:
+            _LOGGER.error("Batch change for the device=%s failed: %s", charger_name, ex)
+            return charger_name, "failed"
+
+        return charger_name, "success"
+
+    async def batch_change_charging(self, call: ServiceCall) -> dict[str, str]:
+        """
+        Change charging of more chargers at once, e.g. to shed the load of the whole site.
+
+        Each target may set the charging power and start (charging=true) or stop
+        (charging=false) charging. Writes are sent concurrently, with at most
+        batch_concurrency requests in flight, and every affected coordinator is refreshed
+        once at the end. Result of each charger is logged, fired as an event and returned.
+        """
+
+        targets: list[dict] = call.data["targets"]
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self._batch_concurrency)
+
+        _LOGGER.debug("Changing charging for %s devices", len(targets))
+
+        results: dict[str, str] = dict(
+            await asyncio.gather(
+                *[self._set_batch_target(semaphore, target) for target in targets]
+            )
+        )
+
+        # chargers may share the same coordinator, refresh each of them only once
+        coordinators: dict[int, DataUpdateCoordinator] = {
+            id(coordinator): coordinator
+            for charger_name, result in results.items()
+            if result == "success"
+            and (
+                coordinator := self._hass.data[DOMAIN].get(
+                    f"{charger_name}_coordinator"
+                )
+            )
+        }
+        await asyncio.gather(
+            *[coordinator.async_refresh() for coordinator in coordinators.values()]
+        )
+
+        _LOGGER.debug("Batch change results=%s", results)
+        self._hass.bus.async_fire(EVENT_BATCH_RESULT, {"results": results})
+
+        return results
@@ -0,0 +1,116 @@
+"""go-e Charger Cloud coordinator with key-level change tracking."""
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+EVENT_ATTRIBUTE_CHANGED: str = f"{DOMAIN}_attribute_changed"
+
+KeyListener = Callable[[str, str, Any, Any], None]
+
+
+def compute_delta(previous_data: dict, data: dict) -> dict[str, dict[str, tuple]]:
+    """
+    Return the changed attributes of the chargers present in both data.
+
+    The delta is in the format {charger_name: {key: (old_value, new_value)}}. Chargers whose
+    data weren't replaced are skipped without comparing them.
+    """
+
+    delta: dict[str, dict[str, tuple]] = {}
+
+    for charger_name, charger_data in data.items():
+        previous_charger_data: dict | None = previous_data.get(charger_name, None)
+
+        if previous_charger_data is None or previous_charger_data is charger_data:
+            continue
+
+        changes: dict[str, tuple] = {
+            key: (previous_charger_data.get(key, None), charger_data.get(key, None))
+            for key in previous_charger_data.keys() | charger_data.keys()
+            if previous_charger_data.get(key, None) != charger_data.get(key, None)
+        }
+
+        if changes:
+            delta[charger_name] = changes
+
+    return delta
+
+
+class ChargerDataUpdateCoordinator(DataUpdateCoordinator[dict]):
+    """
+    Coordinator exposing the key-level delta of each update.
+
+    On each update (fetch or optimistic patch), the delta against the previous data is
+    stored in the delta property. Listeners can subscribe to a single attribute of a
+    charger. If change_events is enabled, the changes of each charger are also fired as
+    a single EVENT_ATTRIBUTE_CHANGED event per update.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *args: Any,
+        change_events: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Construct the coordinator, see DataUpdateCoordinator for the other arguments."""
+        super().__init__(hass, *args, **kwargs)
+        self.change_events: bool = change_events
+        self.delta: dict[str, dict[str, tuple]] = {}
+        self._previous_data: dict = {}
+        self._key_listeners: dict[tuple[str, str], list[KeyListener]] = {}
+
+    @callback
+    def async_add_key_listener(
+        self, charger_name: str, key: str, key_listener: KeyListener
+    ) -> CALLBACK_TYPE:
+        """Listen to changes of a charger attribute. Return a function to remove the listener."""
+        key_listeners: list[KeyListener] = self._key_listeners.setdefault(
+            (charger_name, key), []
+        )
+        key_listeners.append(key_listener)
+
+        @callback
+        def remove_key_listener() -> None:
+            key_listeners.remove(key_listener)
+
+        return remove_key_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Compute the delta and notify the key listeners before all other listeners."""
+        data: dict = self.data if self.data else {}
+        self.delta = compute_delta(self._previous_data, data)
+        self._previous_data = data
+
+        if self.delta:
+            _LOGGER.debug("Changed go-e Charger Cloud coordinator data=%s", self.delta)
+
+        for charger_name, changes in self.delta.items():
+            for key, (old_value, new_value) in changes.items():
+                for key_listener in list(
+                    self._key_listeners.get((charger_name, key), [])
+                ):
+                    key_listener(charger_name, key, old_value, new_value)
+
+            if self.change_events:
+                self.hass.bus.async_fire(
+                    EVENT_ATTRIBUTE_CHANGED,
+                    {
+                        "device_name": charger_name,
+                        "changes": {
+                            key: {"old_value": old_value, "new_value": new_value}
+                            for key, (old_value, new_value) in changes.items()
+                        },
+                    },
+                )
+
+        super().async_update_listeners()
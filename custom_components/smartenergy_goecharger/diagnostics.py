@@ -0,0 +1,181 @@
+"""
+Diagnostics of the go-e Charger Cloud integration.
+
+Chargers added via the UI have config entry and device diagnostics. Chargers from the
+configuration.yaml have no config entry, so their devices aren't registered. Their
+diagnostics are fired as an event by the diagnostics service instead.
+"""
+
+from collections import Counter
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_TOKEN, CONF_HOST
+from homeassistant.core import HomeAssistant, ServiceCall
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .api import GoeChargerAsyncApi
+from .cache import StateCache
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    API,
+    CHARGERS_API,
+    CONF_LOCAL_HOST,
+    DOMAIN,
+    INIT_STATE,
+    STATE_CACHE,
+    STATE_FETCHERS,
+    SUPPRESSED_WRITES,
+)
+from .coordinator import ChargerDataUpdateCoordinator
+from .profiling import Profiler, async_get_profiler
+from .rate_limiter import TokenBucket
+from .state import StateFetcher
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# the cloud host contains the serial number of the charger
+TO_REDACT: set[str] = {CONF_API_TOKEN, CONF_HOST, CONF_LOCAL_HOST}
+
+EVENT_DIAGNOSTICS: str = f"{DOMAIN}_diagnostics"
+
+DIAGNOSTICS_SCHEMA: vol.Schema = vol.Schema({vol.Optional("device_name"): cv.string})
+
+
+def _isoformat(value: Any) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _charger_diagnostics(hass: HomeAssistant, charger_name: str) -> dict[str, Any]:
+    """
+    Return the runtime state of a single charger.
+
+    Only already collected values are read, nothing is fetched or copied deeply,
+    so the snapshot stays cheap even with many chargers.
+    """
+    init_state: dict = hass.data[DOMAIN][INIT_STATE]
+    state_fetcher: StateFetcher | None = init_state[STATE_FETCHERS].get(
+        charger_name, None
+    )
+    coordinator: ChargerDataUpdateCoordinator | None = hass.data[DOMAIN].get(
+        f"{charger_name}_coordinator", None
+    )
+    charger_api: dict | None = init_state[CHARGERS_API].get(charger_name, None)
+    state_cache: StateCache | None = init_state.get(STATE_CACHE, None)
+    suppressed_writes: Counter = init_state[SUPPRESSED_WRITES]
+    profiler: Profiler | None = async_get_profiler(hass)
+
+    diagnostics: dict[str, Any] = {
+        "last_status": None,
+        "coordinator": None,
+        "circuit_breaker": None,
+        "rate_limiter": None,
+        "transport": None,
+        "cache": {
+            "suppressed_writes": suppressed_writes[charger_name],
+            "state_cache_hits": state_cache.hits if state_cache else None,
+            "state_cache_misses": state_cache.misses if state_cache else None,
+        },
+        "timings": profiler.summary([charger_name]).get(charger_name, {})
+        if profiler is not None
+        else None,
+    }
+
+    if state_fetcher is not None:
+        breaker: CircuitBreaker = state_fetcher.breakers[charger_name]
+        diagnostics["last_status"] = async_redact_data(
+            state_fetcher.last_status.get(charger_name, {}), TO_REDACT
+        )
+        diagnostics["circuit_breaker"] = {
+            "state": breaker.state,
+            "consecutive_failures": breaker.consecutive_failures,
+            "next_probe": _isoformat(breaker.next_probe),
+        }
+        diagnostics["coordinator"] = {
+            "chargers": len(state_fetcher.charger_names),
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator is not None and coordinator.update_interval
+            else None,
+            "last_update_success": coordinator.last_update_success
+            if coordinator is not None
+            else None,
+            "last_cycle_duration": state_fetcher.last_cycle_duration,
+            "cycle_durations": state_fetcher.cycle_durations.summary(),
+        }
+
+    if charger_api is not None:
+        api: GoeChargerAsyncApi = charger_api[API]
+        rate_limiter: TokenBucket | None = api.rate_limiter
+        diagnostics["transport"] = api.transport
+
+        if rate_limiter is not None:
+            diagnostics["rate_limiter"] = {
+                "saturation": rate_limiter.saturation,
+                "rejected_polls": rate_limiter.rejected_polls,
+                "throttled_commands": rate_limiter.throttled_commands,
+                "paused_until": _isoformat(rate_limiter.paused_until),
+            }
+
+    return diagnostics
+
+
+def _config_diagnostics(config_entry: ConfigEntry) -> dict[str, Any]:
+    return {
+        "data": async_redact_data(config_entry.data, TO_REDACT),
+        "options": async_redact_data(config_entry.options, TO_REDACT),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the diagnostics of the charger of the config entry."""
+    return {
+        "config": _config_diagnostics(config_entry),
+        "charger": _charger_diagnostics(hass, config_entry.entry_id),
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return the diagnostics of the charger device."""
+    charger_name: str = next(
+        (identifier for domain, identifier in device.identifiers if domain == DOMAIN),
+        config_entry.entry_id,
+    )
+
+    return {
+        "config": _config_diagnostics(config_entry),
+        "charger": _charger_diagnostics(hass, charger_name),
+    }
+
+
+async def async_handle_diagnostics_service(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict:
+    """
+    Return the diagnostics of the requested charger, or of all chargers if not provided.
+
+    Diagnostics are logged and fired as the EVENT_DIAGNOSTICS event, it's the only way
+    to get them for the chargers from the configuration.yaml.
+    """
+    chargers_api: dict = hass.data[DOMAIN][INIT_STATE][CHARGERS_API]
+    charger_names: list[str] = (
+        [call.data["device_name"]] if "device_name" in call.data else list(chargers_api)
+    )
+    diagnostics: dict = {
+        charger_name: _charger_diagnostics(hass, charger_name)
+        for charger_name in charger_names
+        if charger_name in chargers_api
+    }
+
+    _LOGGER.info("Diagnostics of the chargers=%s", diagnostics)
+    hass.bus.async_fire(EVENT_DIAGNOSTICS, {"diagnostics": diagnostics})
+
+    return diagnostics
@@ -0,0 +1,87 @@
+"""Base classes shared by the go-e Charger Cloud entities."""
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, INIT_STATE, MANUFACTURER, STALE, SUPPRESSED_WRITES
+from .profiling import Profiler, async_get_profiler
+
+
+class ChangeDetectionMixin(CoordinatorEntity):
+    """
+    Write the entity state on a coordinator update only if it changed.
+
+    The state, availability, name and attributes of the last written state are compared
+    with the current ones. Suppressed writes are counted per entity and per charger.
+    If the timing is enabled, writes are timed per charger and platform.
+    """
+
+    _device_id: str
+    _last_written_state: tuple | None = None
+    suppressed_writes: int = 0
+
+    def _written_state(self) -> tuple[Any, ...]:
+        """Return the values written into the Home Assistant state."""
+        return (self.state, self.available, self.name, self.extra_state_attributes)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the initial state, it's written right after the entity is added."""
+        await super().async_added_to_hass()
+        self._last_written_state = self._written_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember it."""
+        self._last_written_state = self._written_state()
+        profiler: Profiler | None = async_get_profiler(self.hass)
+
+        if profiler is None:
+            super().async_write_ha_state()
+            return
+
+        with profiler.span(self._device_id, f"write_{self.platform.domain}"):
+            super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write if nothing changed since the last write."""
+        if self._written_state() == self._last_written_state:
+            self.suppressed_writes += 1
+            suppressed_writes: Counter = self.hass.data[DOMAIN][INIT_STATE][
+                SUPPRESSED_WRITES
+            ]
+            suppressed_writes[self._device_id] += 1
+            return
+
+        super()._handle_coordinator_update()
+
+
+class ChargerEntity(ChangeDetectionMixin):
+    """
+    Base entity of a charger, flags states restored from the cache as stale.
+
+    All entities of a charger belong to its device, the device diagnostics are
+    downloaded from it.
+    """
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device information."""
+        return {
+            "identifiers": {(DOMAIN, self._device_id)},
+            "name": self._device_id,
+            "manufacturer": MANUFACTURER,
+            "model": "",
+        }
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the stale flag until the state is fetched from the charger."""
+        if self.coordinator.data[self._device_id].stale:
+            return {STALE: True}
+
+        return None
@@ -0,0 +1,206 @@
+"""In-memory energy history and charging sessions of the go-e Charger Cloud chargers."""
+
+from __future__ import annotations
+
+from array import array
+import math
+
+from .const import ENERGY_SINCE_CAR_CONNECTED, ENERGY_TOTAL, CarStatus
+from .model import ChargerState
+
+# 30 minutes of samples with the default scan interval of 10 s
+DEFAULT_HISTORY_SIZE: int = 180
+
+# time constant of the power EMA, older power samples fade out with it
+POWER_EMA_TIME_CONSTANT: float = 60.0
+# energy deltas over longer gaps (e.g. offline periods) don't reflect the current power
+MAX_POWER_SAMPLE_GAP: float = 300.0
+
+# car states of a session, it starts with the car connected and ends when it's disconnected
+SESSION_CAR_STATUSES: list[CarStatus] = [
+    CarStatus.CAR_CHARGING,
+    CarStatus.CAR_CONNECTED_AUTH_REQUIRED,
+    CarStatus.CHARGING_FINISHED_DISCONNECT,
+]
+
+
+class PowerEstimator:
+    """
+    Charging power computed incrementally from the energy counter deltas.
+
+    The energy since the car connected is used if available as it has a finer resolution,
+    otherwise the total energy. The power of each delta is smoothed with a time-aware EMA,
+    so irregular poll intervals weigh correctly. A decreasing counter (e.g. a new car
+    connected) or a gap longer than MAX_POWER_SAMPLE_GAP only restarts the deltas. While the
+    car isn't charging, the power is 0. Every update is O(1).
+    """
+
+    def __init__(self, time_constant: float = POWER_EMA_TIME_CONSTANT) -> None:
+        """Construct the estimator without any sample."""
+        self._time_constant: float = time_constant
+        self._last_timestamp: float | None = None
+        self._last_energy: float | None = None
+        self._last_counter: str | None = None
+        self._power: float | None = None
+
+    @property
+    def value(self) -> float | None:
+        """Return the smoothed power in kW."""
+        return None if self._power is None else round(self._power, 2)
+
+    def update(self, timestamp: float, state: ChargerState) -> None:
+        """Update the power with the energy counter of the fetched state."""
+        counter: str = (
+            ENERGY_SINCE_CAR_CONNECTED
+            if state.energy_since_car_connected is not None
+            else ENERGY_TOTAL
+        )
+        energy: float | None = getattr(state, counter)
+
+        if energy is None:
+            return
+
+        last_timestamp: float | None = self._last_timestamp
+        last_energy: float | None = self._last_energy
+        same_counter: bool = counter == self._last_counter
+        self._last_timestamp = timestamp
+        self._last_energy = energy
+        self._last_counter = counter
+
+        if state.car_status != CarStatus.CAR_CHARGING:
+            self._power = 0
+            return
+
+        if (
+            last_timestamp is None
+            or last_energy is None
+            or not same_counter
+            or energy < last_energy
+            or not 0 < timestamp - last_timestamp <= MAX_POWER_SAMPLE_GAP
+        ):
+            return
+
+        elapsed: float = timestamp - last_timestamp
+        # W = Wh / h, converted to kW
+        power: float = (energy - last_energy) * 3600 / elapsed / 1000
+
+        if self._power is None:
+            self._power = power
+            return
+
+        alpha: float = 1 - math.exp(-elapsed / self._time_constant)
+        self._power += alpha * (power - self._power)
+
+
+class EnergyHistory:
+    """
+    Ring buffer of the timestamped energy and current samples of a single charger.
+
+    Samples are stored in preallocated arrays of doubles, once the buffer is full the oldest
+    sample is overwritten, so the memory doesn't grow with the uptime.
+
+    Sessions are detected from the car status transitions and aggregated incrementally,
+    so a session can be longer than the buffer. If the car is already connected when
+    the first sample is added, the session energy is derived from the energy since
+    the car connected, while the average power is computed from the observed samples only.
+    The current charging power is estimated from the same samples.
+    """
+
+    def __init__(self, size: int = DEFAULT_HISTORY_SIZE) -> None:
+        """Construct an empty history."""
+        self._size: int = size
+        self._timestamps: array = array("d", bytes(8 * size))
+        self._energy: array = array("d", bytes(8 * size))
+        self._current: array = array("d", bytes(8 * size))
+        self._next: int = 0
+        self.count: int = 0
+        self.session_active: bool = False
+        self._session_start: float | None = None
+        self._session_start_energy: float = 0
+        self._session_observed_energy: float = 0
+        self._session_last: float | None = None
+        self._session_last_energy: float = 0
+        self.session_peak_current: float | None = None
+        self.power: PowerEstimator = PowerEstimator()
+
+    def add(self, timestamp: float, state: ChargerState) -> None:
+        """Add a sample of the fetched state, states without the total energy are skipped."""
+        self.power.update(timestamp, state)
+
+        if state.energy_total is None:
+            return
+
+        # highest measured current of the phases, not the current setpoint
+        current: float = max(
+            (
+                phase_current
+                for phase_current in (state.i_l1, state.i_l2, state.i_l3)
+                if phase_current is not None
+            ),
+            default=0,
+        )
+        self._timestamps[self._next] = timestamp
+        self._energy[self._next] = state.energy_total
+        self._current[self._next] = current
+        self._next = (self._next + 1) % self._size
+        self.count = min(self.count + 1, self._size)
+
+        if state.car_status not in SESSION_CAR_STATUSES:
+            self.session_active = False
+            return
+
+        if not self.session_active:
+            self.session_active = True
+            self._session_start = timestamp
+            self._session_observed_energy = state.energy_total
+            self._session_start_energy = state.energy_total - (
+                state.energy_since_car_connected or 0
+            )
+            self.session_peak_current = None
+
+        self._session_last = timestamp
+        self._session_last_energy = state.energy_total
+
+        if state.car_status == CarStatus.CAR_CHARGING:
+            self.session_peak_current = max(self.session_peak_current or 0, current)
+
+    def samples(self) -> list[tuple[float, float, float]]:
+        """Return the (timestamp, energy in Wh, current in A) samples from the oldest."""
+        start: int = (self._next - self.count) % self._size
+
+        return [
+            (
+                self._timestamps[index],
+                self._energy[index],
+                self._current[index],
+            )
+            for index in ((start + offset) % self._size for offset in range(self.count))
+        ]
+
+    @property
+    def session_energy(self) -> float | None:
+        """Return the energy of the current (or last) session in kWh."""
+        if self._session_start is None:
+            return None
+
+        return round((self._session_last_energy - self._session_start_energy) / 1000, 2)
+
+    @property
+    def session_average_power(self) -> float | None:
+        """Return the average power of the current (or last) session in kW."""
+        session_start: float | None = self._session_start
+        session_last: float | None = self._session_last
+
+        if (
+            session_start is None
+            or session_last is None
+            or session_last == session_start
+        ):
+            return None
+
+        hours: float = (session_last - session_start) / 3600
+
+        return round(
+            (self._session_last_energy - self._session_observed_energy) / 1000 / hours,
+            2,
+        )
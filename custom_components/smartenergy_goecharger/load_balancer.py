@@ -0,0 +1,333 @@
+"""Site-level dynamic load balancing over go-e Charger Cloud chargers."""
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .api import MAX_CURRENT
+from .const import DOMAIN, ONLINE, CarStatus
+from .controller import ChargerController, init_service_data
+from .model import ChargerState
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+SITE_PHASES: int = 3
+# 3 phases, restored if the original phase switch mode of a charger is unknown
+DEFAULT_PHASE_SWITCH_MODE: int = 2
+
+PAUSED_CAR_STATUSES: list[CarStatus] = [
+    CarStatus.CAR_CONNECTED_AUTH_REQUIRED,
+    CarStatus.CHARGING_FINISHED_DISCONNECT,
+]
+
+
+@dataclass(frozen=True)
+class ChargerDemand:
+    """Class to describe a charger asking for a share of the site current."""
+
+    name: str
+    min_current: int
+    max_current: int
+    phases: int
+
+
+@dataclass(frozen=True)
+class Allocation:
+    """Class to describe the current and phases allocated to a charger. 0 A means paused."""
+
+    current: int
+    phases: int
+    # phases of the demand at the time of the allocation, 1 phase less means a phase switch
+    requested_phases: int = field(default=SITE_PHASES, compare=False)
+
+
+def _allocated_load(level: int, demands: list[ChargerDemand], phases: list[int]) -> int:
+    """Return the load in phase-amperes if all chargers charge with the same current."""
+    return sum(
+        charger_phases * min(max(level, demand.min_current), demand.max_current)
+        for demand, charger_phases in zip(demands, phases)
+    )
+
+
+def allocate_current(
+    site_current_limit: int, demands: list[ChargerDemand]
+) -> dict[str, Allocation]:
+    """
+    Divide the site current limit (per phase, in A) across the charging chargers.
+
+    The site load is counted in phase-amperes, assuming the 1-phase chargers are spread
+    across the site phases. Demands are served in their order:
+
+    1. every charger gets its min current, if there is no capacity for it with all its
+       phases, it's switched to 1 phase, otherwise it's paused (0 A)
+    2. the remaining capacity is shared equally, respecting the max current of each charger
+    3. amperes left over due to the rounding are given to the first chargers.
+    """
+
+    capacity: int = site_current_limit * SITE_PHASES
+    allocations: dict[str, Allocation] = {}
+    admitted: list[ChargerDemand] = []
+    admitted_phases: list[int] = []
+    min_load: int = 0
+
+    for demand in demands:
+        if min_load + demand.min_current * demand.phases <= capacity:
+            charger_phases: int = demand.phases
+        elif min_load + demand.min_current <= capacity:
+            charger_phases = 1
+        else:
+            allocations[demand.name] = Allocation(0, demand.phases, demand.phases)
+            continue
+
+        min_load += demand.min_current * charger_phases
+        admitted.append(demand)
+        admitted_phases.append(charger_phases)
+
+    # binary search of the highest common current level fitting into the capacity
+    low, high = 0, MAX_CURRENT
+
+    while low < high:
+        level: int = (low + high + 1) // 2
+
+        if _allocated_load(level, admitted, admitted_phases) <= capacity:
+            low = level
+        else:
+            high = level - 1
+
+    remaining: int = capacity - _allocated_load(low, admitted, admitted_phases)
+
+    for demand, charger_phases in zip(admitted, admitted_phases):
+        current: int = min(max(low, demand.min_current), demand.max_current)
+
+        if current < demand.max_current and remaining >= charger_phases:
+            current += 1
+            remaining -= charger_phases
+
+        allocations[demand.name] = Allocation(current, charger_phases, demand.phases)
+
+    return allocations
+
+
+class LoadManager:
+    """
+    Keep the sum of the charging currents within the site current limit.
+
+    On each coordinator update, the demands of the chargers are updated and only if one
+    of them changed, the currents are allocated again. Only changed allocations are sent
+    to the chargers. Chargers which stop charging (e.g. the car disconnects) are released,
+    a pause is reset to neutral and the original phase switch mode is restored.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, site_current_limit: int, charger_names: list[str]
+    ) -> None:
+        """Construct the manager for the chargers sharing the site connection."""
+        self._hass: HomeAssistant = hass
+        self._site_current_limit: int = site_current_limit
+        self._charger_names: list[str] = charger_names
+        self._charger_controller: ChargerController = ChargerController(hass)
+        self._demands: dict[str, ChargerDemand] = {}
+        self._allocations: dict[str, Allocation] = {}
+        self._paused: set[str] = set()
+        # original phase switch modes of the chargers switched to 1 phase
+        self._phase_modes: dict[str, int] = {}
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen to the updates of all coordinators of the managed chargers."""
+        coordinators: dict[int, DataUpdateCoordinator] = {
+            id(coordinator): coordinator
+            for charger_name in self._charger_names
+            if (
+                coordinator := self._hass.data[DOMAIN].get(
+                    f"{charger_name}_coordinator"
+                )
+            )
+        }
+
+        for coordinator in coordinators.values():
+            coordinator.async_add_listener(self._handle_coordinator_update)
+
+        self._handle_coordinator_update()
+
+    def _get_demand(self, charger_name: str) -> ChargerDemand | None:
+        """Return the demand of a charger, or None if it doesn't charge."""
+        data: ChargerState | None = self._hass.data[DOMAIN][
+            f"{charger_name}_coordinator"
+        ].data.get(charger_name, None)
+
+        if (
+            data is None
+            or data.status != ONLINE
+            or data.min_charging_current_limit is None
+            or data.max_charging_current_limit is None
+        ):
+            return None
+
+        # a car paused by the manager stays connected, but isn't charging
+        if not (
+            data.car_status == CarStatus.CAR_CHARGING
+            or (charger_name in self._paused and data.car_status in PAUSED_CAR_STATUSES)
+        ):
+            return None
+
+        # unknown number of phases is counted as all site phases
+        phases: int = (
+            SITE_PHASES
+            if charger_name in self._phase_modes
+            else data.phases_number_connected or SITE_PHASES
+        )
+
+        return ChargerDemand(
+            charger_name,
+            data.min_charging_current_limit,
+            data.max_charging_current_limit,
+            phases,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Allocate the site current again if any of the demands changed."""
+        demands_changed: bool = False
+
+        for charger_name in self._charger_names:
+            demand: ChargerDemand | None = self._get_demand(charger_name)
+
+            if demand == self._demands.get(charger_name, None):
+                continue
+
+            demands_changed = True
+
+            if demand is None:
+                self._demands.pop(charger_name)
+                self._release(charger_name)
+            else:
+                self._demands[charger_name] = demand
+
+        if not demands_changed:
+            return
+
+        allocations: dict[str, Allocation] = allocate_current(
+            self._site_current_limit, list(self._demands.values())
+        )
+        changed_allocations: dict[str, Allocation] = {
+            charger_name: allocation
+            for charger_name, allocation in allocations.items()
+            if self._allocations.get(charger_name, None) != allocation
+        }
+        self._allocations = allocations
+
+        _LOGGER.debug("Changed allocations of the site current=%s", changed_allocations)
+
+        if changed_allocations:
+            self._hass.async_create_task(self._async_apply(changed_allocations))
+
+    @callback
+    def _release(self, charger_name: str) -> None:
+        """Undo the pause and the phase switch of a charger which doesn't charge anymore."""
+        paused: bool = charger_name in self._paused
+        phase_mode: int | None = self._phase_modes.pop(charger_name, None)
+        self._paused.discard(charger_name)
+
+        if paused or phase_mode is not None:
+            self._hass.async_create_task(
+                self._async_release(charger_name, paused, phase_mode)
+            )
+
+    async def _async_release(
+        self, charger_name: str, paused: bool, phase_mode: int | None
+    ) -> None:
+        """Reset the force charging to neutral and restore the original phase switch mode."""
+        try:
+            if phase_mode is not None:
+                await self._charger_controller.set_phase(
+                    init_service_data(
+                        {"device_name": charger_name, "phase": phase_mode}, "set_phase"
+                    )
+                )
+
+            if paused:
+                await self._charger_controller.release_charging(
+                    init_service_data({"device_name": charger_name}, "release_charging")
+                )
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error(
+                "Can't release the load allocation of the device=%s: %s",
+                charger_name,
+                ex,
+            )
+
+    async def _async_apply_allocation(
+        self, charger_name: str, allocation: Allocation
+    ) -> None:
+        """Send the allocated current and phases to a charger."""
+        if allocation.current == 0:
+            self._paused.add(charger_name)
+            await self._charger_controller.stop_charging(
+                init_service_data({"device_name": charger_name}, "stop_charging")
+            )
+            return
+
+        if allocation.phases < allocation.requested_phases:
+            if charger_name not in self._phase_modes:
+                data: ChargerState | None = self._hass.data[DOMAIN][
+                    f"{charger_name}_coordinator"
+                ].data.get(charger_name, None)
+                self._phase_modes[charger_name] = (
+                    data.phase_switch_mode
+                    if data is not None and data.phase_switch_mode is not None
+                    else DEFAULT_PHASE_SWITCH_MODE
+                )
+
+            await self._charger_controller.set_phase(
+                init_service_data(
+                    {"device_name": charger_name, "phase": 1}, "set_phase"
+                )
+            )
+        elif charger_name in self._phase_modes:
+            await self._charger_controller.set_phase(
+                init_service_data(
+                    {
+                        "device_name": charger_name,
+                        "phase": self._phase_modes.pop(charger_name),
+                    },
+                    "set_phase",
+                )
+            )
+
+        if charger_name in self._paused:
+            self._paused.discard(charger_name)
+            await self._charger_controller.start_charging(
+                init_service_data(
+                    {"device_name": charger_name, "charging_power": allocation.current},
+                    "start_charging",
+                )
+            )
+        else:
+            await self._charger_controller.change_charging_power(
+                init_service_data(
+                    {"device_name": charger_name, "charging_power": allocation.current},
+                    "change_charging_power",
+                )
+            )
+
+    async def _async_apply(self, allocations: dict[str, Allocation]) -> None:
+        """Send the changed allocations to the chargers concurrently."""
+        results: list = await asyncio.gather(
+            *[
+                self._async_apply_allocation(charger_name, allocation)
+                for charger_name, allocation in allocations.items()
+            ],
+            return_exceptions=True,
+        )
+
+        for charger_name, result in zip(allocations.keys(), results):
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "Can't apply the load allocation for the device=%s: %s",
+                    charger_name,
+                    result,
+                )
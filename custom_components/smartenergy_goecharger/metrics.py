@@ -0,0 +1,409 @@
+"""Prometheus metrics exporter of the go-e Charger Cloud integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from enum import Enum
+import logging
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .const import DOMAIN, INIT_STATE, METRICS, ONLINE
+from .coordinator import ChargerDataUpdateCoordinator
+from .model import ChargerState
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+METRICS_URL: str = f"/api/{DOMAIN}/metrics"
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds, the cloud API usually responds within a second
+FETCH_LATENCY_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SLOT_WAIT_BUCKETS: tuple[float, ...] = (0.001, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _label_value(value: Any) -> str:
+    if value is None:
+        return ""
+
+    label_value: str = value.value if isinstance(value, Enum) else str(value)
+
+    return label_value
+
+
+class MetricFamily:
+    """
+    Metric with its samples rendered in the Prometheus text format.
+
+    Samples are rendered when they change, the text of the family is cached until
+    any of its samples changes again, so a scrape only joins the cached texts.
+    """
+
+    def __init__(self, name: str, documentation: str, metric_type: str) -> None:
+        """Construct the family without any sample."""
+        self.name: str = name
+        self._header: str = (
+            f"# HELP {name} {documentation}\n# TYPE {name} {metric_type}\n"
+        )
+        self._samples: dict[Labels, str] = {}
+        self._text: str | None = None
+
+    def _set_sample(self, labels: Labels, text: str) -> None:
+        self._samples[labels] = text
+        self._text = None
+
+    def remove(self, labels: Labels) -> None:
+        """Remove the samples with the labels."""
+        if self._samples.pop(labels, None) is not None:
+            self._text = None
+
+    def remove_charger(self, charger_name: str) -> None:
+        """Remove the samples of all label sets of the charger."""
+        for labels in [
+            labels for labels in self._samples if ("charger", charger_name) in labels
+        ]:
+            self.remove(labels)
+
+    def render(self) -> str:
+        """Return the family in the Prometheus text format, empty if it has no samples."""
+        if self._text is None:
+            self._text = (
+                self._header + "".join(self._samples.values()) if self._samples else ""
+            )
+
+        return self._text
+
+
+class Gauge(MetricFamily):
+    """Gauge with a value per labels."""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        """Construct the gauge."""
+        super().__init__(name, documentation, "gauge")
+
+    def set(
+        self, labels: Labels, value: float | None, extra_labels: Labels = ()
+    ) -> None:
+        """
+        Set the value, None removes the sample.
+
+        The extra labels are rendered too, but the sample is replaced only by its labels,
+        e.g. a status label replaces the previous status.
+        """
+        if value is None:
+            self.remove(labels)
+            return
+
+        self._set_sample(
+            labels,
+            f"{self.name}{_format_labels((*labels, *extra_labels))} {_format_value(value)}\n",
+        )
+
+
+class CounterMetric(MetricFamily):
+    """Monotonic counter with a value per labels."""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        """Construct the counter, its name gets the _total suffix."""
+        super().__init__(f"{name}_total", documentation, "counter")
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        """Increase the counter of the labels."""
+        value: float = self._values.get(labels, 0) + amount
+        self._values[labels] = value
+        self._set_sample(
+            labels, f"{self.name}{_format_labels(labels)} {_format_value(value)}\n"
+        )
+
+    def remove(self, labels: Labels) -> None:
+        """Remove the samples and the value of the labels."""
+        super().remove(labels)
+        self._values.pop(labels, None)
+
+    def value(self, labels: Labels) -> float:
+        """Return the counter of the labels."""
+        return self._values.get(labels, 0)
+
+
+class Histogram(MetricFamily):
+    """Histogram with cumulative buckets per labels."""
+
+    def __init__(
+        self, name: str, documentation: str, buckets: tuple[float, ...]
+    ) -> None:
+        """Construct the histogram with the upper bounds of its buckets."""
+        super().__init__(name, documentation, "histogram")
+        self._buckets: tuple[float, ...] = buckets
+        self._bounds: list[str] = [*map(repr, buckets), "+Inf"]
+        # per labels: counts of the buckets and +Inf, sum
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        """Add the observed value to its bucket."""
+        counts, total = self._values.setdefault(
+            labels, ([0] * (len(self._buckets) + 1), [0.0])
+        )
+        counts[bisect_left(self._buckets, value)] += 1
+        total[0] += value
+
+        lines: list[str] = []
+        cumulative: int = 0
+
+        for bound, count in zip(self._bounds, counts):
+            cumulative += count
+            lines.append(
+                f"{self.name}_bucket{_format_labels((*labels, ('le', bound)))} {cumulative}\n"
+            )
+
+        label_text: str = _format_labels(labels)
+        lines.append(f"{self.name}_sum{label_text} {repr(total[0])}\n")
+        lines.append(f"{self.name}_count{label_text} {cumulative}\n")
+        self._set_sample(labels, "".join(lines))
+
+    def remove(self, labels: Labels) -> None:
+        """Remove the samples and the bucket counts of the labels."""
+        super().remove(labels)
+        self._values.pop(labels, None)
+
+    def count(self, labels: Labels) -> int:
+        """Return the number of the observed values of the labels."""
+        return sum(self._values[labels][0]) if labels in self._values else 0
+
+
+class MetricsRegistry:
+    """
+    Metrics of the chargers and of the integration health.
+
+    Charger metrics are updated from the coordinator data, only chargers in the delta
+    of an update are rendered again. Health metrics are recorded by the state fetchers
+    (fetch latency, errors by exception type, wait for a concurrency slot) and from
+    the service calls of the domain.
+    """
+
+    def __init__(self) -> None:
+        """Construct the registry without any sample."""
+        self.current: Gauge = Gauge(
+            "goecharger_charger_current_amperes", "Charging current set on the charger."
+        )
+        self.energy: Gauge = Gauge(
+            "goecharger_charger_energy_total_watthours", "Total energy charged."
+        )
+        self.status: Gauge = Gauge(
+            "goecharger_charger_status",
+            "1 if the charger is online, the labels hold the charger and the car status.",
+        )
+        self.phase_switch_mode: Gauge = Gauge(
+            "goecharger_charger_phase_switch_mode", "Phase switch mode of the charger."
+        )
+        self.fetch_latency: Histogram = Histogram(
+            "goecharger_fetch_duration_seconds",
+            "Duration of the status requests.",
+            FETCH_LATENCY_BUCKETS,
+        )
+        self.fetch_errors: CounterMetric = CounterMetric(
+            "goecharger_fetch_errors", "Failed status requests by the exception type."
+        )
+        self.slot_wait: Histogram = Histogram(
+            "goecharger_fetch_slot_wait_seconds",
+            "Time the status requests waited for a free concurrency slot.",
+            SLOT_WAIT_BUCKETS,
+        )
+        self.service_calls: CounterMetric = CounterMetric(
+            "goecharger_service_calls", "Calls of the integration services."
+        )
+        self._families: list[MetricFamily] = [
+            self.current,
+            self.energy,
+            self.status,
+            self.phase_switch_mode,
+            self.fetch_latency,
+            self.fetch_errors,
+            self.slot_wait,
+            self.service_calls,
+        ]
+        self._known_chargers: set[str] = set()
+        # removers of the listeners feeding the registry, by the coordinator name
+        # (and EVENT_CALL_SERVICE for the service calls)
+        self.unsub_listeners: dict[str, CALLBACK_TYPE] = {}
+
+    def update_charger(self, charger_name: str, state: ChargerState) -> None:
+        """Render the metrics of the charger from its state."""
+        labels: Labels = (("charger", charger_name),)
+        self._known_chargers.add(charger_name)
+        self.current.set(labels, state.charger_max_current)
+        self.energy.set(labels, state.energy_total)
+        self.phase_switch_mode.set(labels, state.phase_switch_mode)
+        self.status.set(
+            labels,
+            1 if state.status == ONLINE else 0,
+            (
+                ("status", _label_value(state.status)),
+                ("car_status", _label_value(state.car_status)),
+            ),
+        )
+
+    def remove_charger(self, charger_name: str) -> None:
+        """Remove all samples of the charger, e.g. of an unloaded entry."""
+        self._known_chargers.discard(charger_name)
+
+        for family in self._families:
+            family.remove_charger(charger_name)
+
+    @callback
+    def async_count_service_call(self, event: Event) -> None:
+        """Count the call of a service of the domain."""
+        if event.data.get("domain") == DOMAIN:
+            self.service_calls.inc((("service", str(event.data.get("service"))),))
+
+    @callback
+    def async_update_from_coordinator(
+        self, coordinator: ChargerDataUpdateCoordinator
+    ) -> None:
+        """Update the chargers changed by the last coordinator update."""
+        data: dict = coordinator.data if coordinator.data else {}
+
+        for charger_name in coordinator.delta.keys() | (
+            data.keys() - self._known_chargers
+        ):
+            if charger_name in data:
+                self.update_charger(charger_name, data[charger_name])
+
+    def observe_fetch(
+        self,
+        charger_name: str,
+        wait: float,
+        duration: float,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record a status request of the charger."""
+        labels: Labels = (("charger", charger_name),)
+        self.slot_wait.observe((), wait)
+        self.fetch_latency.observe(labels, duration)
+
+        if error is not None:
+            self.fetch_errors.inc((*labels, ("exception", type(error).__name__)))
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        return "".join(family.render() for family in self._families)
+
+
+class GoeChargerMetricsView(HomeAssistantView):
+    """Prometheus endpoint of the metrics, authenticated with a Home Assistant access token."""
+
+    url: str = METRICS_URL
+    name: str = f"api:{DOMAIN}:metrics"
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Construct the view of the registry."""
+        self._registry: MetricsRegistry = registry
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics."""
+        return web.Response(
+            body=self._registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+@callback
+def async_setup_metrics(hass: HomeAssistant) -> MetricsRegistry | None:
+    """
+    Create the metrics registry and register its endpoint.
+
+    The endpoint needs the http integration, without it metrics aren't collected.
+    """
+    if getattr(hass, "http", None) is None:
+        _LOGGER.error("Metrics need the http integration, they won't be exported")
+        return None
+
+    registry: MetricsRegistry = MetricsRegistry()
+    hass.http.register_view(GoeChargerMetricsView(registry))
+    hass.data[DOMAIN][INIT_STATE][METRICS] = registry
+    _LOGGER.debug("Exporting metrics at %s", METRICS_URL)
+
+    return registry
+
+
+@callback
+def async_track_coordinator(
+    hass: HomeAssistant,
+    coordinator_name: str,
+    coordinator: ChargerDataUpdateCoordinator,
+) -> None:
+    """
+    Feed the metrics with the coordinator updates, if the metrics are enabled.
+
+    The service calls are counted while at least one coordinator is tracked.
+    """
+    registry: MetricsRegistry | None = hass.data[DOMAIN][INIT_STATE].get(METRICS, None)
+
+    if registry is None:
+        return
+
+    if EVENT_CALL_SERVICE not in registry.unsub_listeners:
+        registry.unsub_listeners[EVENT_CALL_SERVICE] = hass.bus.async_listen(
+            EVENT_CALL_SERVICE, registry.async_count_service_call
+        )
+
+    registry.unsub_listeners[coordinator_name] = coordinator.async_add_listener(
+        lambda: registry.async_update_from_coordinator(coordinator)
+    )
+
+    if coordinator.data:
+        registry.async_update_from_coordinator(coordinator)
+
+
+@callback
+def async_untrack_coordinator(hass: HomeAssistant, coordinator_name: str) -> None:
+    """
+    Stop feeding the metrics with the coordinator updates, e.g. of an unloaded entry.
+
+    Samples of the chargers of the coordinator are removed, so they aren't exported
+    with their last values.
+    """
+    registry: MetricsRegistry | None = hass.data[DOMAIN][INIT_STATE].get(METRICS, None)
+
+    if registry is None:
+        return
+
+    unsub_coordinator: CALLBACK_TYPE | None = registry.unsub_listeners.pop(
+        coordinator_name, None
+    )
+
+    if unsub_coordinator is not None:
+        unsub_coordinator()
+
+    coordinator: ChargerDataUpdateCoordinator | None = hass.data[DOMAIN].get(
+        coordinator_name, None
+    )
+
+    if coordinator is not None and coordinator.data:
+        for charger_name in coordinator.data:
+            registry.remove_charger(charger_name)
+
+    if registry.unsub_listeners.keys() == {EVENT_CALL_SERVICE}:
+        registry.unsub_listeners.pop(EVENT_CALL_SERVICE)()
@@ -0,0 +1,178 @@
+"""Parsed state of a go-e Charger Cloud charger."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .const import (
+    CAR_STATUS,
+    CHARGER_ACCESS,
+    CHARGER_FORCE_CHARGING,
+    CHARGER_MAX_CURRENT,
+    CHARGING_ALLOWED,
+    CURRENT_L1,
+    CURRENT_L2,
+    CURRENT_L3,
+    ENERGY_SINCE_CAR_CONNECTED,
+    ENERGY_TOTAL,
+    MAX_CHARGING_CURRENT_LIMIT,
+    MIN_CHARGING_CURRENT_LIMIT,
+    ONLINE,
+    PHASE_SWITCH_MODE,
+    PHASES_NUMBER_CONNECTED,
+    STALE,
+    STATUS,
+    TRANSACTION,
+    CarStatus,
+)
+
+
+def _parse_car_status(value: Any) -> CarStatus | str | None:
+    """Return the car status as enum, unknown statuses are kept as they are."""
+    try:
+        return CarStatus(value)
+    except ValueError:
+        unknown_status: str | None = value
+        return unknown_status
+
+
+def _parse_int(value: Any) -> int | None:
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def _parse_float(value: Any) -> float | None:
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+# parsers of the status attributes, attributes missing here are kept as they are
+PARSERS: dict = {
+    CAR_STATUS: _parse_car_status,
+    CHARGER_MAX_CURRENT: _parse_int,
+    CURRENT_L1: _parse_float,
+    CURRENT_L2: _parse_float,
+    CURRENT_L3: _parse_float,
+    ENERGY_SINCE_CAR_CONNECTED: _parse_float,
+    ENERGY_TOTAL: _parse_float,
+    MAX_CHARGING_CURRENT_LIMIT: _parse_int,
+    MIN_CHARGING_CURRENT_LIMIT: _parse_int,
+    PHASE_SWITCH_MODE: _parse_int,
+    PHASES_NUMBER_CONNECTED: _parse_int,
+}
+
+
+class ChargerState(Mapping):
+    """
+    Immutable state of a single charger, parsed once per fetch.
+
+    Platforms read the typed attributes directly. For compatibility, the state is also
+    a read-only mapping of the same attribute names as the API status (e.g. state[CAR_STATUS]).
+    Attributes which weren't fetched are None. Changes create a new state via replace().
+    """
+
+    __slots__ = (
+        CAR_STATUS,
+        CHARGER_ACCESS,
+        CHARGER_FORCE_CHARGING,
+        CHARGER_MAX_CURRENT,
+        CHARGING_ALLOWED,
+        CURRENT_L1,
+        CURRENT_L2,
+        CURRENT_L3,
+        ENERGY_SINCE_CAR_CONNECTED,
+        ENERGY_TOTAL,
+        MAX_CHARGING_CURRENT_LIMIT,
+        MIN_CHARGING_CURRENT_LIMIT,
+        PHASE_SWITCH_MODE,
+        PHASES_NUMBER_CONNECTED,
+        TRANSACTION,
+        STATUS,
+        STALE,
+        "name",
+    )
+
+    car_status: CarStatus | str | None
+    charger_access: bool | None
+    charger_force_charging: str | None
+    charger_max_current: int | None
+    charging_allowed: str | None
+    i_l1: float | None
+    i_l2: float | None
+    i_l3: float | None
+    energy_since_car_connected: float | None
+    energy_total: float | None
+    max_charging_current_limit: int | None
+    min_charging_current_limit: int | None
+    phase_switch_mode: int | None
+    phases_number_connected: int | None
+    transaction: int | None
+    status: str | None
+    # restored from the cache, not fetched yet
+    stale: bool | None
+    name: str | None
+
+    def __init__(self, **values: Any) -> None:
+        """Construct the state from already parsed values."""
+        for field in self.__slots__:
+            object.__setattr__(self, field, values.get(field, None))
+
+    @classmethod
+    def from_status(
+        cls, status: Mapping, name: str | None, charger_status: str = ONLINE
+    ) -> ChargerState:
+        """Parse the (mapped) API status of the charger."""
+        values: dict = {
+            key: PARSERS[key](value) if key in PARSERS else value
+            for key, value in status.items()
+            if key in cls.__slots__
+        }
+        values[STATUS] = charger_status
+        values["name"] = name
+
+        return cls(**values)
+
+    def replace(self, **changes: Any) -> ChargerState:
+        """Return a new state with the changed (and parsed) attributes."""
+        values: dict = {field: getattr(self, field) for field in self.__slots__}
+        values.update(
+            {
+                key: PARSERS[key](value) if key in PARSERS else value
+                for key, value in changes.items()
+                if key in self.__slots__
+            }
+        )
+
+        return ChargerState(**values)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        """Refuse to set attributes, the state is immutable."""
+        raise AttributeError(f"ChargerState is immutable, use replace() for {key}")
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the attribute, raise KeyError if it's not an attribute of the state."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the attribute names."""
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        """Return the number of the attributes."""
+        return len(self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare all attributes of two states, other mappings are compared as dicts."""
+        if isinstance(other, ChargerState):
+            return all(
+                getattr(self, field) == getattr(other, field)
+                for field in self.__slots__
+            )
+
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        """Return the attributes of the state."""
+        return f"ChargerState({dict(self.items())})"
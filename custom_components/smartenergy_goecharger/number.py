@@ -15,20 +15,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import (
-    CAR_STATUS,
-    CHARGER_MAX_CURRENT,
-    CONF_CHARGERS,
-    DOMAIN,
-    MAX_CHARGING_CURRENT_LIMIT,
-    MIN_CHARGING_CURRENT_LIMIT,
-    ONLINE,
-    STATUS,
-    CarStatus,
-)
+
+from .const import CHARGER_MAX_CURRENT, CONF_CHARGERS, DOMAIN, ONLINE, CarStatus
 from .controller import ChargerController, init_service_data
+from .entity import ChargerEntity
+from .model import ChargerState
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -48,7 +39,7 @@ class BaseNumberDescription(NumberEntityDescription):
     press_args: None = None
 
 
-class CurrentInputNumber(CoordinatorEntity, NumberEntity):
+class CurrentInputNumber(ChargerEntity, NumberEntity):
     """Representation of the current number input."""
 
     def __init__(
@@ -89,7 +80,7 @@ class CurrentInputNumber(CoordinatorEntity, NumberEntity):
     @property
     def native_value(self) -> Any:
         """Return the value of the entity."""
-        return self.coordinator.data[self._device_id][self._attribute]
+        return getattr(self.coordinator.data[self._device_id], self._attribute)
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the value of the entity."""
@@ -109,11 +100,10 @@ class CurrentInputNumber(CoordinatorEntity, NumberEntity):
     def available(self) -> Any:
         """Make the number input (un)available based on the status."""
 
-        data: dict = self.coordinator.data[self._device_id]
+        data: ChargerState = self.coordinator.data[self._device_id]
 
         return (
-            data[STATUS] == ONLINE
-            and data[CAR_STATUS] != CarStatus.CHARGER_READY_NO_CAR
+            data.status == ONLINE and data.car_status != CarStatus.CHARGER_READY_NO_CAR
         )
 
 
@@ -124,17 +114,19 @@ def _create_input_numbers(
     number_entities: list[CurrentInputNumber] = []
 
     for charger_name in chargers:
-        data: dict = hass.data[DOMAIN][f"{charger_name}_coordinator"].data[charger_name]
+        data: ChargerState = hass.data[DOMAIN][f"{charger_name}_coordinator"].data[
+            charger_name
+        ]
 
         if (
-            MIN_CHARGING_CURRENT_LIMIT not in data
-            or MAX_CHARGING_CURRENT_LIMIT not in data
+            data.min_charging_current_limit is None
+            or data.max_charging_current_limit is None
         ):
             _LOGGER.error("Data not available, won't create number inputs")
             return []
 
-        min_limit: int = data[MIN_CHARGING_CURRENT_LIMIT]
-        max_limit: int = data[MAX_CHARGING_CURRENT_LIMIT]
+        min_limit: int = data.min_charging_current_limit
+        max_limit: int = data.max_charging_current_limit
 
         if min_limit >= max_limit:
             _LOGGER.error(
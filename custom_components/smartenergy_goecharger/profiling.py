@@ -0,0 +1,198 @@
+"""Opt-in timing of the go-e Charger Cloud hot paths."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from functools import wraps
+import logging
+import math
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, PROFILER
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# spans kept per charger, older ones are overwritten
+DEFAULT_WINDOW_SIZE: int = 256
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+EVENT_TIMINGS: str = f"{DOMAIN}_timings"
+
+TIMINGS_SCHEMA: vol.Schema = vol.Schema({vol.Optional("enabled"): cv.boolean})
+
+# returned while the timing is disabled, it's reusable and doesn't allocate
+_NULL_SPAN: AbstractContextManager = nullcontext()
+
+
+class RollingStats:
+    """Ring buffer of the durations of a single span, the percentiles are computed on read."""
+
+    def __init__(self, size: int = DEFAULT_WINDOW_SIZE) -> None:
+        """Construct empty stats."""
+        self._size: int = size
+        self._durations: array = array("d", bytes(8 * size))
+        self._next: int = 0
+        self.count: int = 0
+        self.total_count: int = 0
+
+    def add(self, duration: float) -> None:
+        """Add the duration in seconds."""
+        self._durations[self._next] = duration
+        self._next = (self._next + 1) % self._size
+        self.count = min(self.count + 1, self._size)
+        self.total_count += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Return the percentiles and the max of the kept durations in ms."""
+        durations: list[float] = sorted(self._durations[: self.count])
+
+        if not durations:
+            return {"count": self.total_count}
+
+        return {
+            "count": self.total_count,
+            **{
+                f"p{percentile}": round(
+                    durations[math.ceil(percentile / 100 * len(durations)) - 1] * 1000,
+                    3,
+                )
+                for percentile in PERCENTILES
+            },
+            "max": round(durations[-1] * 1000, 3),
+        }
+
+
+class Span:
+    """Context manager adding its wall-clock duration to the stats."""
+
+    __slots__ = ("_stats", "_start")
+
+    def __init__(self, stats: RollingStats) -> None:
+        """Construct the span of the stats."""
+        self._stats: RollingStats = stats
+        self._start: float = 0
+
+    def __enter__(self) -> Span:
+        """Start the timing of the block."""
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Add the duration of the block, also if it raised."""
+        self._stats.add(time.perf_counter() - self._start)
+
+
+class Profiler:
+    """Rolling stats of the timed spans per charger."""
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE) -> None:
+        """Construct the profiler without any stats."""
+        self._window_size: int = window_size
+        self.stats: dict[str, dict[str, RollingStats]] = {}
+
+    def _stats(self, charger_name: str, span_name: str) -> RollingStats:
+        charger_stats: dict[str, RollingStats] = self.stats.setdefault(charger_name, {})
+
+        if span_name not in charger_stats:
+            charger_stats[span_name] = RollingStats(self._window_size)
+
+        return charger_stats[span_name]
+
+    def span(self, charger_name: str, span_name: str) -> Span:
+        """Return a span timing the block for the charger."""
+        return Span(self._stats(charger_name, span_name))
+
+    def record(self, charger_name: str, span_name: str, duration: float) -> None:
+        """Add a duration in seconds measured elsewhere."""
+        self._stats(charger_name, span_name).add(duration)
+
+    def summary(self, charger_names: Iterable[str] | None = None) -> dict[str, dict]:
+        """Return the stats of the chargers (all if not provided) by the span name."""
+        names: Iterable[str] = self.stats if charger_names is None else charger_names
+
+        return {
+            charger_name: {
+                span_name: stats.summary()
+                for span_name, stats in self.stats[charger_name].items()
+            }
+            for charger_name in names
+            if charger_name in self.stats
+        }
+
+
+@callback
+def async_get_profiler(hass: HomeAssistant) -> Profiler | None:
+    """Return the profiler, None if the timing is disabled."""
+    profiler: Profiler | None = hass.data.get(PROFILER, None)
+
+    return profiler
+
+
+@callback
+def async_set_profiling(hass: HomeAssistant, enabled: bool) -> None:
+    """Enable or disable the timing, disabling drops the collected stats."""
+    if not enabled:
+        hass.data.pop(PROFILER, None)
+    elif PROFILER not in hass.data:
+        hass.data[PROFILER] = Profiler()
+
+    _LOGGER.debug("Timing of the hot paths enabled=%s", enabled)
+
+
+def async_span(
+    hass: HomeAssistant, charger_name: str, span_name: str
+) -> AbstractContextManager:
+    """Return a span timing the block for the charger, a no-op one if the timing is disabled."""
+    profiler: Profiler | None = hass.data.get(PROFILER, None)
+
+    if profiler is None:
+        return _NULL_SPAN
+
+    return profiler.span(charger_name, span_name)
+
+
+def timed_service(
+    method: Callable[[Any, ServiceCall], Awaitable[Any]]
+) -> Callable[[Any, ServiceCall], Awaitable[Any]]:
+    """Time the controller service per device_name of the call, the span is the method name."""
+
+    @wraps(method)
+    async def wrapper(self: Any, call: ServiceCall) -> Any:
+        # pylint: disable-next=protected-access
+        profiler: Profiler | None = self._hass.data.get(PROFILER, None)
+
+        if profiler is None:
+            return await method(self, call)
+
+        with profiler.span(call.data.get("device_name", ""), method.__name__):
+            return await method(self, call)
+
+    return wrapper
+
+
+async def async_handle_timings_service(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """
+    Enable or disable the timing if requested and return the collected stats.
+
+    Stats are logged and fired as the EVENT_TIMINGS event.
+    """
+    if "enabled" in call.data:
+        async_set_profiling(hass, call.data["enabled"])
+
+    profiler: Profiler | None = async_get_profiler(hass)
+    timings: dict = profiler.summary() if profiler is not None else {}
+
+    _LOGGER.info("Timings of the chargers=%s", timings)
+    hass.bus.async_fire(
+        EVENT_TIMINGS, {"enabled": profiler is not None, "timings": timings}
+    )
+
+    return timings
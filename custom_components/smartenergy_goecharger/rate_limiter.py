@@ -0,0 +1,174 @@
+"""Client-side rate limiting of the go-e Charger Cloud API requests."""
+
+import asyncio
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import RATE_LIMITERS
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+PRIORITY_COMMAND: int = 0
+PRIORITY_POLL: int = 1
+
+DEFAULT_RATE_LIMIT: float = 1.0
+DEFAULT_BURST: int = 5
+# tokens which polls leave for commands
+COMMAND_RESERVE: int = 1
+DEFAULT_RETRY_AFTER: float = 60.0
+
+# diagnostic sensor of the bucket and its attributes
+ATTR_RATE_LIMIT_SATURATION: str = "rate_limit_saturation"
+ATTR_REJECTED_POLLS: str = "rejected_polls"
+ATTR_THROTTLED_COMMANDS: str = "throttled_commands"
+ATTR_PAUSED_UNTIL: str = "paused_until"
+
+
+class RateLimitedError(RuntimeError):
+    """Request wasn't sent because of the API quota."""
+
+
+def parse_retry_after(value: str | None) -> float:
+    """Return the seconds to wait from the Retry-After header, given in seconds or as a HTTP date."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_after: float = (
+            parsedate_to_datetime(value) - dt_util.utcnow()
+        ).total_seconds()
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+    return max(retry_after, 0)
+
+
+class TokenBucket:
+    """
+    Token bucket of the requests sent with the same API token.
+
+    The bucket holds up to burst tokens and refills with rate tokens per second.
+    Commands have priority over polls:
+
+    - commands wait for a token, while polls are rejected immediately if there is none,
+      the next coordinator tick polls again
+    - polls leave COMMAND_RESERVE tokens for commands and don't take any while
+      a command waits.
+
+    If the API responds with 429, the bucket is paused for the Retry-After period.
+    Saturation is the share of the burst used up, 0 for a full bucket and 1 for an empty one.
+    """
+
+    def __init__(
+        self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_BURST
+    ) -> None:
+        """Construct a full bucket."""
+        self._rate: float = rate
+        self._burst: int = burst
+        self._tokens: float = burst
+        self._updated_at: float = time.monotonic()
+        self._paused_until: float = 0
+        self._paused_until_utc: datetime | None = None
+        self._waiting_commands: int = 0
+        self.rejected_polls: int = 0
+        self.throttled_commands: int = 0
+
+    def _refill(self) -> float:
+        """Add the tokens since the last refill and return the current time."""
+        now: float = time.monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated_at) * self._rate, self._burst
+        )
+        self._updated_at = now
+
+        return now
+
+    @property
+    def saturation(self) -> float:
+        """Return the used share of the burst, 1 while paused."""
+        now: float = self._refill()
+
+        if now < self._paused_until:
+            return 1.0
+
+        return round(1 - self._tokens / self._burst, 2)
+
+    @property
+    def paused_until(self) -> datetime | None:
+        """Return the time until the bucket is paused, if it is."""
+        return self._paused_until_utc if time.monotonic() < self._paused_until else None
+
+    def pause(self, seconds: float) -> None:
+        """Stop sending requests for the given number of seconds, e.g. after 429."""
+        now: float = self._refill()
+        self._tokens = 0
+
+        if now + seconds > self._paused_until:
+            self._paused_until = now + seconds
+            self._paused_until_utc = dt_util.utcnow() + timedelta(seconds=seconds)
+
+    def _try_acquire(self, reserve: int) -> bool:
+        now: float = self._refill()
+
+        if now < self._paused_until or self._tokens < 1 + reserve:
+            return False
+
+        self._tokens -= 1
+
+        return True
+
+    async def async_acquire(self, priority: int = PRIORITY_POLL) -> None:
+        """Take a token. Commands wait for it, polls raise RateLimitedError if there is none."""
+        if priority == PRIORITY_POLL:
+            if self._waiting_commands or not self._try_acquire(
+                min(COMMAND_RESERVE, self._burst - 1)
+            ):
+                self.rejected_polls += 1
+                raise RateLimitedError("API quota reached, skipping the poll")
+
+            return
+
+        if self._try_acquire(0):
+            return
+
+        self.throttled_commands += 1
+        self._waiting_commands += 1
+
+        try:
+            while not self._try_acquire(0):
+                await asyncio.sleep(
+                    max(
+                        self._paused_until - time.monotonic(),
+                        (1 - self._tokens) / self._rate,
+                        0,
+                    )
+                )
+        finally:
+            self._waiting_commands -= 1
+
+
+@callback
+def async_get_rate_limiter(
+    hass: HomeAssistant,
+    token: str,
+    rate: float = DEFAULT_RATE_LIMIT,
+    burst: int = DEFAULT_BURST,
+) -> TokenBucket:
+    """Return the bucket shared by all API clients using the same API token."""
+    rate_limiters: dict[str, TokenBucket] = hass.data.setdefault(RATE_LIMITERS, {})
+
+    if token not in rate_limiters:
+        _LOGGER.debug("Creating rate limiter with rate=%s and burst=%s", rate, burst)
+        rate_limiters[token] = TokenBucket(rate, burst)
+
+    return rate_limiters[token]
@@ -0,0 +1,69 @@
+"""Adaptive polling interval for the go-e Charger Cloud coordinators."""
+
+from datetime import timedelta
+import logging
+
+from .const import OFFLINE, CarStatus
+from .model import ChargerState
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+IDLE_INTERVAL_FACTOR: int = 6
+MAX_OFFLINE_INTERVAL: timedelta = timedelta(minutes=5)
+
+# car states where a fresh state matters - energy readings or a pending authentication
+FAST_POLLING_CAR_STATUSES: list[CarStatus] = [
+    CarStatus.CAR_CHARGING,
+    CarStatus.CAR_CONNECTED_AUTH_REQUIRED,
+]
+
+
+class AdaptivePollScheduler:
+    """
+    Compute the coordinator update interval from the car status of its chargers.
+
+    - fast (scan interval) while a car is charging or waits for the authentication
+    - slow (scan interval * IDLE_INTERVAL_FACTOR) while no car is connected or charging finished
+    - exponential backoff, starting at the scan interval, while the charger is offline.
+
+    If a coordinator polls more chargers, the shortest interval wins.
+    """
+
+    def __init__(self, scan_interval: timedelta) -> None:
+        """Construct the scheduler with the configured scan interval as the fast interval."""
+        self._scan_interval: timedelta = scan_interval
+        self._idle_interval: timedelta = scan_interval * IDLE_INTERVAL_FACTOR
+        self._max_offline_interval: timedelta = max(scan_interval, MAX_OFFLINE_INTERVAL)
+        self._offline_ticks: dict[str, int] = {}
+
+    def _charger_interval(
+        self, charger_name: str, charger_data: ChargerState
+    ) -> timedelta:
+        """Return the polling interval of a single charger."""
+        if charger_data.status == OFFLINE:
+            offline_ticks: int = self._offline_ticks.get(charger_name, 0)
+            self._offline_ticks[charger_name] = offline_ticks + 1
+
+            backoff: int = 2**offline_ticks
+
+            return min(self._scan_interval * backoff, self._max_offline_interval)
+
+        self._offline_ticks.pop(charger_name, None)
+
+        if charger_data.car_status in FAST_POLLING_CAR_STATUSES:
+            return self._scan_interval
+
+        return self._idle_interval
+
+    def next_interval(self, data: dict) -> timedelta:
+        """Return the next update interval for the coordinator data of all its chargers."""
+        if not data:
+            return self._scan_interval
+
+        next_interval: timedelta = min(
+            self._charger_interval(charger_name, charger_data)
+            for charger_name, charger_data in data.items()
+        )
+        _LOGGER.debug("Next update interval set to=%s", next_interval)
+
+        return next_interval
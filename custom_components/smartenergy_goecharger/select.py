@@ -15,18 +15,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import (
-    CAR_STATUS,
-    CONF_CHARGERS,
-    DOMAIN,
-    ONLINE,
-    PHASE_SWITCH_MODE,
-    STATUS,
-    CarStatus,
-)
+
+from .const import CONF_CHARGERS, DOMAIN, ONLINE, PHASE_SWITCH_MODE, CarStatus
 from .controller import ChargerController, init_service_data
+from .entity import ChargerEntity
+from .model import ChargerState
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -47,7 +40,7 @@ class BaseSelectDescription(SelectEntityDescription):
     press_args: None = None
 
 
-class PhaseSelectInput(CoordinatorEntity, SelectEntity):
+class PhaseSelectInput(ChargerEntity, SelectEntity):
     """Representation of the phase mode select input."""
 
     def __init__(
@@ -82,10 +75,14 @@ class PhaseSelectInput(CoordinatorEntity, SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the state of the entity."""
-        if self._attribute not in self.coordinator.data[self._device_id]:
+        value: int | None = getattr(
+            self.coordinator.data[self._device_id], self._attribute
+        )
+
+        if value is None:
             return None
 
-        return str(self.coordinator.data[self._device_id][self._attribute])
+        return str(value)
 
     @property
     def unique_id(self) -> str | None:
@@ -96,11 +93,10 @@ class PhaseSelectInput(CoordinatorEntity, SelectEntity):
     def available(self) -> Any:
         """Make the select input (un)available based on the status."""
 
-        data: dict = self.coordinator.data[self._device_id]
+        data: ChargerState = self.coordinator.data[self._device_id]
 
         return (
-            data[STATUS] == ONLINE
-            and data[CAR_STATUS] != CarStatus.CHARGER_READY_NO_CAR
+            data.status == ONLINE and data.car_status != CarStatus.CHARGER_READY_NO_CAR
         )
 
 
@@ -112,11 +108,11 @@ def _create_select_inputs(
 
     for charger_name in chargers:
         for select_input in SELECT_INPUTS:
-            data: dict = hass.data[DOMAIN][f"{charger_name}_coordinator"].data[
+            data: ChargerState = hass.data[DOMAIN][f"{charger_name}_coordinator"].data[
                 charger_name
             ]
 
-            if PHASE_SWITCH_MODE not in data:
+            if data.phase_switch_mode is None:
                 _LOGGER.error("Data not available, won't create select inputs")
                 return []
 
@@ -134,7 +130,7 @@ def _create_select_inputs(
                         "device_class": f"{DOMAIN}__phase_switch_mode",
                     },
                     {
-                        "current_option": str(data[PHASE_SWITCH_MODE]),
+                        "current_option": str(data.phase_switch_mode),
                         "regular": select_input["options"],
                     },
                 )
@@ -1,47 +1,72 @@
 """Sensor platform configuration for go-e Charger Cloud."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
-import numbers
-from typing import Any, Literal
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Literal
 
 from homeassistant.components.sensor import (
     DOMAIN as SENSOR_DOMAIN,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .circuit_breaker import (
+    ATTR_CIRCUIT_BREAKER,
+    ATTR_CONSECUTIVE_FAILURES,
+    ATTR_NEXT_PROBE,
+    CircuitBreaker,
 )
-
 from .const import (
+    API,
     CAR_STATUS,
     CHARGER_ACCESS,
     CHARGER_MAX_CURRENT,
+    CHARGERS_API,
     CHARGING_ALLOWED,
+    CHARGING_POWER,
     CONF_CHARGERS,
     DOMAIN,
     ENERGY_SINCE_CAR_CONNECTED,
     ENERGY_TOTAL,
-    MANUFACTURER,
+    INIT_STATE,
     ONLINE,
     PHASE_SWITCH_MODE,
     PHASES_NUMBER_CONNECTED,
-    STATUS,
+    SESSION_AVERAGE_POWER,
+    SESSION_ENERGY,
+    SESSION_PEAK_CURRENT,
+    STATE_FETCHERS,
+    CarStatus,
+)
+from .entity import ChargerEntity
+from .history import EnergyHistory
+from .model import ChargerState
+from .rate_limiter import (
+    ATTR_PAUSED_UNTIL,
+    ATTR_RATE_LIMIT_SATURATION,
+    ATTR_REJECTED_POLLS,
+    ATTR_THROTTLED_COMMANDS,
+    TokenBucket,
 )
 
-MINUTE_IN_MS: Literal[60000] = 60_000
+if TYPE_CHECKING:
+    from .state import StateFetcher
 
 # Reference: https://developers.home-assistant.io/docs/core/entity/sensor/#long-term-statistics
 AMPERE: Literal["A"] = "A"
+PERCENTAGE: Literal["%"] = "%"
+K_WATT: Literal["kW"] = "kW"
 K_WATT_HOUR: Literal["kWh"] = "kWh"
-TIME_MINUTES: Literal["min"] = "min"
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -87,80 +112,263 @@ CHARGER_SENSORS_CONFIG: dict = {
 }
 
 
-class ChargerSensor(CoordinatorEntity, SensorEntity):
+@dataclass
+class ChargerSensorEntityDescription(SensorEntityDescription):
+    """Class to describe a charger sensor with its value function."""
+
+    value_fn: Callable[[ChargerState], StateType] = lambda data: None
+
+
+def _compile_value_fn(attribute: str, unit: str) -> Callable[[ChargerState], StateType]:
+    """Return the function computing the sensor value from the charger state."""
+    get_value: Callable[[ChargerState], StateType] = attrgetter(attribute)
+
+    if attribute == CHARGER_MAX_CURRENT:
+        # if charging is not allowed, show current as 0
+        def current_value(data: ChargerState) -> StateType:
+            value: StateType = get_value(data)
+
+            if value is None or data.charging_allowed != "off":
+                return value
+
+            return 0
+
+        return current_value
+
+    if attribute == CAR_STATUS:
+        # the car status is parsed as enum, the state is its human readable value
+        def car_status_value(data: ChargerState) -> StateType:
+            value: CarStatus | str | None = data.car_status
+
+            return value.value if isinstance(value, CarStatus) else value
+
+        return car_status_value
+
+    if unit == K_WATT_HOUR:
+        # energy is parsed as float, convert Wh to kWh and round to 2 decimal positions
+        def energy_value(data: ChargerState) -> StateType:
+            value: StateType = get_value(data)
+
+            return None if value is None else round(float(value) / 1000, 2)
+
+        return energy_value
+
+    return get_value
+
+
+def _compile_sensor_descriptions() -> tuple[ChargerSensorEntityDescription, ...]:
+    """Compile the sensor config into descriptions, done once at import."""
+    units: dict = CHARGER_SENSORS_CONFIG["units"]
+
+    return tuple(
+        ChargerSensorEntityDescription(
+            key=sensor,
+            native_unit_of_measurement=units[sensor]["unit"] if sensor in units else "",
+            state_class=CHARGER_SENSORS_CONFIG["state_classes"].get(sensor, ""),
+            device_class=CHARGER_SENSORS_CONFIG["device_classes"].get(sensor, ""),
+            value_fn=_compile_value_fn(
+                sensor, units[sensor]["unit"] if sensor in units else ""
+            ),
+        )
+        for sensor in CHARGER_SENSORS_CONFIG["sensors"]
+    )
+
+
+SENSOR_DESCRIPTIONS: tuple[
+    ChargerSensorEntityDescription, ...
+] = _compile_sensor_descriptions()
+
+
+@dataclass
+class ChargerHistorySensorEntityDescription(SensorEntityDescription):
+    """Class to describe a sensor derived from the energy history of the charger."""
+
+    history_fn: Callable[[EnergyHistory], StateType] = lambda history: None
+
+
+HISTORY_SENSOR_DESCRIPTIONS: tuple[ChargerHistorySensorEntityDescription, ...] = (
+    ChargerHistorySensorEntityDescription(
+        key=CHARGING_POWER,
+        native_unit_of_measurement=K_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        history_fn=attrgetter("power.value"),
+    ),
+    ChargerHistorySensorEntityDescription(
+        key=SESSION_ENERGY,
+        native_unit_of_measurement=K_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        history_fn=attrgetter("session_energy"),
+    ),
+    ChargerHistorySensorEntityDescription(
+        key=SESSION_AVERAGE_POWER,
+        native_unit_of_measurement=K_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        history_fn=attrgetter("session_average_power"),
+    ),
+    ChargerHistorySensorEntityDescription(
+        key=SESSION_PEAK_CURRENT,
+        native_unit_of_measurement=AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        history_fn=attrgetter("session_peak_current"),
+    ),
+)
+
+
+class ChargerSensor(ChargerEntity, SensorEntity):
     """Representation of a sensor for the go-e Charger Cloud."""
 
+    entity_description: ChargerSensorEntityDescription
+
     def __init__(
         self,
         coordinator: DataUpdateCoordinator,
-        entity_id: str,
         device_id: str,
-        attributes: dict,
+        description: ChargerSensorEntityDescription,
     ) -> None:
         """Initialize the Base sensor."""
 
         super().__init__(coordinator)
+        self.entity_description = description
+        self.entity_id = f"{SENSOR_DOMAIN}.{DOMAIN}_{device_id}_{description.key}"
+        self._attr_unique_id = f"{device_id}_{description.key}"
         self._device_id = device_id
-        self.entity_id = entity_id
-        self._name: str = attributes["name"]
-        self._attribute: str = attributes["attribute"]
-        self._unit: str = attributes["unit"]
-        self._attr_state_class = attributes["state_class"]
-        self._attr_device_class = attributes["device_class"]
 
     @property
-    def device_info(self) -> entity.DeviceInfo:
-        """Return the device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._device_id,
-            "manufacturer": MANUFACTURER,
-            "model": "",
-        }
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.data[self._device_id])
 
     @property
-    def native_unit_of_measurement(self) -> str | None:
-        """Return the unit of measurement of the sensor, if any."""
-        return self._unit
+    def available(self) -> Any:
+        """Make the sensor input (un)available based on the status."""
+
+        return self.coordinator.data[self._device_id].status == ONLINE
+
+
+class ChargerHistorySensor(ChargerSensor):
+    """Sensor derived from the energy history, e.g. of the current (or last) charging session."""
+
+    entity_description: ChargerHistorySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        device_id: str,
+        description: ChargerHistorySensorEntityDescription,
+        history: EnergyHistory,
+    ) -> None:
+        """Initialize the sensor of the charger history."""
+
+        super().__init__(coordinator, device_id, description)
+        self._history = history
 
     @property
-    def native_value(self) -> float | str | int | None:
-        """Return the state of the sensor."""
-        if self._attribute not in self.coordinator.data[self._device_id]:
-            return None
+    def native_value(self) -> StateType:
+        """Return the value derived from the history."""
+        return self.entity_description.history_fn(self._history)
 
-        attr_value: float | str = self.coordinator.data[self._device_id][
-            self._attribute
-        ]
 
-        # if charging is not allowed, show current as 0
-        if (
-            self._attribute == CHARGER_MAX_CURRENT
-            and self.coordinator.data[self._device_id][CHARGING_ALLOWED] == "off"
-        ):
-            return 0
+class ChargerCircuitBreakerSensor(ChargerSensor):
+    """
+    Diagnostic sensor with the circuit breaker state of the charger polling.
 
-        # convert Wh to kWh and round to 2 decimal positions
-        if self._unit == K_WATT_HOUR and isinstance(attr_value, numbers.Number):
-            attr_value = round(float(attr_value) / 1000, 2)
+    Unlike the other sensors, it stays available while the charger fails.
+    """
 
-        # if attribute is a number and larger than 0, convert it to minutes
-        if (
-            self.state_class == TIME_MINUTES
-            and isinstance(attr_value, numbers.Number)
-            and float(attr_value) > 0
-        ):
-            return round(float(attr_value) / MINUTE_IN_MS, 2)
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        device_id: str,
+        breaker: CircuitBreaker,
+    ) -> None:
+        """Initialize the sensor of the charger breaker."""
+
+        super().__init__(
+            coordinator,
+            device_id,
+            ChargerSensorEntityDescription(
+                key=ATTR_CIRCUIT_BREAKER,
+                device_class=f"{DOMAIN}__{ATTR_CIRCUIT_BREAKER}",
+                entity_category=EntityCategory.DIAGNOSTIC,
+            ),
+        )
+        self._breaker = breaker
 
-        return attr_value
+    @property
+    def native_value(self) -> str:
+        """Return the breaker state."""
+        return self._breaker.state
 
     @property
-    def available(self) -> Any:
-        """Make the sensor input (un)available based on the status."""
+    def available(self) -> bool:
+        """Breaker is known even if the charger is offline."""
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the failures count and the time of the next probe of an open breaker."""
+        attributes: dict[str, Any] = dict(super().extra_state_attributes or {})
+        attributes[ATTR_CONSECUTIVE_FAILURES] = self._breaker.consecutive_failures
+        attributes[ATTR_NEXT_PROBE] = (
+            self._breaker.next_probe.isoformat() if self._breaker.next_probe else None
+        )
+
+        return attributes
+
+
+class ChargerRateLimitSensor(ChargerSensor):
+    """
+    Diagnostic sensor with the saturation of the API rate limiter used by the charger.
+
+    Like the circuit breaker sensor, it stays available while the charger fails.
+    """
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        device_id: str,
+        rate_limiter: TokenBucket,
+    ) -> None:
+        """Initialize the sensor of the charger rate limiter."""
+
+        super().__init__(
+            coordinator,
+            device_id,
+            ChargerSensorEntityDescription(
+                key=ATTR_RATE_LIMIT_SATURATION,
+                native_unit_of_measurement=PERCENTAGE,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+            ),
+        )
+        self._rate_limiter = rate_limiter
 
-        data: dict = self.coordinator.data[self._device_id]
+    @property
+    def native_value(self) -> int:
+        """Return the used share of the rate limiter burst in %."""
+        return round(self._rate_limiter.saturation * 100)
 
-        return data[STATUS] == ONLINE
+    @property
+    def available(self) -> bool:
+        """Rate limiter is known even if the charger is offline."""
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the rejected polls, throttled commands and the end of a 429 pause."""
+        paused_until = self._rate_limiter.paused_until
+        attributes: dict[str, Any] = dict(super().extra_state_attributes or {})
+        attributes[ATTR_REJECTED_POLLS] = self._rate_limiter.rejected_polls
+        attributes[ATTR_THROTTLED_COMMANDS] = self._rate_limiter.throttled_commands
+        attributes[ATTR_PAUSED_UNTIL] = (
+            paused_until.isoformat() if paused_until else None
+        )
+
+        return attributes
 
 
 def _setup_sensors(
@@ -168,54 +376,44 @@ def _setup_sensors(
     sensor_ids: list,
     coordinator_name: str,
 ) -> list:
-    entities: list[ChargerSensor] = []
+    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][coordinator_name]
 
-    for sensor_id in sensor_ids:
-        sensors: list[ChargerSensor] = []
-        _LOGGER.debug("Creating sensors for the %s=%s", DOMAIN, sensor_id)
+    _LOGGER.debug("Creating sensors for the %s=%s", DOMAIN, sensor_ids)
 
-        for sensor in CHARGER_SENSORS_CONFIG.get("sensors", []):
-            _LOGGER.debug("Adding sensor=%s for the %s=%s", sensor, DOMAIN, sensor_id)
+    state_fetchers: dict = hass.data[DOMAIN][INIT_STATE][STATE_FETCHERS]
+    chargers_api: dict = hass.data[DOMAIN][INIT_STATE][CHARGERS_API]
 
-            sensor_unit: str = (
-                CHARGER_SENSORS_CONFIG.get("units", {}).get(sensor).get("unit")
-                if CHARGER_SENSORS_CONFIG.get("units", {}).get(sensor)
-                else ""
-            )
-            sensor_name: str = (
-                CHARGER_SENSORS_CONFIG.get("units", {}).get(sensor).get("name")
-                if CHARGER_SENSORS_CONFIG.get("units", {}).get(sensor)
-                else sensor
-            )
-            sensor_state_class: str = (
-                CHARGER_SENSORS_CONFIG.get("state_classes", {})[sensor]
-                if sensor in CHARGER_SENSORS_CONFIG.get("state_classes", {})
-                else ""
-            )
-            sensor_device_class: str = (
-                CHARGER_SENSORS_CONFIG.get("device_classes", {})[sensor]
-                if sensor in CHARGER_SENSORS_CONFIG.get("device_classes", {})
-                else ""
-            )
+    sensors: list = []
 
-            sensors.append(
-                ChargerSensor(
-                    hass.data[DOMAIN][coordinator_name],
-                    f"{SENSOR_DOMAIN}.{DOMAIN}_{sensor_id}_{sensor}",
+    for sensor_id in sensor_ids:
+        sensors.extend(
+            ChargerSensor(coordinator, sensor_id, description)
+            for description in SENSOR_DESCRIPTIONS
+        )
+
+        if sensor_id in state_fetchers:
+            state_fetcher: "StateFetcher" = state_fetchers[sensor_id]
+            sensors.extend(
+                ChargerHistorySensor(
+                    coordinator,
                     sensor_id,
-                    {
-                        "name": sensor_name,
-                        "attribute": sensor,
-                        "unit": sensor_unit,
-                        "state_class": sensor_state_class,
-                        "device_class": sensor_device_class,
-                    },
+                    description,
+                    state_fetcher.histories[sensor_id],
                 )
+                for description in HISTORY_SENSOR_DESCRIPTIONS
             )
+            sensors.append(
+                ChargerCircuitBreakerSensor(
+                    coordinator, sensor_id, state_fetcher.breakers[sensor_id]
+                )
+            )
+
+        rate_limiter: TokenBucket | None = chargers_api[sensor_id][API].rate_limiter
 
-        entities.extend(sensors)
+        if rate_limiter is not None:
+            sensors.append(ChargerRateLimitSensor(coordinator, sensor_id, rate_limiter))
 
-    return entities
+    return sensors
 
 
 async def async_setup_entry(
@@ -1,26 +1,111 @@
 """go-e Charger Cloud state (coordinator) management."""
 
+import asyncio
 import logging
+import time
 
 import aiohttp
-from goechargerv2.goecharger import GoeChargerApi
 
 from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import API, CHARGERS_API, DOMAIN, INIT_STATE, OFFLINE, ONLINE, STATUS
+from .api import GoeChargerAsyncApi, async_get_host_session
+from .cache import StateCache
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    API,
+    CAR_STATUS,
+    CHARGER_FORCE_CHARGING,
+    CHARGERS_API,
+    CHARGING_ALLOWED,
+    CURRENT_L1,
+    CURRENT_L2,
+    CURRENT_L3,
+    DOMAIN,
+    INIT_STATE,
+    MAX_CHARGING_CURRENT_LIMIT,
+    METRICS,
+    MIN_CHARGING_CURRENT_LIMIT,
+    OFFLINE,
+    ONLINE,
+    STATE_CACHE,
+    TRANSACTION,
+)
 from .controller import fetch_status
+from .coordinator import ChargerDataUpdateCoordinator
+from .history import EnergyHistory
+from .metrics import MetricsRegistry
+from .model import ChargerState
+from .number import NUMBER_INPUTS
+from .profiling import Profiler, RollingStats, async_get_profiler
+from .rate_limiter import DEFAULT_RATE_LIMIT, RateLimitedError, async_get_rate_limiter
+from .scheduler import AdaptivePollScheduler
+from .select import SELECT_INPUTS
+from .sensor import CHARGER_SENSORS_CONFIG
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENT_REQUESTS: int = 10
+DEFAULT_REQUEST_TIMEOUT: float = 5.0
 
-def init_state(name: str, url: str, token: str) -> dict:
-    """Initialize the state with go-e Charger Cloud API and static values."""
+
+def get_status_keys() -> list[str]:
+    """
+    Return status attributes read by the registered platforms and the controller.
+
+    Only these attributes are requested from the API, which keeps the payload small.
+    """
+
+    status_keys: list[str] = [
+        *CHARGER_SENSORS_CONFIG["sensors"],
+        *[number_input["id"] for number_input in NUMBER_INPUTS],
+        *[select_input["id"] for select_input in SELECT_INPUTS],
+        CAR_STATUS,
+        CHARGING_ALLOWED,
+        MIN_CHARGING_CURRENT_LIMIT,
+        MAX_CHARGING_CURRENT_LIMIT,
+        # measured currents of the energy history
+        CURRENT_L1,
+        CURRENT_L2,
+        CURRENT_L3,
+        # written by the commands and compared by their confirmation
+        CHARGER_FORCE_CHARGING,
+        TRANSACTION,
+    ]
+
+    return list(dict.fromkeys(key for key in status_keys if key != CONF_NAME))
+
+
+def init_state(
+    hass: HomeAssistant,
+    name: str,
+    url: str,
+    token: str,
+    rate_limit: float = DEFAULT_RATE_LIMIT,
+    local_host: str | None = None,
+) -> dict:
+    """
+    Initialize the state with go-e Charger Cloud API and static values.
+
+    Chargers with the same API token share the rate limiter, it's created with
+    the rate limit (requests per second) of the first of them.
+    If the local host is provided, the API talks to the wallbox in the LAN with a fallback
+    to the cloud.
+    """
 
     return {
         CONF_NAME: name,
-        API: GoeChargerApi(url, token, wait=True),
+        API: GoeChargerAsyncApi(
+            url,
+            token,
+            async_get_host_session(hass, url),
+            status_keys=get_status_keys(),
+            rate_limiter=async_get_rate_limiter(hass, token, rate_limit),
+            local_host=local_host,
+            local_session=async_get_host_session(hass, local_host)
+            if local_host
+            else None,
+        ),
     }
 
 
@@ -29,56 +114,229 @@ class StateFetcher:
     Representation of the coordinator state handling.
 
     Whenever the coordinator is triggered, it will call the APIs and update status data.
+    The fetcher is scoped to the chargers it owns, so every coordinator polls only
+    its own chargers. Chargers are polled concurrently, with at most max_concurrency
+    requests in flight and each of them limited by the request_timeout.
+    If a scheduler is provided, it adapts the coordinator update interval after each fetch.
+    Every charger has a circuit breaker, chargers failing repeatedly are skipped
+    with their last known state until the breaker lets a probe through.
+    Freshly fetched states of online chargers are added to their energy history.
+    The last raw status of each charger and the recent cycle durations are kept
+    for the diagnostics. Unlike the opt-in timings, the cycle durations are always
+    collected, a ring buffer keeps it cheap.
     """
 
-    coordinator: DataUpdateCoordinator
+    coordinator: ChargerDataUpdateCoordinator
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        """Construct controller with hass property."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        charger_names: list[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        scheduler: AdaptivePollScheduler | None = None,
+    ) -> None:
+        """Construct controller with hass property and the list of owned chargers."""
         self._hass: HomeAssistant = hass
+        self._scheduler: AdaptivePollScheduler | None = scheduler
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._request_timeout: float = request_timeout
+        self.charger_names: list[str] = charger_names
+        self.breakers: dict[str, CircuitBreaker] = {
+            charger_name: CircuitBreaker() for charger_name in charger_names
+        }
+        self.histories: dict[str, EnergyHistory] = {
+            charger_name: EnergyHistory() for charger_name in charger_names
+        }
+        self.last_status: dict[str, dict] = {}
+        self.cycle_durations: RollingStats = RollingStats()
+        self.last_cycle_duration: float | None = None
+
+    def _offline_state(self, charger_name: str, current_data: dict) -> ChargerState:
+        """Return the last known state of the charger marked offline."""
+        current_state: ChargerState | None = current_data.get(charger_name, None)
+
+        if current_state is None:
+            return ChargerState(
+                status=OFFLINE,
+                name=self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][
+                    CONF_NAME
+                ],
+            )
+
+        return current_state.replace(status=OFFLINE)
+
+    def _last_known_state(self, charger_name: str, current_data: dict) -> ChargerState:
+        """Return the last known state of the charger, marked offline if there is none."""
+        current_state: ChargerState | None = current_data.get(charger_name, None)
+
+        if current_state is None:
+            return self._offline_state(charger_name, current_data)
+
+        return current_state
+
+    def _record_failure(self, charger_name: str, reason: str) -> None:
+        """Count the failure in the breaker, log only the first failure and the breaker trips."""
+        breaker: CircuitBreaker = self.breakers[charger_name]
+
+        if breaker.record_failure():
+            _LOGGER.warning(
+                "%s, skipping it until %s",
+                reason,
+                breaker.next_probe,
+            )
+        elif breaker.consecutive_failures == 1:
+            _LOGGER.error("%s", reason)
+        else:
+            _LOGGER.debug("%s", reason)
+
+    async def _fetch_status(self, charger_name: str) -> dict:
+        """
+        Fetch the status within the concurrency limit and the request timeout.
+
+        If the metrics are enabled, the wait for a concurrency slot, the request duration
+        and the exception type of a failed request are recorded.
+        """
+        metrics: MetricsRegistry | None = self._hass.data[DOMAIN][INIT_STATE].get(
+            METRICS, None
+        )
+
+        if metrics is None:
+            async with self._semaphore:
+                return await asyncio.wait_for(
+                    fetch_status(self._hass, charger_name), self._request_timeout
+                )
+
+        wait_start: float = time.monotonic()
+
+        async with self._semaphore:
+            fetch_start: float = time.monotonic()
+
+            try:
+                fetched_data: dict = await asyncio.wait_for(
+                    fetch_status(self._hass, charger_name), self._request_timeout
+                )
+            except (asyncio.TimeoutError, aiohttp.ClientError, RuntimeError) as ex:
+                metrics.observe_fetch(
+                    charger_name,
+                    fetch_start - wait_start,
+                    time.monotonic() - fetch_start,
+                    ex,
+                )
+                raise
+
+            metrics.observe_fetch(
+                charger_name, fetch_start - wait_start, time.monotonic() - fetch_start
+            )
+
+            return fetched_data
+
+    async def fetch_charger_state(
+        self, charger_name: str, current_data: dict
+    ) -> ChargerState:
+        """
+        Fetch state of a single charger. If it fails, mark the last known state offline.
+
+        If the circuit breaker of the charger is open or the API quota is reached,
+        the last known state is returned without calling the API.
+        """
+
+        chargers_api: dict = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API]
+        breaker: CircuitBreaker = self.breakers[charger_name]
+
+        if not breaker.allow_request():
+            return self._last_known_state(charger_name, current_data)
+
+        try:
+            fetched_data: dict = await self._fetch_status(charger_name)
+
+            if (
+                fetched_data.get("success", None) is False
+                and fetched_data.get("msg", None) == "Wallbox is offline"
+            ):
+                self._record_failure(charger_name, f"Device {charger_name} is offline")
+                return self._offline_state(charger_name, current_data)
+
+            self.last_status[charger_name] = fetched_data
+
+            if breaker.consecutive_failures:
+                _LOGGER.info("Device %s is reachable again", charger_name)
+
+            breaker.record_success()
+
+            return ChargerState.from_status(
+                fetched_data, chargers_api[charger_name][CONF_NAME]
+            )
+        except RateLimitedError as ex:
+            _LOGGER.debug("Skipping the poll of the device %s: %s", charger_name, ex)
+            breaker.release_probe()
+            return self._last_known_state(charger_name, current_data)
+        except asyncio.TimeoutError:
+            self._record_failure(
+                charger_name, f"Request to the device {charger_name} timed out"
+            )
+        except (aiohttp.ClientError, RuntimeError):
+            self._record_failure(
+                charger_name, f"Can't connect to the device {charger_name}"
+            )
+
+        return self._offline_state(charger_name, current_data)
 
     async def fetch_states(self) -> dict:
         """
         Fetch go-e Charger Cloud car status via API.
 
-        Fetched data will be enhanced with the:
+        Fetched data are parsed into a ChargerState per charger, enhanced with the:
         - friendly name of the charger.
+
+        Only the changed attributes are logged, by the coordinator.
         """
 
         _LOGGER.debug("Updating the go-e Charger Cloud coordinator data")
 
-        chargers_api: GoeChargerApi = self._hass.data[DOMAIN][INIT_STATE][CHARGERS_API]
         current_data: dict = self.coordinator.data if self.coordinator.data else {}
-        _LOGGER.debug("Current go-e Charger Cloud coordinator data=%s", current_data)
 
-        updated_data: dict = {}
+        cycle_start: float = time.monotonic()
+        fetched_states: list[ChargerState] = await asyncio.gather(
+            *[
+                self.fetch_charger_state(charger_name, current_data)
+                for charger_name in self.charger_names
+            ]
+        )
+        cycle_duration: float = time.monotonic() - cycle_start
+        self.cycle_durations.add(cycle_duration)
+        self.last_cycle_duration = cycle_duration
+        profiler: Profiler | None = async_get_profiler(self._hass)
 
-        for charger_name in chargers_api.keys():
-            try:
-                fetched_data: dict = await fetch_status(self._hass, charger_name)
-
-                if (
-                    fetched_data.get("success", None) is False
-                    and fetched_data.get("msg", None) == "Wallbox is offline"
-                ):
-                    updated_data[charger_name] = (
-                        current_data if not current_data else current_data[charger_name]
-                    )
-                    updated_data[charger_name][STATUS] = OFFLINE
-                else:
-                    updated_data[charger_name] = fetched_data
-                    updated_data[charger_name][STATUS] = ONLINE
-
-                updated_data[charger_name][CONF_NAME] = chargers_api[charger_name][
-                    CONF_NAME
-                ]
-            except (aiohttp.ClientError, RuntimeError):
-                _LOGGER.error("Can't connect to the device %s", charger_name)
-                updated_data[charger_name] = (
-                    current_data if not current_data else current_data[charger_name]
-                )
-                updated_data[charger_name][STATUS] = OFFLINE
+        if profiler is not None:
+            for charger_name in self.charger_names:
+                profiler.record(charger_name, "fetch_states", cycle_duration)
+
+        updated_data: dict = dict(zip(self.charger_names, fetched_states))
+        timestamp: float = time.time()
+
+        for charger_name, charger_state in updated_data.items():
+            # skipped chargers return their last known state, it's not a new sample
+            if (
+                charger_state.status == ONLINE
+                and charger_state is not current_data.get(charger_name, None)
+            ):
+                self.histories[charger_name].add(timestamp, charger_state)
+
+        _LOGGER.debug(
+            "Fetched %s chargers in %.3f s", len(updated_data), cycle_duration
+        )
+
+        state_cache: StateCache | None = self._hass.data[DOMAIN][INIT_STATE].get(
+            STATE_CACHE, None
+        )
+
+        if state_cache is not None:
+            state_cache.async_save_states(updated_data)
 
-        _LOGGER.debug("Updated go-e Charger Cloud coordinator data=%s", updated_data)
+        if self._scheduler is not None:
+            self.coordinator.update_interval = self._scheduler.next_interval(
+                updated_data
+            )
 
         return updated_data
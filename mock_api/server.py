@@ -1,12 +1,31 @@
-"""Mock API for the go-e Charger Cloud wallbox"""
+"""
+Mock API for the go-e Charger Cloud wallbox.
 
-from flask import Flask, request
+Simulates a fleet of virtual chargers, each identified by the API token (or by the host
+if the request has no token). Requests without a token, like these of the local API, can be
+served by the charger of the local token, so the local and the cloud API share its state.
+Chargers are created on the first request with the default state below. While a car is
+charging, the energy counters advance over time.
 
-app = Flask(__name__)
+Failures are injected via the CLI arguments (or environment variables):
 
-SUPPORTED_CAR_CHANGE_VALUES = ["amp", "frc", "alw", "psm", "acs", "car", "trx"]
+- latency and jitter of each response
+- rate of "Data is outdated" responses of an offline wallbox
+- rate limit of requests per second per charger, exceeding it returns 429.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import time
 
-AGE = False
+from aiohttp import web
+
+SUPPORTED_CAR_CHANGE_VALUES = ["amp", "frc", "alw", "psm", "acs", "car", "trx"]
+VOLTAGE = 230
 
 CAR = {
     "car": 1,
@@ -16,6 +35,7 @@ CAR = {
     "alw": True,
     "acu": None,
     "wh": 1136.361,
+    "eto": 1956999,
     "cdi": {"type": 1, "value": 1956999},
     "mca": 6,
     "ama": 16,
@@ -26,70 +46,276 @@ CAR = {
     "psm": 0,
     "pnp": 0,
     "trx": None,
+    # U (L1, L2, L3, N) in V, I (L1, L2, L3) in 0.1 A, P (L1, L2, L3, N, total), pf
+    "nrg": [VOLTAGE, VOLTAGE, VOLTAGE, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
 }
 
+OUTDATED_RESPONSE = {"success": False, "reason": "Data is outdated", "age": 122}
+
+
+class VirtualCharger:
+    """Single simulated charger with its own state, offline flag and rate limit."""
+
+    def __init__(self, rate_limit: float) -> None:
+        self.state = copy.deepcopy(CAR)
+        self.offline = False
+        self._rate_limit = rate_limit
+        # at least 1 request can be served even if the rate is below 1 request/s
+        self._burst = max(1, rate_limit)
+        self._tokens = self._burst
+        self._updated_at = time.monotonic()
+
+    def advance(self) -> None:
+        """Advance the energy counters since the last request if the car is charging."""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+
+        if self._rate_limit:
+            self._tokens = min(self._tokens + elapsed * self._rate_limit, self._burst)
+
+        # measured current of each connected phase, unknown phases are counted as 1
+        charging = self.state["car"] == 2
+        phases = max(self.state["pnp"], 1)
+
+        for phase in range(3):
+            self.state["nrg"][4 + phase] = (
+                self.state["amp"] * 10 if charging and phase < phases else 0
+            )
+
+        if not charging:
+            return
+
+        energy = self.state["amp"] * VOLTAGE * phases * elapsed / 3600
+        self.state["wh"] = round(self.state["wh"] + energy, 3)
+        self.state["eto"] = round(self.state["eto"] + energy)
+        self.state["cdi"]["value"] += int(elapsed * 1000)
+
+    def take_token(self) -> bool:
+        """Return False if the charger exceeded its rate limit."""
+        if not self._rate_limit:
+            return True
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+
+        return True
+
+    def set_value(self, key: str, raw_value: str) -> None:
+        """Update the state with a JSON encoded value, e.g. from the set request."""
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            value = raw_value
+
+        if key == "psm":
+            self.state["pnp"] = 1 if value == 1 else 3
+
+        if key == "frc":
+            match value:
+                # stop charging
+                case 1:
+                    self.state["car"] = 4
+                # start charging
+                case 2:
+                    self.state["car"] = 2
+                # neutral
+                case _:
+                    pass
+
+        self.state[key] = bool(value) if key == "alw" else value
+
+
+class FleetSimulator:
+    """Fleet of virtual chargers served via the go-e Charger Cloud API."""
+
+    def __init__(
+        self,
+        latency: float,
+        jitter: float,
+        offline_rate: float,
+        rate_limit: float,
+        local_token: str | None = None,
+    ) -> None:
+        self.chargers: dict[str, VirtualCharger] = {}
+        self._local_key = f"Basic {local_token}" if local_token else None
+        self._latency = latency
+        self._jitter = jitter
+        self._offline_rate = offline_rate
+        self._rate_limit = rate_limit
+
+    def _get_charger(self, request: web.Request) -> VirtualCharger:
+        key = (
+            request.headers.get("Authorization", None)
+            or self._local_key
+            or request.host
+        )
 
-@app.route("/api/status", methods=["GET"])
-def car_status() -> dict:
-    """
-    Return mocked car status.
-    """
-
-    if AGE:
-        return {"success": False, "reason": "Data is outdated", "age": 122}, 404
-
-    return CAR
-
-
-@app.route("/api/age/toggle", methods=["GET"])
-def toggle_age() -> dict:
-    """
-    Toggle the age status.
-    """
-    # pylint: disable=global-statement
-    global AGE
-
-    AGE = not AGE
-
-    return {"status": "ok", "value": AGE}
-
-
-@app.route("/api/set", methods=["GET"])
-def car_set() -> dict:
-    """
-    Update mocked car status.
-    """
-    # pylint: disable=global-variable-not-assigned
-    global CAR
-    args = request.args
-
-    for change_value in SUPPORTED_CAR_CHANGE_VALUES:
-        request_value = args.get(change_value, None)
-        if request_value is not None:
-            if change_value == "psm":
-                CAR["pnp"] = request_value
-
-            if change_value == "frc":
-                match request_value:
-                    # stop charging
-                    case "1":
-                        CAR["car"] = 4
-                    # start charging
-                    case "2":
-                        CAR["car"] = 2
-                    # neutral
-                    case _:
-                        pass
-
-            CAR[change_value] = (
-                bool(int(request_value))
-                if change_value == "alw"
-                else int(request_value)
+        if key not in self.chargers:
+            self.chargers[key] = VirtualCharger(self._rate_limit)
+
+        return self.chargers[key]
+
+    async def _handle(
+        self, request: web.Request
+    ) -> tuple[VirtualCharger, web.Response | None]:
+        """Simulate latency, rate limit and offline wallbox. Return the error response if any."""
+        charger = self._get_charger(request)
+        delay = self._latency + random.uniform(-self._jitter, self._jitter)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        charger.advance()
+
+        if not charger.take_token():
+            return charger, web.json_response(
+                {"success": False, "reason": "Too many requests"},
+                status=429,
+                headers={"Retry-After": "1"},
             )
 
-    return CAR
+        if charger.offline or random.random() < self._offline_rate:
+            return charger, web.json_response(OUTDATED_RESPONSE, status=404)
+
+        return charger, None
+
+    async def car_status(self, request: web.Request) -> web.Response:
+        """
+        Return mocked car status. If the filter is provided (e.g. filter=car,amp), return only these keys.
+        """
+        charger, error_response = await self._handle(request)
+
+        if error_response is not None:
+            return error_response
+
+        status_filter = request.query.get("filter", None)
+
+        if status_filter:
+            keys = status_filter.split(",")
+            return web.json_response(
+                {key: value for key, value in charger.state.items() if key in keys}
+            )
+
+        return web.json_response(charger.state)
+
+    async def toggle_age(self, request: web.Request) -> web.Response:
+        """
+        Toggle the age status of the charger.
+        """
+        charger = self._get_charger(request)
+        charger.offline = not charger.offline
+
+        return web.json_response({"status": "ok", "value": charger.offline})
+
+    async def car_set(self, request: web.Request) -> web.Response:
+        """
+        Update mocked car status.
+        """
+        charger, error_response = await self._handle(request)
+
+        if error_response is not None:
+            return error_response
+
+        for change_value in SUPPORTED_CAR_CHANGE_VALUES:
+            request_value = request.query.get(change_value, None)
+
+            if request_value is not None:
+                charger.set_value(change_value, request_value)
+
+        return web.json_response(charger.state)
+
+    async def fleet(self, _request: web.Request) -> web.Response:
+        """
+        Return the state of all simulated chargers.
+        """
+        return web.json_response(
+            {
+                "chargers": len(self.chargers),
+                "charging": sum(
+                    1 for charger in self.chargers.values() if charger.state["car"] == 2
+                ),
+                "offline": sum(
+                    1 for charger in self.chargers.values() if charger.offline
+                ),
+            }
+        )
+
+
+def create_app(
+    latency: float = 0,
+    jitter: float = 0,
+    offline_rate: float = 0,
+    rate_limit: float = 0,
+    local_token: str | None = None,
+) -> web.Application:
+    """Create the mock API application."""
+    simulator = FleetSimulator(latency, jitter, offline_rate, rate_limit, local_token)
+    app = web.Application()
+    app.add_routes(
+        [
+            web.get("/api/status", simulator.car_status),
+            web.get("/api/set", simulator.car_set),
+            web.get("/api/age/toggle", simulator.toggle_age),
+            web.get("/api/fleet", simulator.fleet),
+        ]
+    )
+
+    return app
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("MOCK_PORT", "4000"))
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=float(os.environ.get("MOCK_LATENCY", "0")),
+        help="response latency in seconds",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=float(os.environ.get("MOCK_JITTER", "0")),
+        help="random +/- deviation of the latency in seconds",
+    )
+    parser.add_argument(
+        "--offline-rate",
+        type=float,
+        default=float(os.environ.get("MOCK_OFFLINE_RATE", "0")),
+        help="probability (0 - 1) of the 'Data is outdated' response",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=float(os.environ.get("MOCK_RATE_LIMIT", "0")),
+        help="requests per second per charger before responding with 429, 0 disables it",
+    )
+    parser.add_argument(
+        "--local-token",
+        default=os.environ.get("MOCK_LOCAL_TOKEN", None),
+        help="API token of the charger serving requests without a token (local API)",
+    )
+
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = _parse_args()
 
-    app.run(host="0.0.0.0", port=4000)
+    web.run_app(
+        create_app(
+            args.latency,
+            args.jitter,
+            args.offline_rate,
+            args.rate_limit,
+            args.local_token,
+        ),
+        host="0.0.0.0",
+        port=args.port,
+        access_log=None,
+    )
@@ -0,0 +1 @@
+"""Benchmarks for the go-e Charger Cloud integration."""
@@ -0,0 +1,40 @@
+"""Fixtures for the benchmarks."""
+
+from collections.abc import Generator
+import json
+import os
+from pathlib import Path
+import platform
+import time
+
+import pytest
+
+BENCHMARK_RESULTS_PATH: str = os.environ.get(
+    "BENCHMARK_RESULTS", ".benchmarks/results.json"
+)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Generator[dict, None, None]:
+    """Collect the benchmark metrics and store them as JSON after the session."""
+    results: dict = {}
+
+    yield results
+
+    if not results:
+        return
+
+    path: Path = Path(BENCHMARK_RESULTS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "results": results,
+            },
+            indent=2,
+            sort_keys=True,
+        ),
+        encoding="utf-8",
+    )
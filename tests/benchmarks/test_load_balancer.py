@@ -0,0 +1,42 @@
+"""Benchmark of the site current allocation."""
+
+import random
+import time
+from typing import Any
+
+import pytest
+
+from custom_components.smartenergy_goecharger.load_balancer import (
+    ChargerDemand,
+    allocate_current,
+)
+
+ROUNDS: int = 20
+
+
+@pytest.mark.parametrize("fleet_size", [50, 500])
+def test_benchmark_allocate_current(fleet_size: int, record_property: Any) -> None:
+    """Measure the allocation time of the site current across the fleet."""
+    generator = random.Random(fleet_size)
+    demands: list[ChargerDemand] = [
+        ChargerDemand(
+            f"charger{i}",
+            generator.randint(6, 8),
+            generator.randint(16, 32),
+            generator.choice([1, 3]),
+        )
+        for i in range(fleet_size)
+    ]
+
+    start: float = time.perf_counter()
+
+    for _ in range(ROUNDS):
+        allocations = allocate_current(fleet_size * 8, demands)
+
+    allocation_time: float = (time.perf_counter() - start) / ROUNDS
+
+    record_property("allocation_time_s", allocation_time)
+
+    assert len(allocations) == fleet_size
+    # a recomputation has to fit easily between two coordinator updates
+    assert allocation_time < 0.1
@@ -0,0 +1,75 @@
+"""Microbenchmark of the sensor setup and value computation."""
+
+import json
+import time
+from typing import Any
+from unittest.mock import Mock
+
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.circuit_breaker import CircuitBreaker
+from custom_components.smartenergy_goecharger.const import (
+    API,
+    CHARGERS_API,
+    DOMAIN,
+    INIT_STATE,
+    STATE_FETCHERS,
+)
+from custom_components.smartenergy_goecharger.history import EnergyHistory
+from custom_components.smartenergy_goecharger.model import ChargerState
+from custom_components.smartenergy_goecharger.rate_limiter import TokenBucket
+from custom_components.smartenergy_goecharger.sensor import (
+    HISTORY_SENSOR_DESCRIPTIONS,
+    SENSOR_DESCRIPTIONS,
+    _setup_sensors,
+)
+from homeassistant.core import HomeAssistant
+
+FLEET_SIZE: int = 1000
+
+
+async def test_benchmark_sensor_setup(
+    hass: HomeAssistant, benchmark_results: dict, record_property: Any
+) -> None:
+    """Measure the creation of sensors for 1000 chargers and one read of all values."""
+    state: ChargerState = ChargerState.from_status(
+        json.loads(load_fixture("init_state.json")), "charger"
+    )
+    charger_names: list[str] = [f"charger{i}" for i in range(FLEET_SIZE)]
+    state_fetcher: Mock = Mock(
+        breakers={charger_name: CircuitBreaker() for charger_name in charger_names},
+        histories={charger_name: EnergyHistory() for charger_name in charger_names},
+    )
+    hass.data[DOMAIN] = {
+        "fleet_coordinator": Mock(data=dict.fromkeys(charger_names, state)),
+        INIT_STATE: {
+            STATE_FETCHERS: dict.fromkeys(charger_names, state_fetcher),
+            CHARGERS_API: {
+                charger_name: {API: Mock(rate_limiter=TokenBucket())}
+                for charger_name in charger_names
+            },
+        },
+    }
+
+    start: float = time.perf_counter()
+    sensors: list = _setup_sensors(hass, charger_names, "fleet_coordinator")
+    setup_time: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    values: list = [sensor.native_value for sensor in sensors]
+    native_value_time: float = time.perf_counter() - start
+
+    results: dict = {
+        "sensors": len(sensors),
+        "setup_time_s": setup_time,
+        "native_value_time_s": native_value_time,
+    }
+    benchmark_results[f"sensor_setup[{FLEET_SIZE}]"] = results
+
+    for key, value in results.items():
+        record_property(key, value)
+
+    # value and session sensors, the circuit breaker and the rate limiter sensor of every charger
+    assert len(values) == FLEET_SIZE * (
+        len(SENSOR_DESCRIPTIONS) + len(HISTORY_SENSOR_DESCRIPTIONS) + 2
+    )
@@ -0,0 +1,87 @@
+"""Benchmark of the setup time with and without the state cache."""
+
+from functools import partial
+import json
+import time
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.cache import STORAGE_KEY, STORAGE_VERSION
+from custom_components.smartenergy_goecharger.const import (
+    CONF_CHARGERS,
+    DOMAIN,
+    ONLINE,
+    STATUS,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from ..mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+FLEET_SIZE: int = 100
+# simulated cloud round trip of each request
+LATENCY: float = 0.005
+
+
+@pytest.mark.parametrize("cached", [False, True])
+async def test_benchmark_startup(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    cached: bool,
+    benchmark_results: dict,
+    record_property: Any,
+) -> None:
+    """Measure the setup time of 100 chargers with a cold and a warm state cache."""
+    init_state: dict = json.loads(load_fixture("init_state.json"))
+    charger_names: list[str] = [f"charger{i}" for i in range(FLEET_SIZE)]
+
+    if cached:
+        hass_storage[STORAGE_KEY] = {
+            "version": STORAGE_VERSION,
+            "key": STORAGE_KEY,
+            "data": {
+                charger_name: dict(
+                    init_state, **{STATUS: ONLINE, CONF_NAME: charger_name}
+                )
+                for charger_name in charger_names
+            },
+        }
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=init_state,
+                delays={CHARGER_1["host"]: LATENCY},
+            )
+        ),
+    ):
+        start: float = time.perf_counter()
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: [
+                        [dict(CHARGER_1, name=charger_name)]
+                        for charger_name in charger_names
+                    ]
+                }
+            },
+        )
+        setup_time: float = time.perf_counter() - start
+
+        await hass.async_block_till_done()
+
+    key: str = "warm" if cached else "cold"
+    benchmark_results[f"startup[{FLEET_SIZE}][{key}]"] = {"setup_time_s": setup_time}
+    record_property("setup_time_s", setup_time)
+
+    assert len(hass.states.async_entity_ids()) > FLEET_SIZE
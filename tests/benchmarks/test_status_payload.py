@@ -0,0 +1,33 @@
+"""Benchmark of the status payload size per poll cycle."""
+
+import json
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.api import STATUS_API_KEYS
+from custom_components.smartenergy_goecharger.state import get_status_keys
+
+STATUS: dict = json.loads(load_fixture("status.json"))
+
+
+def _payload_size(payload: dict) -> int:
+    return len(json.dumps(payload).encode("utf-8"))
+
+
+@pytest.mark.parametrize("fleet_size", [1, 100, 1000])
+def test_benchmark_status_payload_per_cycle(
+    fleet_size: int, record_property: Any
+) -> None:
+    """Compare bytes per poll cycle of the full and the filtered status."""
+    raw_keys: list[str] = [STATUS_API_KEYS[key] for key in get_status_keys()]
+    filtered_status: dict = {key: STATUS[key] for key in raw_keys if key in STATUS}
+
+    full_bytes: int = _payload_size(STATUS) * fleet_size
+    filtered_bytes: int = _payload_size(filtered_status) * fleet_size
+
+    record_property("full_bytes_per_cycle", full_bytes)
+    record_property("filtered_bytes_per_cycle", filtered_bytes)
+
+    assert filtered_bytes < full_bytes
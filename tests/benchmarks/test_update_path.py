@@ -0,0 +1,107 @@
+"""Benchmark of the coordinator update path with a synthetic fleet."""
+
+from collections import Counter
+from functools import partial
+import json
+import os
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CONF_CHARGERS,
+    CONF_FLEET_COORDINATOR,
+    DOMAIN,
+    FLEET_COORDINATOR,
+    INIT_STATE,
+    STATE_FETCHERS,
+)
+from custom_components.smartenergy_goecharger.state import StateFetcher
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from ..mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+# the largest fleet takes a while, enable it with BENCHMARK_LARGE_FLEET=1
+FLEET_SIZES: list[int] = [1, 10, 100] + (
+    [1000] if os.environ.get("BENCHMARK_LARGE_FLEET", "") == "1" else []
+)
+
+
+def _create_fleet(fleet_size: int) -> list[list[dict]]:
+    return [[dict(CHARGER_1, name=f"charger{i}")] for i in range(fleet_size)]
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+async def test_benchmark_update_path(
+    hass: HomeAssistant,
+    fleet_size: int,
+    benchmark_results: dict,
+    record_property: Any,
+) -> None:
+    """Measure setup, fetch and state writes of one coordinator tick for N chargers."""
+    counter: Counter = Counter()
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+            )
+        ),
+    ):
+        tracemalloc.start()
+        start: float = time.perf_counter()
+
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: _create_fleet(fleet_size),
+                    CONF_FLEET_COORDINATOR: True,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        setup_time: float = time.perf_counter() - start
+        memory, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        state_fetcher: StateFetcher = hass.data[DOMAIN][INIT_STATE][STATE_FETCHERS][
+            "charger0"
+        ]
+        start = time.perf_counter()
+        await state_fetcher.fetch_states()
+        fetch_time: float = time.perf_counter() - start
+
+        # one coordinator tick, counting the state writes of all entities
+        with patch.object(
+            hass.states, "async_set", wraps=hass.states.async_set
+        ) as async_set:
+            await hass.data[DOMAIN][FLEET_COORDINATOR].async_refresh()
+            await hass.async_block_till_done()
+
+    results: dict = {
+        "setup_time_s": setup_time,
+        "fetch_states_time_s": fetch_time,
+        "memory_per_charger_bytes": memory // fleet_size,
+        "entities": len(hass.states.async_entity_ids()),
+        "state_writes_per_tick": async_set.call_count,
+    }
+    benchmark_results[f"update_path[{fleet_size}]"] = results
+
+    for key, value in results.items():
+        record_property(key, value)
+
+    assert counter["request_status"] >= fleet_size * 2
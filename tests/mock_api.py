@@ -1,15 +1,22 @@
 """Mock API module."""
 
+import asyncio
+from collections import Counter
 from http.client import BAD_REQUEST, OK
 from typing import Any
 
+import aiohttp
+
 from custom_components.smartenergy_goecharger.const import (
     CHARGER_ACCESS,
+    CHARGER_FORCE_CHARGING,
     CHARGER_MAX_CURRENT,
     PHASE_SWITCH_MODE,
     TRANSACTION,
 )
 
+FORCE_CHARGING: dict[int, str] = {0: "neutral", 1: "off", 2: "on"}
+
 
 # pylint: disable=unused-argument
 def mocked_api_requests(*args: Any, **kwargs: Any) -> Any:
@@ -18,41 +25,94 @@ def mocked_api_requests(*args: Any, **kwargs: Any) -> Any:
     class MockResponse:
         """Class handling mocked API responses."""
 
-        def __init__(self, json_data: dict, status_code: int) -> None:
+        def __init__(
+            self,
+            json_data: dict,
+            status_code: int,
+            counter: Counter | None,
+            delays: dict | None,
+            errors: list | None,
+        ) -> None:
             self.json_data = json_data
             self.status_code = status_code
+            self.counter = counter if counter is not None else Counter()
+            self.delays = delays if delays is not None else {}
+            self.errors = errors if errors is not None else []
+            self.rate_limiter = kwargs.get("rate_limiter", None)
+            self.transport = "local" if kwargs.get("local_host", None) else "cloud"
+
+        async def request_status(self) -> dict:
+            """Return data as a JSON, optionally after a delay configured for the host."""
+            self.counter["request_status"] += 1
+            self.counter["request_status_in_flight"] += 1
+            self.counter["request_status_max_in_flight"] = max(
+                self.counter["request_status_max_in_flight"],
+                self.counter["request_status_in_flight"],
+            )
+
+            try:
+                await asyncio.sleep(self.delays.get(args[0], 0))
+            finally:
+                self.counter["request_status_in_flight"] -= 1
+
+            if args[0] in self.errors:
+                raise aiohttp.ClientConnectionError(f"Can't connect to {args[0]}")
 
-        def request_status(self) -> dict:
-            """Return data as a JSON."""
             return self.json_data
 
-        def set_force_charging(self, val: bool) -> bool:
+        async def set_force_charging(self, val: bool) -> bool:
             """Return provided value and update data."""
             self.json_data["charger_force_charging"] = "on" if val else "off"
             return val
 
-        def set_access_control(self, val: int) -> int:
+        async def set_access_control(self, val: int) -> int:
             """Return provided value and update data."""
             self.json_data[CHARGER_ACCESS] = bool(not val)
             return val
 
-        def set_max_current(self, val: int) -> int:
+        async def set_max_current(self, val: int) -> int:
             """Return provided value and update data."""
             self.json_data[CHARGER_MAX_CURRENT] = val
             return val
 
-        def set_phase(self, val: int) -> int:
+        async def set_phase(self, val: int) -> int:
             """Return provided value and update data."""
             self.json_data[PHASE_SWITCH_MODE] = val
             return val
 
-        def set_transaction(self, val: int | None) -> int | None:
+        async def set_transaction(self, val: int | None) -> int | None:
             """Return provided value and update data."""
             self.json_data[TRANSACTION] = val
             return val
 
+        async def set_parameters(self, parameters: dict) -> dict:
+            """Update data with API parameters and return them."""
+            self.counter["set_parameters"] += 1
+            self.counter["set_parameters_values"] += len(parameters)
+
+            for key, value in parameters.items():
+                match key:
+                    case "amp":
+                        self.json_data[CHARGER_MAX_CURRENT] = value
+                    case "frc":
+                        self.json_data[CHARGER_FORCE_CHARGING] = FORCE_CHARGING[value]
+                    case "psm":
+                        self.json_data[PHASE_SWITCH_MODE] = value
+                    case "trx":
+                        self.json_data[TRANSACTION] = value
+                    case "acs":
+                        self.json_data[CHARGER_ACCESS] = bool(not value)
+
+            return parameters
+
     if args[0] in ["http://1.1.1.1", "http://1.1.1.2"]:
         # use .copy() to not mutate the original data
-        return MockResponse(kwargs["data"].copy(), OK)
+        return MockResponse(
+            kwargs["data"].copy(),
+            OK,
+            kwargs.get("counter", None),
+            kwargs.get("delays", None),
+            kwargs.get("errors", None),
+        )
 
     return BAD_REQUEST
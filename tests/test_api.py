@@ -0,0 +1,286 @@
+"""Test go-e Charger Cloud async API client."""
+
+import json
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.smartenergy_goecharger.api import (
+    LOCAL_RETRY_INTERVAL,
+    TRANSPORT_CLOUD,
+    TRANSPORT_LOCAL,
+    GoeChargerAsyncApi,
+    async_get_host_session,
+)
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGER_MAX_CURRENT,
+    CURRENT_L1,
+    CURRENT_L2,
+    CURRENT_L3,
+    CarStatus,
+)
+from homeassistant.core import HomeAssistant
+
+HOST = "http://1.1.1.1"
+LOCAL_HOST = "http://192.168.1.10"
+STATUS: dict = json.loads(load_fixture("status.json"))
+
+
+async def test_api_request_status(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if the status is fetched and mapped into human readable names."""
+    aioclient_mock.get(f"{HOST}/api/status", json=STATUS)
+    api = GoeChargerAsyncApi(HOST, "token", async_get_host_session(hass, HOST))
+
+    status = await api.request_status()
+
+    assert status[CAR_STATUS] == CarStatus.CAR_CHARGING
+    assert status[CHARGER_MAX_CURRENT] == 10
+    assert aioclient_mock.mock_calls[0][3]["Authorization"] == "Basic token"
+
+
+async def test_api_request_status_offline(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if outdated data are reported as an offline wallbox."""
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        json={"success": False, "reason": "Data is outdated", "age": 122},
+        status=404,
+    )
+    api = GoeChargerAsyncApi(HOST, "token", async_get_host_session(hass, HOST))
+
+    assert await api.request_status() == {"success": False, "msg": "Wallbox is offline"}
+
+
+async def test_api_request_status_failed(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if a failed request raises an error."""
+    aioclient_mock.get(f"{HOST}/api/status", json={"success": False})
+    api = GoeChargerAsyncApi(HOST, "token", async_get_host_session(hass, HOST))
+
+    with pytest.raises(RuntimeError):
+        await api.request_status()
+
+
+async def test_api_set_parameters(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if parameters are sent JSON encoded and validated."""
+    aioclient_mock.get(f"{HOST}/api/set", json=dict(STATUS, amp=32))
+    api = GoeChargerAsyncApi(HOST, "token", async_get_host_session(hass, HOST))
+
+    status = await api.set_max_current(40)
+    await api.set_transaction(None)
+
+    assert status[CHARGER_MAX_CURRENT] == 32
+    assert aioclient_mock.mock_calls[0][1].query["amp"] == "32"
+    assert aioclient_mock.mock_calls[1][1].query["trx"] == "null"
+
+    with pytest.raises(ValueError):
+        await api.set_phase(3)
+
+
+async def test_api_session_per_host(hass: HomeAssistant) -> None:
+    """Test if clients of the same host share one session."""
+    assert async_get_host_session(hass, HOST) is async_get_host_session(hass, HOST)
+    assert async_get_host_session(hass, HOST) is not async_get_host_session(
+        hass, "http://1.1.1.2"
+    )
+
+
+async def test_api_request_status_filtered(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if only the requested status keys are fetched via the filter."""
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        params={"filter": "car,amp"},
+        json={"car": STATUS["car"], "amp": STATUS["amp"]},
+    )
+    api = GoeChargerAsyncApi(
+        HOST,
+        "token",
+        async_get_host_session(hass, HOST),
+        status_keys=[CAR_STATUS, CHARGER_MAX_CURRENT],
+    )
+
+    assert await api.request_status() == {
+        CAR_STATUS: CarStatus.CAR_CHARGING,
+        CHARGER_MAX_CURRENT: 10,
+    }
+    assert aioclient_mock.call_count == 1
+
+
+async def test_api_request_status_filtered_phase_currents(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if the phase currents read from the same API key are requested once."""
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        params={"filter": "car,nrg"},
+        json={"car": STATUS["car"], "nrg": STATUS["nrg"]},
+    )
+    api = GoeChargerAsyncApi(
+        HOST,
+        "token",
+        async_get_host_session(hass, HOST),
+        status_keys=[CAR_STATUS, CURRENT_L1, CURRENT_L2, CURRENT_L3],
+    )
+
+    assert await api.request_status() == {
+        CAR_STATUS: CarStatus.CAR_CHARGING,
+        CURRENT_L1: 10.0,
+        CURRENT_L2: 10.1,
+        CURRENT_L3: 9.9,
+    }
+
+
+async def test_api_request_status_filter_fallback(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if the client falls back to the full status for an incomplete filtered status."""
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        params={"filter": "car,amp"},
+        json={"success": False, "msg": "Unknown parameter"},
+    )
+    aioclient_mock.get(f"{HOST}/api/status", json=STATUS)
+    api = GoeChargerAsyncApi(
+        HOST,
+        "token",
+        async_get_host_session(hass, HOST),
+        status_keys=[CAR_STATUS, CHARGER_MAX_CURRENT],
+    )
+
+    assert await api.request_status() == {
+        CAR_STATUS: CarStatus.CAR_CHARGING,
+        CHARGER_MAX_CURRENT: 10,
+    }
+    assert aioclient_mock.call_count == 2
+
+    # the filter is used again by the next request
+    await api.request_status()
+    assert aioclient_mock.call_count == 4
+    assert aioclient_mock.mock_calls[2][1].query["filter"] == "car,amp"
+
+
+async def test_api_request_status_filter_empty_response(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if an empty filtered status is an error and doesn't disable the filter."""
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        params={"filter": "car,amp"},
+        text="Bad Gateway",
+        status=502,
+    )
+    api = GoeChargerAsyncApi(
+        HOST,
+        "token",
+        async_get_host_session(hass, HOST),
+        status_keys=[CAR_STATUS, CHARGER_MAX_CURRENT],
+    )
+
+    with pytest.raises(RuntimeError):
+        await api.request_status()
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        params={"filter": "car,amp"},
+        json={"car": STATUS["car"], "amp": STATUS["amp"]},
+    )
+
+    assert await api.request_status() == {
+        CAR_STATUS: CarStatus.CAR_CHARGING,
+        CHARGER_MAX_CURRENT: 10,
+    }
+    assert aioclient_mock.call_count == 1
+
+
+async def test_api_set_parameters_combined(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if more parameters are sent with a single request."""
+    aioclient_mock.get(f"{HOST}/api/set", json=STATUS)
+    api = GoeChargerAsyncApi(HOST, "token", async_get_host_session(hass, HOST))
+
+    await api.set_parameters({"amp": 16, "psm": 2, "frc": 1, "trx": 0})
+
+    assert aioclient_mock.call_count == 1
+    assert dict(aioclient_mock.mock_calls[0][1].query) == {
+        "amp": "16",
+        "psm": "2",
+        "frc": "1",
+        "trx": "0",
+    }
+
+
+async def test_api_local_transport(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if requests go to the local API without the cloud token."""
+    aioclient_mock.get(f"{LOCAL_HOST}/api/status", json=STATUS)
+    aioclient_mock.get(f"{LOCAL_HOST}/api/set", json={"amp": True})
+    api = GoeChargerAsyncApi(
+        HOST,
+        "token",
+        async_get_host_session(hass, HOST),
+        local_host=LOCAL_HOST,
+        local_session=async_get_host_session(hass, LOCAL_HOST),
+    )
+
+    status = await api.request_status()
+    await api.set_max_current(16)
+
+    assert status[CAR_STATUS] == CarStatus.CAR_CHARGING
+    assert api.transport == TRANSPORT_LOCAL
+    assert aioclient_mock.call_count == 2
+    assert aioclient_mock.mock_calls[0][3] is None
+    assert aioclient_mock.mock_calls[1][1].query["amp"] == "16"
+
+
+async def test_api_local_transport_fallback(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if the cloud is used while the local API fails and the local API is retried later."""
+    aioclient_mock.get(f"{LOCAL_HOST}/api/status", exc=aiohttp.ClientConnectionError)
+    aioclient_mock.get(f"{HOST}/api/status", json=STATUS)
+    api = GoeChargerAsyncApi(
+        HOST,
+        "token",
+        async_get_host_session(hass, HOST),
+        local_host=LOCAL_HOST,
+        local_session=async_get_host_session(hass, LOCAL_HOST),
+    )
+
+    status = await api.request_status()
+    assert status[CAR_STATUS] == CarStatus.CAR_CHARGING
+    assert api.transport == TRANSPORT_CLOUD
+
+    # local API isn't called until the retry interval elapses
+    await api.request_status()
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [
+        f"{LOCAL_HOST}/api/status",
+        f"{HOST}/api/status",
+        f"{HOST}/api/status",
+    ]
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(f"{LOCAL_HOST}/api/status", json=STATUS)
+
+    with patch(
+        "custom_components.smartenergy_goecharger.api.time.monotonic",
+        return_value=1e9 + LOCAL_RETRY_INTERVAL,
+    ):
+        await api.request_status()
+
+    assert api.transport == TRANSPORT_LOCAL
+    assert str(aioclient_mock.mock_calls[0][1]) == f"{LOCAL_HOST}/api/status"
@@ -0,0 +1,151 @@
+"""Test go-e Charger Cloud persistent state cache."""
+
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+import json
+from typing import Any
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    load_fixture,
+)
+
+from custom_components.smartenergy_goecharger.cache import (
+    SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGER_MAX_CURRENT,
+    CONF_CHARGERS,
+    CONF_STATE_CACHE,
+    DOMAIN,
+    ONLINE,
+    STATUS,
+    CarStatus,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util.dt import utcnow
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+async def test_state_cache_restores_stale_state(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test if the cached state is used on boot and refreshed in the background."""
+    charger_name = CHARGER_1[CONF_NAME]
+    counter: Counter = Counter()
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            charger_name: dict(
+                json.loads(load_fixture("init_state.json")),
+                **{
+                    CAR_STATUS: CarStatus.CHARGER_READY_NO_CAR,
+                    STATUS: ONLINE,
+                    CONF_NAME: charger_name,
+                },
+            )
+        },
+    }
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+                delays={CHARGER_1["host"]: 0.1},
+            )
+        ),
+    ):
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+        )
+
+        # setup didn't wait for the charger
+        coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+        assert counter["request_status"] <= 1
+        assert coordinator.data[charger_name].stale
+        assert coordinator.data[charger_name].car_status == (
+            CarStatus.CHARGER_READY_NO_CAR
+        )
+
+        await hass.async_block_till_done()
+
+        assert counter["request_status"] == 1
+        assert not coordinator.data[charger_name].stale
+        assert coordinator.data[charger_name].car_status == CarStatus.CAR_CHARGING
+        assert (
+            hass.states.get(
+                f"sensor.{DOMAIN}_{charger_name}_{CAR_STATUS}"
+            ).attributes.get("stale", None)
+            is None
+        )
+
+
+async def test_state_cache_saves_fetched_state(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test if fetched online states are saved with a delay."""
+    charger_name = CHARGER_1[CONF_NAME]
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+            )
+        ),
+    ):
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+        )
+        await hass.async_block_till_done()
+
+        assert STORAGE_KEY not in hass_storage
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+
+        cached_state: dict = hass_storage[STORAGE_KEY]["data"][charger_name]
+        assert cached_state[CHARGER_MAX_CURRENT] == 2
+        assert cached_state[CAR_STATUS] == CarStatus.CAR_CHARGING
+
+
+async def test_state_cache_disabled(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test if no state is cached with the state_cache option disabled."""
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+            )
+        ),
+    ):
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]], CONF_STATE_CACHE: False}},
+        )
+        await hass.async_block_till_done()
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+
+        assert STORAGE_KEY not in hass_storage
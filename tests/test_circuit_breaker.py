@@ -0,0 +1,154 @@
+"""Test go-e Charger Cloud circuit breaker."""
+
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.circuit_breaker import (
+    ATTR_CIRCUIT_BREAKER,
+    ATTR_CONSECUTIVE_FAILURES,
+    ATTR_NEXT_PROBE,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    DEFAULT_FAILURE_THRESHOLD,
+    CircuitBreaker,
+)
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CONF_CHARGERS,
+    DOMAIN,
+    OFFLINE,
+    ONLINE,
+    STATUS,
+)
+from homeassistant.const import CONF_NAME, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util.dt import utcnow
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+UTCNOW_REFERENCE = f"custom_components.{DOMAIN}.circuit_breaker.dt_util.utcnow"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def test_circuit_breaker_opens_after_threshold() -> None:
+    """Test if the breaker opens after the consecutive failures and skips requests."""
+    breaker = CircuitBreaker(failure_threshold=3, jitter=0)
+
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.allow_request()
+    assert breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow_request()
+
+
+def test_circuit_breaker_half_open_probe() -> None:
+    """Test if a probe is let through after the backoff and its result closes or reopens the breaker."""
+    breaker = CircuitBreaker(
+        failure_threshold=1, base_backoff=timedelta(seconds=30), jitter=0
+    )
+    now = utcnow()
+
+    with patch(UTCNOW_REFERENCE, return_value=now):
+        breaker.record_failure()
+    assert breaker.next_probe == now + timedelta(seconds=30)
+
+    with patch(UTCNOW_REFERENCE, return_value=now + timedelta(seconds=31)):
+        assert breaker.allow_request()
+        assert breaker.state == BREAKER_HALF_OPEN
+        # only a single probe is let through
+        assert not breaker.allow_request()
+        # failed probe doubles the backoff
+        assert breaker.record_failure()
+    assert breaker.next_probe == now + timedelta(seconds=91)
+
+    with patch(UTCNOW_REFERENCE, return_value=now + timedelta(seconds=92)):
+        assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.next_probe is None
+
+
+def test_circuit_breaker_backoff_limits() -> None:
+    """Test if the backoff is capped and jittered."""
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        base_backoff=timedelta(seconds=30),
+        max_backoff=timedelta(seconds=100),
+        jitter=0.2,
+    )
+    now = utcnow()
+
+    with patch(UTCNOW_REFERENCE, return_value=now):
+        for _ in range(10):
+            breaker.record_failure()
+            breaker.state = BREAKER_HALF_OPEN
+
+    assert timedelta(seconds=80) <= breaker.next_probe - now <= timedelta(seconds=120)
+
+
+async def test_circuit_breaker_skips_failing_charger(hass: HomeAssistant) -> None:
+    """Test if a failing charger is skipped by the coordinator and the breaker is exposed."""
+    charger_name: str = CHARGER_1[CONF_NAME]
+    counter: Counter = Counter()
+    errors: list = []
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+                errors=errors,
+            )
+        ),
+    ):
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+        )
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+        entity_id = f"sensor.{DOMAIN}_{charger_name}_{ATTR_CIRCUIT_BREAKER}"
+        errors.append(CHARGER_1["host"])
+        counter.clear()
+
+        for _ in range(DEFAULT_FAILURE_THRESHOLD + 2):
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        # ticks after the breaker opened didn't call the API
+        assert counter["request_status"] == DEFAULT_FAILURE_THRESHOLD
+        assert coordinator.data[charger_name][STATUS] == OFFLINE
+        # the breaker sensor stays available while the charger sensors aren't
+        assert (
+            hass.states.get(f"sensor.{DOMAIN}_{charger_name}_{CAR_STATUS}").state
+            == STATE_UNAVAILABLE
+        )
+        breaker_state = hass.states.get(entity_id)
+        assert breaker_state.state == BREAKER_OPEN
+        assert (
+            breaker_state.attributes[ATTR_CONSECUTIVE_FAILURES]
+            == DEFAULT_FAILURE_THRESHOLD
+        )
+        assert breaker_state.attributes[ATTR_NEXT_PROBE]
+
+        # the probe after the backoff closes the breaker
+        errors.clear()
+        with patch(UTCNOW_REFERENCE, return_value=utcnow() + timedelta(hours=1)):
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert coordinator.data[charger_name][STATUS] == ONLINE
+        assert hass.states.get(entity_id).state == BREAKER_CLOSED
+        assert hass.states.get(entity_id).attributes[ATTR_NEXT_PROBE] is None
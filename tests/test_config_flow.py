@@ -19,7 +19,9 @@ from homeassistant.data_entry_flow import (
 
 from .mock_api import mocked_api_requests
 
-GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.config_flow.GoeChargerApi"
+GO_E_CHARGER_MOCK_REFERENCE = (
+    f"custom_components.{DOMAIN}.config_flow.GoeChargerAsyncApi"
+)
 
 CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
 CHARGER_2: dict = json.loads(load_fixture("charger.json"))[1]
@@ -118,6 +120,29 @@ async def test_config_flow_init(hass: HomeAssistant) -> None:
     assert result_configure["data"] == CHARGER_1
 
 
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(side_effect=partial(mocked_api_requests, data={})),
+)
+async def test_config_flow_local_host(hass: HomeAssistant) -> None:
+    """Test we can configure the local API of the charger and it's validated."""
+    result_init = await _initialize_and_assert_flow(hass)
+    result_configure = await hass.config_entries.flow.async_configure(
+        result_init["flow_id"],
+        dict(CHARGER_1, local_host="192.168.1.10"),
+    )
+    assert result_configure["errors"] == {"base": "invalid_local_host"}
+
+    result_configure = await hass.config_entries.flow.async_configure(
+        result_init["flow_id"],
+        dict(CHARGER_1, local_host="http://192.168.1.10"),
+    )
+    await hass.async_block_till_done()
+
+    assert result_configure["type"] == RESULT_TYPE_CREATE_ENTRY
+    assert result_configure["data"] == dict(CHARGER_1, local_host="http://192.168.1.10")
+
+
 async def test_config_flow_invalid_host(hass: HomeAssistant) -> None:
     """Test an error is created when host is invalid."""
     result_init = await _initialize_and_assert_flow(hass)
@@ -0,0 +1,324 @@
+"""Test go-e Charger Cloud controller."""
+
+import asyncio
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    load_fixture,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.smartenergy_goecharger import async_setup
+from custom_components.smartenergy_goecharger.commands import CONFIRMATION_DELAY
+from custom_components.smartenergy_goecharger.const import (
+    API,
+    CHARGER_FORCE_CHARGING,
+    CHARGER_MAX_CURRENT,
+    CHARGERS_API,
+    CONF_CHARGERS,
+    CONF_FLEET_COORDINATOR,
+    CONF_RATE_LIMIT,
+    DOMAIN,
+    FLEET_COORDINATOR,
+    INIT_STATE,
+    PHASE_SWITCH_MODE,
+    TRANSACTION,
+)
+from custom_components.smartenergy_goecharger.controller import (
+    EVENT_BATCH_RESULT,
+    ChargerController,
+    init_service_data,
+)
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+async def test_controller_merges_commands(hass: HomeAssistant) -> None:
+    """Test if commands sent shortly after each other are merged into one write."""
+    charger_name = CHARGER_1[CONF_NAME]
+    coordinator_name = f"{charger_name}_coordinator"
+    counter: Counter = Counter()
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+            )
+        ),
+    ):
+        assert await async_setup(hass, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}})
+        await hass.async_block_till_done()
+        counter.clear()
+
+        charger_controller = ChargerController(hass)
+        await asyncio.gather(
+            *[
+                charger_controller.change_charging_power(
+                    init_service_data(
+                        {"device_name": charger_name, "charging_power": power},
+                        "change_charging_power",
+                    )
+                )
+                for power in range(5, 11)
+            ],
+            charger_controller.set_phase(
+                init_service_data(
+                    {"device_name": charger_name, "phase": 2}, "set_phase"
+                )
+            ),
+            charger_controller.stop_charging(
+                init_service_data({"device_name": charger_name}, "stop_charging")
+            ),
+        )
+
+        # one write with the latest amp, psm and frc values and no refresh
+        assert counter["set_parameters"] == 1
+        assert counter["set_parameters_values"] == 3
+        assert counter["request_status"] == 0
+
+        data: dict = hass.data[DOMAIN][coordinator_name].data[charger_name]
+        assert data[CHARGER_MAX_CURRENT] == 10
+        assert data[PHASE_SWITCH_MODE] == 2
+        assert data[CHARGER_FORCE_CHARGING] == "off"
+
+        # delayed confirmation keeps the patched values
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=CONFIRMATION_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        assert counter["request_status"] == 1
+        data = hass.data[DOMAIN][coordinator_name].data[charger_name]
+        assert data[CHARGER_MAX_CURRENT] == 10
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_controller_rolls_back_unconfirmed_change(hass: HomeAssistant) -> None:
+    """Test if the optimistic update is rolled back if the charger disagrees."""
+    charger_name = CHARGER_1[CONF_NAME]
+    coordinator_name = f"{charger_name}_coordinator"
+    assert await async_setup(hass, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}})
+    await hass.async_block_till_done()
+
+    await ChargerController(hass).change_charging_power(
+        init_service_data(
+            {"device_name": charger_name, "charging_power": 10},
+            "change_charging_power",
+        )
+    )
+    assert (
+        hass.data[DOMAIN][coordinator_name].data[charger_name][CHARGER_MAX_CURRENT]
+        == 10
+    )
+
+    # charger didn't apply the change
+    hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][API].json_data[
+        CHARGER_MAX_CURRENT
+    ] = 2
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRMATION_DELAY + 1))
+    await hass.async_block_till_done()
+
+    assert (
+        hass.data[DOMAIN][coordinator_name].data[charger_name][CHARGER_MAX_CURRENT] == 2
+    )
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_controller_keeps_change_not_fetched(hass: HomeAssistant) -> None:
+    """Test if a change of an attribute missing in the fetched status isn't rolled back."""
+    charger_name = CHARGER_1[CONF_NAME]
+    coordinator_name = f"{charger_name}_coordinator"
+    assert await async_setup(hass, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}})
+    await hass.async_block_till_done()
+
+    await ChargerController(hass).set_transaction(
+        init_service_data({"device_name": charger_name, "status": 0}, "set_transaction")
+    )
+    hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][API].json_data.pop(
+        TRANSACTION
+    )
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRMATION_DELAY + 1))
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][coordinator_name].data[charger_name][TRANSACTION] == 0
+
+
+async def test_controller_confirms_change_via_api(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if the confirmation fetched by the API client keeps the applied change."""
+    charger_name = CHARGER_1[CONF_NAME]
+    coordinator_name = f"{charger_name}_coordinator"
+    status: dict = json.loads(load_fixture("status.json"))
+    aioclient_mock.get(f"{CHARGER_1[CONF_HOST]}/api/status", json=status)
+    # the token bucket refills in real time, the confirmation poll must not be skipped
+    assert await async_setup(
+        hass, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]], CONF_RATE_LIMIT: 100}}
+    )
+    await hass.async_block_till_done()
+
+    aioclient_mock.clear_requests()
+    # charger applies the force charging, but not the current
+    aioclient_mock.get(
+        f"{CHARGER_1[CONF_HOST]}/api/status", json=dict(status, frc=1, trx=0)
+    )
+    aioclient_mock.get(
+        f"{CHARGER_1[CONF_HOST]}/api/set", json={"frc": True, "amp": True, "trx": True}
+    )
+    charger_controller = ChargerController(hass)
+    await asyncio.gather(
+        charger_controller.stop_charging(
+            init_service_data({"device_name": charger_name}, "stop_charging")
+        ),
+        charger_controller.change_charging_power(
+            init_service_data(
+                {"device_name": charger_name, "charging_power": 12},
+                "change_charging_power",
+            )
+        ),
+        charger_controller.set_transaction(
+            init_service_data(
+                {"device_name": charger_name, "status": 0}, "set_transaction"
+            )
+        ),
+    )
+    data: dict = hass.data[DOMAIN][coordinator_name].data[charger_name]
+    assert data[CHARGER_FORCE_CHARGING] == "off"
+    assert data[CHARGER_MAX_CURRENT] == 12
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRMATION_DELAY + 1))
+    await hass.async_block_till_done()
+
+    # confirmation requests the written keys and rolls back only the rejected one
+    status_filter: str = aioclient_mock.mock_calls[-1][1].query["filter"]
+    assert {"frc", "trx", "amp"} <= set(status_filter.split(","))
+    data = hass.data[DOMAIN][coordinator_name].data[charger_name]
+    assert data[CHARGER_FORCE_CHARGING] == "off"
+    assert data[TRANSACTION] == 0
+    assert data[CHARGER_MAX_CURRENT] == 10
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_controller_without_coordinator_data(hass: HomeAssistant) -> None:
+    """Test if a command is sent even if the coordinator has no data to patch yet."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup(hass, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}})
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+    coordinator.data = None
+
+    await ChargerController(hass).change_charging_power(
+        init_service_data(
+            {"device_name": charger_name, "charging_power": 10},
+            "change_charging_power",
+        )
+    )
+    assert coordinator.data is None
+    assert (
+        hass.data[DOMAIN][INIT_STATE][CHARGERS_API][charger_name][API].json_data[
+            CHARGER_MAX_CURRENT
+        ]
+        == 10
+    )
+
+    # the confirmation doesn't fail without the data either, the next poll brings it
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRMATION_DELAY + 1))
+    await hass.async_block_till_done()
+
+    await coordinator.async_refresh()
+    assert coordinator.data[charger_name][CHARGER_MAX_CURRENT] == 10
+
+
+async def test_controller_batch_change_charging(hass: HomeAssistant) -> None:
+    """Test if more chargers are changed with one service call and refreshed once."""
+    counter: Counter = Counter()
+    chargers: list[list[dict]] = [
+        [dict(CHARGER_1, name=f"charger{i}")] for i in range(3)
+    ]
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+            )
+        ),
+    ):
+        assert await async_setup(
+            hass, {DOMAIN: {CONF_CHARGERS: chargers, CONF_FLEET_COORDINATOR: True}}
+        )
+        await hass.async_block_till_done()
+        counter.clear()
+        events = async_capture_events(hass, EVENT_BATCH_RESULT)
+
+        await hass.services.async_call(
+            DOMAIN,
+            "batch_change_charging",
+            service_data={
+                "targets": [
+                    {"device_name": "charger0", "charging_power": 6},
+                    {"device_name": "charger1", "charging_power": 8, "charging": True},
+                    {"device_name": "charger2", "charging": False},
+                    {"device_name": "unknown", "charging_power": 6},
+                ]
+            },
+            blocking=True,
+        )
+
+        assert events[0].data["results"] == {
+            "charger0": "success",
+            "charger1": "success",
+            "charger2": "success",
+            "unknown": "unknown device",
+        }
+        # one write per charger and one refresh of the shared coordinator
+        assert counter["set_parameters"] == 3
+        assert counter["request_status"] == 3
+
+        data: dict = hass.data[DOMAIN][FLEET_COORDINATOR].data
+        assert data["charger0"][CHARGER_MAX_CURRENT] == 6
+        assert data["charger1"][CHARGER_MAX_CURRENT] == 8
+        assert data["charger1"][CHARGER_FORCE_CHARGING] == "on"
+        assert data["charger2"][CHARGER_FORCE_CHARGING] == "off"
@@ -0,0 +1,143 @@
+"""Test go-e Charger Cloud coordinator change tracking."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    load_fixture,
+)
+
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGER_MAX_CURRENT,
+    CONF_CHANGE_EVENTS,
+    CONF_CHARGERS,
+    DOMAIN,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.coordinator import (
+    EVENT_ATTRIBUTE_CHANGED,
+    compute_delta,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def test_compute_delta() -> None:
+    """Test if only changed, added and removed keys of known chargers are in the delta."""
+    charger1 = {"car_status": 1, "wh": 10, "amp": 6}
+    charger2 = {"car_status": 1}
+
+    assert compute_delta(
+        {"charger1": charger1, "charger2": charger2},
+        {
+            "charger1": {"car_status": 2, "wh": 10, "trx": 0},
+            "charger2": charger2,
+            "charger3": {"car_status": 1},
+        },
+    ) == {"charger1": {"car_status": (1, 2), "amp": (6, None), "trx": (None, 0)}}
+    assert compute_delta({}, {"charger1": charger1}) == {}
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_coordinator_key_listeners(hass: HomeAssistant) -> None:
+    """Test if key listeners and events get only the changed attributes."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]], CONF_CHANGE_EVENTS: True}}
+    )
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+    events = async_capture_events(hass, EVENT_ATTRIBUTE_CHANGED)
+    car_status_changes: list = []
+    remove_key_listener = coordinator.async_add_key_listener(
+        charger_name,
+        CAR_STATUS,
+        lambda *change: car_status_changes.append(change),
+    )
+
+    # unchanged data
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.delta == {}
+    assert not events
+
+    data = dict(coordinator.data)
+    data[charger_name] = data[charger_name].replace(
+        **{CAR_STATUS: CarStatus.CHARGING_FINISHED_DISCONNECT, CHARGER_MAX_CURRENT: 6},
+    )
+    coordinator.async_set_updated_data(data)
+    await hass.async_block_till_done()
+
+    assert car_status_changes == [
+        (
+            charger_name,
+            CAR_STATUS,
+            CarStatus.CAR_CHARGING,
+            CarStatus.CHARGING_FINISHED_DISCONNECT,
+        )
+    ]
+    # a single event per charger and update
+    assert len(events) == 1
+    assert events[0].data == {
+        "device_name": charger_name,
+        "changes": {
+            CAR_STATUS: {
+                "old_value": CarStatus.CAR_CHARGING,
+                "new_value": CarStatus.CHARGING_FINISHED_DISCONNECT,
+            },
+            CHARGER_MAX_CURRENT: {"old_value": 2, "new_value": 6},
+        },
+    }
+
+    remove_key_listener()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(car_status_changes) == 1
+    assert coordinator.delta[charger_name][CAR_STATUS][1] == CarStatus.CAR_CHARGING
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_coordinator_change_events_disabled(hass: HomeAssistant) -> None:
+    """Test if no events are fired unless change_events is enabled."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+    )
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+    events = async_capture_events(hass, EVENT_ATTRIBUTE_CHANGED)
+
+    data = dict(coordinator.data)
+    data[charger_name] = data[charger_name].replace(**{CHARGER_MAX_CURRENT: 6})
+    coordinator.async_set_updated_data(data)
+    await hass.async_block_till_done()
+
+    assert coordinator.delta == {charger_name: {CHARGER_MAX_CURRENT: (2, 6)}}
+    assert not events
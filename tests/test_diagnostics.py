@@ -0,0 +1,146 @@
+"""Test go-e Charger Cloud diagnostics."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    load_fixture,
+)
+
+from custom_components.smartenergy_goecharger import async_setup
+from custom_components.smartenergy_goecharger.const import CONF_CHARGERS, DOMAIN
+from custom_components.smartenergy_goecharger.diagnostics import (
+    EVENT_DIAGNOSTICS,
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+async def _setup_entry(hass: HomeAssistant, charger_name: str) -> MockConfigEntry:
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="added_charger",
+        data=CHARGER_1,
+        options=CHARGER_1,
+        entry_id=charger_name,
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    return config_entry
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
+    """Test if the config is redacted and the runtime state of the charger is included."""
+    charger_name = "test"
+    config_entry = await _setup_entry(hass, charger_name)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["config"]["options"]["api_token"] == REDACTED
+    assert diagnostics["config"]["options"]["host"] == REDACTED
+    assert diagnostics["config"]["data"]["name"] == CHARGER_1["name"]
+
+    charger = diagnostics["charger"]
+    assert charger["last_status"]["car_status"] == "Car is charging"
+    assert charger["circuit_breaker"] == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "next_probe": None,
+    }
+    assert charger["coordinator"]["chargers"] == 1
+    assert charger["coordinator"]["update_interval"] == 10
+    assert charger["coordinator"]["last_update_success"] is True
+    # cycle durations are collected even if the timing is disabled
+    assert charger["coordinator"]["last_cycle_duration"] is not None
+    assert charger["coordinator"]["cycle_durations"]["count"] >= 1
+    assert charger["rate_limiter"]["rejected_polls"] == 0
+    assert charger["rate_limiter"]["paused_until"] is None
+    assert charger["transport"] == "cloud"
+    assert charger["cache"]["state_cache_hits"] == 0
+    assert charger["cache"]["state_cache_misses"] == 1
+    # timing is disabled by default
+    assert charger["timings"] is None
+
+    # the snapshot is serializable
+    json.dumps(diagnostics)
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_device_diagnostics(hass: HomeAssistant) -> None:
+    """Test if the charger device is registered and its diagnostics are returned."""
+    charger_name = "test"
+    config_entry = await _setup_entry(hass, charger_name)
+
+    device = dr.async_get(hass).async_get_device({(DOMAIN, charger_name)})
+    assert device is not None
+    assert config_entry.entry_id in device.config_entries
+
+    diagnostics = await async_get_device_diagnostics(hass, config_entry, device)
+
+    assert diagnostics["config"]["options"]["api_token"] == REDACTED
+    assert diagnostics["charger"]["last_status"]["car_status"] == "Car is charging"
+    assert diagnostics["charger"]["coordinator"]["cycle_durations"]["count"] >= 1
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_diagnostics_service(hass: HomeAssistant) -> None:
+    """Test if the diagnostics of the chargers from the configuration.yaml are fired."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup(hass, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}})
+    await hass.async_block_till_done()
+    events = async_capture_events(hass, EVENT_DIAGNOSTICS)
+
+    await hass.services.async_call(
+        DOMAIN, "diagnostics", {"device_name": charger_name}, blocking=True
+    )
+
+    assert len(events) == 1
+    charger = events[0].data["diagnostics"][charger_name]
+    assert charger["last_status"]["car_status"] == "Car is charging"
+    assert charger["coordinator"]["cycle_durations"]["count"] >= 1
+    assert charger["transport"] == "cloud"
+
+    # unknown chargers are skipped
+    await hass.services.async_call(
+        DOMAIN, "diagnostics", {"device_name": "unknown"}, blocking=True
+    )
+    assert events[1].data["diagnostics"] == {}
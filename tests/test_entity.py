@@ -0,0 +1,69 @@
+"""Test go-e Charger Cloud entity change detection."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CONF_CHARGERS,
+    DOMAIN,
+    INIT_STATE,
+    SUPPRESSED_WRITES,
+    CarStatus,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_entities_write_only_changed_state(hass: HomeAssistant) -> None:
+    """Test if entities skip the state write if nothing changed on the update."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+    )
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+    entities = len(hass.states.async_entity_ids())
+
+    with patch.object(
+        hass.states, "async_set", wraps=hass.states.async_set
+    ) as async_set:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert async_set.call_count == 0
+        assert hass.data[DOMAIN][INIT_STATE][SUPPRESSED_WRITES][charger_name] == (
+            entities
+        )
+
+        data = dict(coordinator.data)
+        data[charger_name] = data[charger_name].replace(
+            **{CAR_STATUS: CarStatus.CHARGING_FINISHED_DISCONNECT}
+        )
+        coordinator.async_set_updated_data(data)
+        await hass.async_block_till_done()
+
+        # car status sensor and the wallbox control button (its name changed)
+        assert {call.args[0] for call in async_set.call_args_list} == {
+            f"sensor.{DOMAIN}_{charger_name}_{CAR_STATUS}",
+            f"button.{DOMAIN}_{charger_name}_wallbox_control",
+        }
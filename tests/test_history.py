@@ -0,0 +1,227 @@
+"""Test go-e Charger Cloud energy history and session aggregation."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGING_POWER,
+    CONF_CHARGERS,
+    CURRENT_L1,
+    CURRENT_L2,
+    CURRENT_L3,
+    DOMAIN,
+    ENERGY_SINCE_CAR_CONNECTED,
+    ENERGY_TOTAL,
+    INIT_STATE,
+    SESSION_AVERAGE_POWER,
+    SESSION_ENERGY,
+    SESSION_PEAK_CURRENT,
+    STATE_FETCHERS,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.history import (
+    MAX_POWER_SAMPLE_GAP,
+    EnergyHistory,
+    PowerEstimator,
+)
+from custom_components.smartenergy_goecharger.model import ChargerState
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def _state(
+    car_status: CarStatus,
+    energy_total: float,
+    current: float = 16,
+    energy_since_car_connected: float = 0,
+) -> ChargerState:
+    return ChargerState(
+        **{
+            CAR_STATUS: car_status,
+            ENERGY_TOTAL: energy_total,
+            # the highest of the measured phase currents is the current of the sample
+            CURRENT_L1: current / 2,
+            CURRENT_L2: current,
+            CURRENT_L3: None,
+            ENERGY_SINCE_CAR_CONNECTED: energy_since_car_connected,
+        }
+    )
+
+
+def test_history_ring_buffer_bounded() -> None:
+    """Test if the oldest samples are overwritten once the buffer is full."""
+    history = EnergyHistory(size=3)
+
+    for i in range(5):
+        history.add(i, _state(CarStatus.CHARGER_READY_NO_CAR, 1000 + i, i))
+
+    assert history.count == 3
+    assert history.samples() == [(2, 1002, 2), (3, 1003, 3), (4, 1004, 4)]
+
+    # states without energy are not samples
+    history.add(5, ChargerState())
+    assert history.count == 3
+
+
+def test_history_session_aggregation() -> None:
+    """Test if a session starts and ends with the car connection and is aggregated."""
+    history = EnergyHistory(size=2)
+    history.add(0, _state(CarStatus.CHARGER_READY_NO_CAR, 10_000))
+    assert history.session_energy is None
+
+    history.add(0, _state(CarStatus.CAR_CONNECTED_AUTH_REQUIRED, 10_000))
+    history.add(1800, _state(CarStatus.CAR_CHARGING, 13_500, 16))
+    history.add(3600, _state(CarStatus.CAR_CHARGING, 21_000, 10))
+    history.add(3600, _state(CarStatus.CHARGING_FINISHED_DISCONNECT, 21_000, 10))
+
+    # session is longer than the buffer
+    assert history.session_active
+    assert history.session_energy == 11
+    assert history.session_average_power == 11
+    assert history.session_peak_current == 16
+
+    # last session is kept after the car is disconnected
+    history.add(4000, _state(CarStatus.CHARGER_READY_NO_CAR, 21_000))
+    assert not history.session_active
+    assert history.session_energy == 11
+
+    # a new session resets the aggregates
+    history.add(5000, _state(CarStatus.CAR_CHARGING, 21_000, 6))
+    assert history.session_energy == 0
+    assert history.session_average_power is None
+    assert history.session_peak_current == 6
+
+
+def test_history_session_in_progress() -> None:
+    """Test if a session in progress on the first sample includes the energy since the car connected."""
+    history = EnergyHistory()
+    history.add(0, _state(CarStatus.CAR_CHARGING, 15_000, 16, 5_000))
+    history.add(3600, _state(CarStatus.CAR_CHARGING, 18_000, 16, 8_000))
+
+    assert history.session_energy == 8
+    # only the observed energy counts for the average
+    assert history.session_average_power == 3
+
+
+def test_power_estimator_smoothing() -> None:
+    """Test if the power is computed from the energy deltas and smoothed."""
+    power = PowerEstimator(time_constant=60)
+    power.update(0, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=0))
+    assert power.value is None
+
+    # 30 Wh in 10 s = 10.8 kW
+    power.update(10, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=30))
+    assert power.value == 10.8
+
+    # power drops to 3.6 kW, the EMA follows it gradually
+    power.update(20, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=40))
+    assert 3.6 < power.value < 10.8
+
+    for i in range(3, 100):
+        power.update(
+            i * 10,
+            _state(
+                CarStatus.CAR_CHARGING, 0, energy_since_car_connected=40 + (i - 2) * 10
+            ),
+        )
+    assert power.value == 3.6
+
+
+def test_power_estimator_resets_and_gaps() -> None:
+    """Test if counter resets and offline gaps don't produce power spikes."""
+    power = PowerEstimator()
+    power.update(0, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=500))
+    power.update(10, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=510))
+    assert power.value == 3.6
+
+    # counter reset, e.g. a new car connected
+    power.update(20, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=0))
+    assert power.value == 3.6
+
+    # energy charged during an offline gap is not spread over the gap
+    gap_end = 20 + MAX_POWER_SAMPLE_GAP + 1
+    power.update(
+        gap_end, _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=5000)
+    )
+    assert power.value == 3.6
+    power.update(
+        gap_end + 10,
+        _state(CarStatus.CAR_CHARGING, 0, energy_since_car_connected=5010),
+    )
+    assert power.value == 3.6
+
+    # no power without charging
+    power.update(
+        gap_end + 20,
+        _state(
+            CarStatus.CHARGING_FINISHED_DISCONNECT, 0, energy_since_car_connected=5010
+        ),
+    )
+    assert power.value == 0
+
+
+def test_power_estimator_total_energy_fallback() -> None:
+    """Test if the total energy is used without the energy since the car connected."""
+    power = PowerEstimator()
+    power.update(
+        0, ChargerState(**{CAR_STATUS: CarStatus.CAR_CHARGING, ENERGY_TOTAL: 1000})
+    )
+    power.update(
+        3600, ChargerState(**{CAR_STATUS: CarStatus.CAR_CHARGING, ENERGY_TOTAL: 12000})
+    )
+
+    # gap is too long, restarts only
+    assert power.value is None
+
+    power.update(
+        3660, ChargerState(**{CAR_STATUS: CarStatus.CAR_CHARGING, ENERGY_TOTAL: 12100})
+    )
+    assert power.value == 6
+
+
+async def test_history_session_sensors(hass: HomeAssistant) -> None:
+    """Test if the fetched states are added to the history and exposed via the session sensors."""
+    charger_name: str = CHARGER_1[CONF_NAME]
+    data: dict = dict(
+        json.loads(load_fixture("init_state.json")),
+        **{ENERGY_TOTAL: 5000, ENERGY_SINCE_CAR_CONNECTED: 1000},
+    )
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(side_effect=partial(mocked_api_requests, data=data)),
+    ):
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+        )
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][f"{charger_name}_coordinator"]
+        history = hass.data[DOMAIN][INIT_STATE][STATE_FETCHERS][charger_name].histories[
+            charger_name
+        ]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert history.count == 2
+        assert history.session_active
+        assert hass.states.get(
+            f"sensor.{DOMAIN}_{charger_name}_{SESSION_ENERGY}"
+        ).state == str(1.0)
+        assert hass.states.get(
+            f"sensor.{DOMAIN}_{charger_name}_{SESSION_PEAK_CURRENT}"
+        ).state == str(data[CURRENT_L2])
+        assert hass.states.get(
+            f"sensor.{DOMAIN}_{charger_name}_{SESSION_AVERAGE_POWER}"
+        )
+        assert hass.states.get(f"sensor.{DOMAIN}_{charger_name}_{CHARGING_POWER}")
@@ -0,0 +1,272 @@
+"""Test go-e Charger Cloud site load balancing."""
+
+from collections import Counter
+from functools import partial
+import json
+import random
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGER_FORCE_CHARGING,
+    CHARGER_MAX_CURRENT,
+    CONF_CHARGERS,
+    CONF_FLEET_COORDINATOR,
+    CONF_SITE_CURRENT_LIMIT,
+    DOMAIN,
+    FLEET_COORDINATOR,
+    MIN_CHARGING_CURRENT_LIMIT,
+    PHASE_SWITCH_MODE,
+    PHASES_NUMBER_CONNECTED,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.load_balancer import (
+    SITE_PHASES,
+    Allocation,
+    ChargerDemand,
+    allocate_current,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def _load(allocations: dict[str, Allocation]) -> int:
+    return sum(
+        allocation.current * allocation.phases for allocation in allocations.values()
+    )
+
+
+def test_allocate_current_shares_equally() -> None:
+    """Test if the site current is shared equally and the rounding leftover is used."""
+    demands = [ChargerDemand(f"charger{i}", 6, 16, 3) for i in range(3)]
+
+    # the third charger fits only with 1 phase
+    assert allocate_current(16, demands) == {
+        "charger0": Allocation(7, 3),
+        "charger1": Allocation(7, 3),
+        "charger2": Allocation(6, 1),
+    }
+
+
+def test_allocate_current_respects_max_current() -> None:
+    """Test if chargers never get more than their max current."""
+    demands = [
+        ChargerDemand("charger0", 6, 10, 1),
+        ChargerDemand("charger1", 6, 32, 1),
+    ]
+
+    assert allocate_current(32, demands) == {
+        "charger0": Allocation(10, 1),
+        "charger1": Allocation(32, 1),
+    }
+
+
+def test_allocate_current_pauses_chargers_without_capacity() -> None:
+    """Test if chargers are paused if there is no capacity for their min current."""
+    demands = [ChargerDemand(f"charger{i}", 6, 16, 3) for i in range(3)]
+    allocations = allocate_current(6, demands)
+
+    assert allocations["charger0"] == Allocation(6, 3)
+    assert allocations["charger1"] == Allocation(0, 3)
+    assert allocations["charger2"] == Allocation(0, 3)
+
+
+def test_allocate_current_within_site_limit() -> None:
+    """Test if random fleets never exceed the site limit nor the charger limits."""
+    generator = random.Random(42)
+
+    for _ in range(100):
+        site_current_limit = generator.randint(6, 250)
+        demands = [
+            ChargerDemand(
+                f"charger{i}",
+                generator.randint(1, 10),
+                generator.randint(10, 32),
+                generator.choice([1, 3]),
+            )
+            for i in range(generator.randint(0, 50))
+        ]
+        allocations = allocate_current(site_current_limit, demands)
+
+        assert len(allocations) == len(demands)
+        assert _load(allocations) <= site_current_limit * SITE_PHASES
+
+        for demand in demands:
+            allocation = allocations[demand.name]
+            assert allocation.current == 0 or (
+                demand.min_current <= allocation.current <= demand.max_current
+            )
+
+
+async def test_load_manager_applies_allocations(hass: HomeAssistant) -> None:
+    """Test if the site current is split across the charging chargers on updates."""
+    counter: Counter = Counter()
+    chargers: list[list[dict]] = [
+        [dict(CHARGER_1, name=f"charger{i}")] for i in range(3)
+    ]
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+            )
+        ),
+    ):
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: chargers,
+                    CONF_FLEET_COORDINATOR: True,
+                    CONF_SITE_CURRENT_LIMIT: 20,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        # 3 1-phase chargers share 60 phase-amperes
+        coordinator = hass.data[DOMAIN][FLEET_COORDINATOR]
+        assert counter["set_parameters"] == 3
+        assert all(
+            coordinator.data[charger[0][CONF_NAME]][CHARGER_MAX_CURRENT] == 20
+            for charger in chargers
+        )
+
+        # unchanged demands don't trigger any writes
+        counter.clear()
+        coordinator.async_set_updated_data(dict(coordinator.data))
+        await hass.async_block_till_done()
+        assert counter["set_parameters"] == 0
+
+        # charging of one car finished, the others get its share up to their max
+        data = dict(coordinator.data)
+        data["charger2"] = data["charger2"].replace(
+            **{CAR_STATUS: CarStatus.CHARGER_READY_NO_CAR}
+        )
+        coordinator.async_set_updated_data(data)
+        await hass.async_block_till_done()
+
+        assert counter["set_parameters"] == 2
+        assert coordinator.data["charger0"][CHARGER_MAX_CURRENT] == 30
+        assert coordinator.data["charger1"][CHARGER_MAX_CURRENT] == 30
+        assert coordinator.data["charger2"][CHARGER_FORCE_CHARGING] == "neutral"
+
+
+async def test_load_manager_restores_phase_switch_mode(hass: HomeAssistant) -> None:
+    """Test if the original phase switch mode is restored after switching to 1 phase."""
+    chargers: list[list[dict]] = [
+        [dict(CHARGER_1, name=f"charger{i}")] for i in range(2)
+    ]
+    data: dict = dict(
+        json.loads(load_fixture("init_state.json")),
+        **{
+            PHASE_SWITCH_MODE: 0,
+            PHASES_NUMBER_CONNECTED: 3,
+            MIN_CHARGING_CURRENT_LIMIT: 6,
+        },
+    )
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(side_effect=partial(mocked_api_requests, data=data)),
+    ):
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: chargers,
+                    CONF_FLEET_COORDINATOR: True,
+                    CONF_SITE_CURRENT_LIMIT: 8,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        # the second charger fits only with 1 phase
+        coordinator = hass.data[DOMAIN][FLEET_COORDINATOR]
+        assert coordinator.data["charger0"][PHASE_SWITCH_MODE] == 0
+        assert coordinator.data["charger1"][PHASE_SWITCH_MODE] == 1
+
+        # charging of the first car finished, the second charger gets all its phases back
+        data = dict(coordinator.data)
+        data["charger0"] = data["charger0"].replace(
+            **{CAR_STATUS: CarStatus.CHARGER_READY_NO_CAR}
+        )
+        coordinator.async_set_updated_data(data)
+        await hass.async_block_till_done()
+
+        assert coordinator.data["charger1"][PHASE_SWITCH_MODE] == 0
+
+
+async def test_load_manager_releases_disconnected_chargers(hass: HomeAssistant) -> None:
+    """Test if a paused or switched charger is released when its car disconnects."""
+    chargers: list[list[dict]] = [
+        [dict(CHARGER_1, name=f"charger{i}")] for i in range(3)
+    ]
+    data: dict = dict(
+        json.loads(load_fixture("init_state.json")),
+        **{
+            PHASE_SWITCH_MODE: 0,
+            PHASES_NUMBER_CONNECTED: 3,
+            MIN_CHARGING_CURRENT_LIMIT: 6,
+        },
+    )
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(side_effect=partial(mocked_api_requests, data=data)),
+    ):
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: chargers,
+                    CONF_FLEET_COORDINATOR: True,
+                    CONF_SITE_CURRENT_LIMIT: 8,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        # the second charger fits only with 1 phase, the third one is paused
+        coordinator = hass.data[DOMAIN][FLEET_COORDINATOR]
+        assert coordinator.data["charger1"][PHASE_SWITCH_MODE] == 1
+        assert coordinator.data["charger2"][CHARGER_FORCE_CHARGING] == "off"
+
+        # cars of both chargers disconnect
+        data = dict(coordinator.data)
+        for charger_name in ("charger1", "charger2"):
+            data[charger_name] = data[charger_name].replace(
+                **{CAR_STATUS: CarStatus.CHARGER_READY_NO_CAR}
+            )
+        coordinator.async_set_updated_data(data)
+        await hass.async_block_till_done()
+
+        assert coordinator.data["charger1"][PHASE_SWITCH_MODE] == 0
+        assert coordinator.data["charger2"][CHARGER_FORCE_CHARGING] == "neutral"
+
+        # car of the released charger reconnects and charges on its own
+        data = dict(coordinator.data)
+        data["charger2"] = data["charger2"].replace(
+            **{CAR_STATUS: CarStatus.CAR_CHARGING}
+        )
+        coordinator.async_set_updated_data(data)
+        await hass.async_block_till_done()
+
+        assert coordinator.data["charger2"][CHARGER_FORCE_CHARGING] == "neutral"
+        assert coordinator.data["charger2"][PHASE_SWITCH_MODE] == 1
+        assert coordinator.data["charger2"][CHARGER_MAX_CURRENT] == 6
@@ -0,0 +1,217 @@
+"""Test go-e Charger Cloud metrics exporter."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+import aiohttp
+from pytest_homeassistant_custom_component.common import MockConfigEntry, load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CONF_CHARGERS,
+    CONF_METRICS,
+    DOMAIN,
+    INIT_STATE,
+    METRICS,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.metrics import (
+    METRICS_URL,
+    Histogram,
+    MetricsRegistry,
+)
+from custom_components.smartenergy_goecharger.model import ChargerState
+from homeassistant.const import CONF_NAME, EVENT_CALL_SERVICE
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def test_registry_render() -> None:
+    """Test if the charger and health metrics are rendered in the Prometheus text format."""
+    registry = MetricsRegistry()
+    assert registry.render() == ""
+
+    registry.update_charger(
+        "charger1",
+        ChargerState(
+            status="online",
+            car_status=CarStatus.CAR_CHARGING,
+            charger_max_current=16,
+            energy_total=1500.5,
+            phase_switch_mode=1,
+        ),
+    )
+    registry.observe_fetch("charger1", 0.002, 0.3)
+    registry.observe_fetch("charger1", 0, 5, aiohttp.ClientConnectionError())
+    registry.service_calls.inc((("service", "start_charging"),))
+
+    text = registry.render()
+    assert "# TYPE goecharger_charger_current_amperes gauge\n" in text
+    assert 'goecharger_charger_current_amperes{charger="charger1"} 16\n' in text
+    assert (
+        'goecharger_charger_energy_total_watthours{charger="charger1"} 1500.5\n' in text
+    )
+    assert (
+        'goecharger_charger_status{charger="charger1",status="online",'
+        'car_status="Car is charging"} 1\n'
+    ) in text
+    assert 'goecharger_charger_phase_switch_mode{charger="charger1"} 1\n' in text
+    assert (
+        'goecharger_fetch_duration_seconds_bucket{charger="charger1",le="0.5"} 1\n'
+    ) in text
+    assert (
+        'goecharger_fetch_duration_seconds_bucket{charger="charger1",le="+Inf"} 2\n'
+    ) in text
+    assert 'goecharger_fetch_duration_seconds_count{charger="charger1"} 2\n' in text
+    assert (
+        'goecharger_fetch_errors_total{charger="charger1",'
+        'exception="ClientConnectionError"} 1\n'
+    ) in text
+    assert "goecharger_fetch_slot_wait_seconds_count 2\n" in text
+    assert 'goecharger_service_calls_total{service="start_charging"} 1\n' in text
+
+    # the status sample is replaced, not duplicated
+    registry.update_charger("charger1", ChargerState(status="offline"))
+    text = registry.render()
+    assert (
+        'goecharger_charger_status{charger="charger1",status="offline",car_status=""} 0\n'
+        in text
+    )
+    assert 'status="online"' not in text
+    assert 'goecharger_charger_current_amperes{charger="charger1"}' not in text
+
+
+def test_registry_remove_charger() -> None:
+    """Test if all samples of a removed charger are dropped, others are kept."""
+    registry = MetricsRegistry()
+
+    for charger_name in ("charger1", "charger2"):
+        registry.update_charger(
+            charger_name,
+            ChargerState(status="online", charger_max_current=16, energy_total=1.0),
+        )
+        registry.observe_fetch(charger_name, 0, 5, aiohttp.ClientConnectionError())
+
+    registry.remove_charger("charger1")
+    text = registry.render()
+
+    assert 'charger="charger1"' not in text
+    assert 'goecharger_charger_current_amperes{charger="charger2"} 16' in text
+    assert registry.fetch_latency.count((("charger", "charger1"),)) == 0
+    assert registry.fetch_latency.count((("charger", "charger2"),)) == 1
+
+
+def test_histogram_text_is_cached() -> None:
+    """Test if the text of a family is rendered again only after it changed."""
+    histogram = Histogram("test_seconds", "Test.", (1,))
+    histogram.observe((), 0.5)
+    text = histogram.render()
+
+    assert histogram.render() is text
+
+    histogram.observe((), 2)
+    assert histogram.render() is not text
+    assert histogram.count(()) == 2
+    assert 'test_seconds_bucket{le="1"} 1\n' in histogram.render()
+    assert "test_seconds_sum 2.5\n" in histogram.render()
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_metrics_endpoint(hass: HomeAssistant, hass_client) -> None:
+    """Test if the metrics are exported via the HTTP view if enabled."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup_component(hass, "http", {})
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]], CONF_METRICS: True}}
+    )
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN, "stop_charging", {"device_name": charger_name}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    client = await hass_client()
+    response = await client.get(METRICS_URL)
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    text = await response.text()
+    assert f'goecharger_charger_current_amperes{{charger="{charger_name}"}}' in text
+    assert (
+        f'goecharger_fetch_duration_seconds_count{{charger="{charger_name}"}}' in text
+    )
+    assert 'goecharger_service_calls_total{service="stop_charging"} 1\n' in text
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_metrics_disabled(hass: HomeAssistant) -> None:
+    """Test if no metrics are collected by default."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+    )
+    await hass.async_block_till_done()
+
+    assert METRICS not in hass.data[DOMAIN][INIT_STATE]
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_metrics_unload_entry(hass: HomeAssistant) -> None:
+    """Test if the listeners feeding the metrics are removed with the last entry."""
+    entry_id = "test"
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="added_charger",
+        data=CHARGER_1,
+        options=CHARGER_1,
+        entry_id=entry_id,
+    )
+    config_entry.add_to_hass(hass)
+    assert await async_setup_component(hass, "http", {})
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {CONF_METRICS: True}})
+    await hass.async_block_till_done()
+
+    registry: MetricsRegistry = hass.data[DOMAIN][INIT_STATE][METRICS]
+    assert registry.unsub_listeners.keys() == {
+        EVENT_CALL_SERVICE,
+        f"{entry_id}_coordinator",
+    }
+    assert f'charger="{entry_id}"' in registry.render()
+
+    assert await hass.config_entries.async_unload(entry_id)
+    await hass.async_block_till_done()
+
+    assert not registry.unsub_listeners
+    # samples of the unloaded charger aren't exported anymore
+    assert f'charger="{entry_id}"' not in registry.render()
+    assert f"{entry_id}_coordinator" not in hass.data[DOMAIN]
+    assert hass.bus.async_listeners().get(EVENT_CALL_SERVICE, 0) == 0
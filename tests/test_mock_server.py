@@ -0,0 +1,73 @@
+"""Test the mock API server of the go-e Charger Cloud wallbox, it's served on localhost."""
+
+import asyncio
+
+import pytest
+
+from mock_api.server import OUTDATED_RESPONSE, create_app
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_mock_server_status_filter(aiohttp_client) -> None:
+    """Test if only the filtered keys are returned."""
+    client = await aiohttp_client(create_app())
+
+    response = await client.get("/api/status", params={"filter": "car,amp"})
+
+    assert response.status == 200
+    assert await response.json() == {"car": 1, "amp": 10}
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_mock_server_rate_limit(aiohttp_client) -> None:
+    """Test if requests over the rate limit are rejected with the Retry-After header."""
+    client = await aiohttp_client(create_app(rate_limit=1))
+
+    assert (await client.get("/api/status")).status == 200
+
+    response = await client.get("/api/status")
+
+    assert response.status == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_mock_server_offline(aiohttp_client) -> None:
+    """Test if an offline wallbox responds with outdated data."""
+    client = await aiohttp_client(create_app())
+
+    assert (await (await client.get("/api/age/toggle")).json())["value"] is True
+
+    response = await client.get("/api/status")
+
+    assert response.status == 404
+    assert await response.json() == OUTDATED_RESPONSE
+
+    # offline rate injects the outdated responses too
+    client = await aiohttp_client(create_app(offline_rate=1))
+
+    assert (await client.get("/api/status")).status == 404
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_mock_server_energy_advances(aiohttp_client) -> None:
+    """Test if the energy counters and the phase currents advance while a car charges."""
+    client = await aiohttp_client(create_app())
+
+    status = await (await client.get("/api/set", params={"frc": "2"})).json()
+    assert status["car"] == 2
+
+    await asyncio.sleep(0.05)
+    charging_status = await (await client.get("/api/status")).json()
+
+    assert charging_status["wh"] > status["wh"]
+    assert charging_status["cdi"]["value"] > status["cdi"]["value"]
+    assert charging_status["nrg"][4] == status["amp"] * 10
+
+    # stopped car doesn't charge anymore
+    stopped_status = await (await client.get("/api/set", params={"frc": "1"})).json()
+    await asyncio.sleep(0.05)
+
+    assert (await (await client.get("/api/status")).json())["wh"] == stopped_status[
+        "wh"
+    ]
@@ -0,0 +1,62 @@
+"""Test go-e Charger Cloud charger state model."""
+
+import json
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGER_MAX_CURRENT,
+    ENERGY_TOTAL,
+    OFFLINE,
+    ONLINE,
+    STATUS,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.model import ChargerState
+
+
+def test_charger_state_from_status() -> None:
+    """Test if the mapped API status is parsed into typed attributes."""
+    state = ChargerState.from_status(
+        dict(
+            json.loads(load_fixture("init_state.json")),
+            **{ENERGY_TOTAL: 1200, "unknown_key": 1},
+        ),
+        "charger1",
+    )
+
+    assert state.car_status is CarStatus.CAR_CHARGING
+    assert state.charger_max_current == 2
+    assert state.energy_total == 1200.0
+    assert state.energy_since_car_connected is None
+    assert state.status == ONLINE
+    assert state.name == "charger1"
+    assert not hasattr(state, "__dict__")
+
+    # mapping compatibility
+    assert state[CAR_STATUS] == CarStatus.CAR_CHARGING
+    assert state.get("unknown_key", None) is None
+    assert dict(state)[CHARGER_MAX_CURRENT] == 2
+
+    with pytest.raises(KeyError):
+        state["unknown_key"]  # pylint: disable=pointless-statement
+
+
+def test_charger_state_replace() -> None:
+    """Test if changes create a new parsed state and keep the original one."""
+    state = ChargerState.from_status({CAR_STATUS: "Unknown status"}, "charger1")
+    replaced_state = state.replace(**{STATUS: OFFLINE, CHARGER_MAX_CURRENT: 6.0})
+
+    assert state.car_status == "Unknown status"
+    assert state.status == ONLINE
+    assert replaced_state.status == OFFLINE
+    assert replaced_state.charger_max_current == 6
+    assert replaced_state != state
+    assert replaced_state.replace(**{STATUS: ONLINE, CHARGER_MAX_CURRENT: None}) == (
+        state
+    )
+
+    with pytest.raises(AttributeError):
+        state.status = OFFLINE
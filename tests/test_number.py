@@ -29,7 +29,7 @@ INIT_STATE_WRONG_LIMITS = dict(
     **{MAX_CHARGING_CURRENT_LIMIT: 4, MIN_CHARGING_CURRENT_LIMIT: 5},
 )
 
-GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerApi"
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
 CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
 
 
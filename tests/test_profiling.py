@@ -0,0 +1,150 @@
+"""Test go-e Charger Cloud timing of the hot paths."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    load_fixture,
+)
+
+from custom_components.smartenergy_goecharger import async_setup, async_setup_entry
+from custom_components.smartenergy_goecharger.const import (
+    CONF_CHARGERS,
+    CONF_PROFILING,
+    DOMAIN,
+    PROFILER,
+)
+from custom_components.smartenergy_goecharger.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.smartenergy_goecharger.profiling import (
+    EVENT_TIMINGS,
+    Profiler,
+    RollingStats,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def test_rolling_stats() -> None:
+    """Test if the percentiles are computed from the kept durations only."""
+    stats = RollingStats(size=100)
+    assert stats.summary() == {"count": 0}
+
+    for duration in range(1, 101):
+        stats.add(duration / 1000)
+
+    assert stats.summary() == {
+        "count": 100,
+        "p50": 50.0,
+        "p95": 95.0,
+        "p99": 99.0,
+        "max": 100.0,
+    }
+
+    # the oldest durations are overwritten
+    for _ in range(50):
+        stats.add(1)
+
+    summary = stats.summary()
+    assert summary["count"] == 150
+    assert summary["p50"] == 100.0
+    assert summary["p95"] == 1000.0
+
+
+def test_profiler_span() -> None:
+    """Test if spans are recorded per charger and span name."""
+    profiler = Profiler()
+
+    with profiler.span("charger1", "fetch_status"):
+        pass
+
+    profiler.record("charger1", "fetch_states", 0.5)
+    profiler.record("charger2", "fetch_states", 0.25)
+
+    assert profiler.summary(["charger1"])["charger1"]["fetch_states"]["p99"] == 500.0
+    assert profiler.summary(["charger1"])["charger1"]["fetch_status"]["count"] == 1
+    assert set(profiler.summary()) == {"charger1", "charger2"}
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_timings_service(hass: HomeAssistant) -> None:
+    """Test if the hot paths are timed only if enabled and the timings are fired."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]], CONF_PROFILING: True}}
+    )
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, EVENT_TIMINGS)
+    await hass.services.async_call(
+        DOMAIN, "stop_charging", {"device_name": charger_name}, blocking=True
+    )
+    await hass.services.async_call(DOMAIN, "timings", {}, blocking=True)
+    await hass.async_block_till_done()
+
+    timings = events[0].data["timings"][charger_name]
+    assert events[0].data["enabled"] is True
+    assert {
+        "fetch_status",
+        "fetch_states",
+        "stop_charging",
+        "write_sensor",
+    } <= timings.keys()
+    assert timings["stop_charging"]["count"] == 1
+
+    # disabling drops the stats
+    await hass.services.async_call(DOMAIN, "timings", {"enabled": False}, blocking=True)
+    await hass.async_block_till_done()
+
+    assert PROFILER not in hass.data
+    assert events[1].data == {"enabled": False, "timings": {}}
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_timings_diagnostics(hass: HomeAssistant) -> None:
+    """Test if the timing enabled via the service is exposed in the diagnostics."""
+    charger_name = "test"
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="added_charger",
+        data=CHARGER_1,
+        options=CHARGER_1,
+        entry_id=charger_name,
+    )
+    assert await async_setup(hass, {})
+    await hass.async_block_till_done()
+    assert PROFILER not in hass.data
+
+    await hass.services.async_call(DOMAIN, "timings", {"enabled": True}, blocking=True)
+    assert await async_setup_entry(hass, config_entry)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert diagnostics["charger"]["timings"]["fetch_status"]["count"] >= 1
+    assert diagnostics["charger"]["timings"]["fetch_states"]["count"] >= 1
@@ -0,0 +1,130 @@
+"""Test go-e Charger Cloud API rate limiter."""
+
+import asyncio
+from datetime import timedelta
+import json
+import time
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.smartenergy_goecharger.api import (
+    GoeChargerAsyncApi,
+    async_get_host_session,
+)
+from custom_components.smartenergy_goecharger.rate_limiter import (
+    DEFAULT_RETRY_AFTER,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    RateLimitedError,
+    TokenBucket,
+    async_get_rate_limiter,
+    parse_retry_after,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+
+HOST = "http://1.1.1.1"
+STATUS: dict = json.loads(load_fixture("status.json"))
+
+
+async def test_rate_limiter_polls_leave_reserve() -> None:
+    """Test if polls are rejected once only the reserve for commands is left."""
+    bucket = TokenBucket(rate=0.01, burst=3)
+
+    await bucket.async_acquire(PRIORITY_POLL)
+    await bucket.async_acquire(PRIORITY_POLL)
+
+    with pytest.raises(RateLimitedError):
+        await bucket.async_acquire(PRIORITY_POLL)
+
+    # the reserved token is left for commands
+    await bucket.async_acquire(PRIORITY_COMMAND)
+    assert bucket.rejected_polls == 1
+    assert bucket.throttled_commands == 0
+    assert bucket.saturation == 1
+
+
+async def test_rate_limiter_commands_wait() -> None:
+    """Test if commands wait for a token and polls are rejected while they wait."""
+    bucket = TokenBucket(rate=20, burst=1)
+    await bucket.async_acquire(PRIORITY_COMMAND)
+
+    start = time.monotonic()
+    command = asyncio.create_task(bucket.async_acquire(PRIORITY_COMMAND))
+    await asyncio.sleep(0)
+
+    with pytest.raises(RateLimitedError):
+        await bucket.async_acquire(PRIORITY_POLL)
+
+    await command
+    assert 0.04 <= time.monotonic() - start < 0.5
+    assert bucket.throttled_commands == 1
+
+
+async def test_rate_limiter_pause() -> None:
+    """Test if a paused bucket rejects polls and delays commands."""
+    bucket = TokenBucket(rate=100, burst=5)
+    bucket.pause(0.1)
+
+    assert bucket.saturation == 1
+    assert bucket.paused_until is not None
+
+    with pytest.raises(RateLimitedError):
+        await bucket.async_acquire(PRIORITY_POLL)
+
+    start = time.monotonic()
+    await bucket.async_acquire(PRIORITY_COMMAND)
+    assert time.monotonic() - start >= 0.09
+    assert bucket.paused_until is None
+
+
+def test_rate_limiter_parse_retry_after() -> None:
+    """Test if Retry-After is parsed from seconds or a HTTP date."""
+    http_date = (utcnow() + timedelta(seconds=120)).strftime(
+        "%a, %d %b %Y %H:%M:%S GMT"
+    )
+
+    assert parse_retry_after("30") == 30
+    assert 110 < parse_retry_after(http_date) <= 120
+    assert parse_retry_after(None) == DEFAULT_RETRY_AFTER
+    assert parse_retry_after("soon") == DEFAULT_RETRY_AFTER
+
+
+async def test_rate_limiter_shared_per_token(hass: HomeAssistant) -> None:
+    """Test if API clients with the same token share the bucket."""
+    assert async_get_rate_limiter(hass, "token") is async_get_rate_limiter(
+        hass, "token"
+    )
+    assert async_get_rate_limiter(hass, "token") is not async_get_rate_limiter(
+        hass, "other_token"
+    )
+
+
+async def test_api_too_many_requests(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test if 429 pauses the bucket for the Retry-After period."""
+    aioclient_mock.get(
+        f"{HOST}/api/status",
+        json={"success": False, "reason": "Too many requests"},
+        status=429,
+        headers={"Retry-After": "30"},
+    )
+    bucket = TokenBucket()
+    api = GoeChargerAsyncApi(
+        HOST, "token", async_get_host_session(hass, HOST), rate_limiter=bucket
+    )
+
+    with pytest.raises(RateLimitedError):
+        await api.request_status()
+
+    assert (
+        timedelta(seconds=29) < bucket.paused_until - utcnow() <= timedelta(seconds=30)
+    )
+
+    # polls aren't sent until the pause ends
+    with pytest.raises(RateLimitedError):
+        await api.request_status()
+    assert aioclient_mock.call_count == 1
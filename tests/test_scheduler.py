@@ -0,0 +1,136 @@
+"""Test go-e Charger Cloud adaptive polling scheduler."""
+
+from datetime import timedelta
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry, load_fixture
+
+from custom_components.smartenergy_goecharger import async_setup, async_setup_entry
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_REQUEST_TIMEOUT,
+    DOMAIN,
+    INIT_STATE,
+    OFFLINE,
+    ONLINE,
+    STATE_FETCHERS,
+    STATUS,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.model import ChargerState
+from custom_components.smartenergy_goecharger.scheduler import (
+    IDLE_INTERVAL_FACTOR,
+    MAX_OFFLINE_INTERVAL,
+    AdaptivePollScheduler,
+)
+from homeassistant.core import HomeAssistant
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+SCAN_INTERVAL = timedelta(seconds=10)
+
+
+def _charger(car_status: CarStatus, status: str = ONLINE) -> ChargerState:
+    return ChargerState(**{STATUS: status, CAR_STATUS: car_status})
+
+
+def test_scheduler_fast_while_charging() -> None:
+    """Test if chargers with an active session are polled with the scan interval."""
+    scheduler = AdaptivePollScheduler(SCAN_INTERVAL)
+
+    assert (
+        scheduler.next_interval({"charger1": _charger(CarStatus.CAR_CHARGING)})
+        == SCAN_INTERVAL
+    )
+    assert (
+        scheduler.next_interval(
+            {"charger1": _charger(CarStatus.CAR_CONNECTED_AUTH_REQUIRED)}
+        )
+        == SCAN_INTERVAL
+    )
+
+
+def test_scheduler_slow_while_idle() -> None:
+    """Test if idle chargers are polled less often."""
+    scheduler = AdaptivePollScheduler(SCAN_INTERVAL)
+
+    assert (
+        scheduler.next_interval({"charger1": _charger(CarStatus.CHARGER_READY_NO_CAR)})
+        == SCAN_INTERVAL * IDLE_INTERVAL_FACTOR
+    )
+    assert (
+        scheduler.next_interval(
+            {"charger1": _charger(CarStatus.CHARGING_FINISHED_DISCONNECT)}
+        )
+        == SCAN_INTERVAL * IDLE_INTERVAL_FACTOR
+    )
+
+
+def test_scheduler_backoff_while_offline() -> None:
+    """Test if offline chargers back off exponentially and reset once online."""
+    scheduler = AdaptivePollScheduler(SCAN_INTERVAL)
+    offline_data = {"charger1": _charger(CarStatus.CAR_CHARGING, OFFLINE)}
+
+    assert scheduler.next_interval(offline_data) == SCAN_INTERVAL
+    assert scheduler.next_interval(offline_data) == SCAN_INTERVAL * 2
+    assert scheduler.next_interval(offline_data) == SCAN_INTERVAL * 4
+
+    for _ in range(10):
+        scheduler.next_interval(offline_data)
+
+    assert scheduler.next_interval(offline_data) == MAX_OFFLINE_INTERVAL
+    assert (
+        scheduler.next_interval({"charger1": _charger(CarStatus.CAR_CHARGING)})
+        == SCAN_INTERVAL
+    )
+    assert scheduler.next_interval(offline_data) == SCAN_INTERVAL
+
+
+def test_scheduler_shortest_interval_wins() -> None:
+    """Test if a coordinator with more chargers uses the shortest interval."""
+    scheduler = AdaptivePollScheduler(SCAN_INTERVAL)
+
+    assert (
+        scheduler.next_interval(
+            {
+                "charger1": _charger(CarStatus.CHARGER_READY_NO_CAR),
+                "charger2": _charger(CarStatus.CAR_CHARGING),
+            }
+        )
+        == SCAN_INTERVAL
+    )
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=json.loads(load_fixture("init_state.json")),
+        )
+    ),
+)
+async def test_scheduler_config_entry_options(hass: HomeAssistant) -> None:
+    """Test if the polling options of a config entry are applied to its coordinator."""
+    options = dict(CHARGER_1, **{CONF_ADAPTIVE_POLLING: True, CONF_REQUEST_TIMEOUT: 2})
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="added_charger",
+        data=options,
+        options=options,
+        entry_id="test",
+    )
+    assert await async_setup(hass, {})
+    await hass.async_block_till_done()
+    assert await async_setup_entry(hass, config_entry)
+    await hass.async_block_till_done()
+
+    state_fetcher = hass.data[DOMAIN][INIT_STATE][STATE_FETCHERS]["test"]
+    # pylint: disable=protected-access
+    assert isinstance(state_fetcher._scheduler, AdaptivePollScheduler)
+    assert state_fetcher._request_timeout == 2
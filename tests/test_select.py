@@ -22,7 +22,7 @@ from homeassistant.core import HomeAssistant
 
 from .mock_api import mocked_api_requests
 
-GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerApi"
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
 CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
 
 
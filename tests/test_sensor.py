@@ -0,0 +1,51 @@
+"""Test go-e Charger Cloud sensors."""
+
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CHARGER_MAX_CURRENT,
+    CONF_CHARGERS,
+    DOMAIN,
+    ENERGY_TOTAL,
+    CarStatus,
+)
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=dict(json.loads(load_fixture("init_state.json")), energy_total=12345),
+        )
+    ),
+)
+async def test_sensor_states(hass: HomeAssistant) -> None:
+    """Test if the sensor states are rendered from the parsed charger state."""
+    charger_name = CHARGER_1[CONF_NAME]
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_CHARGERS: [[CHARGER_1]]}}
+    )
+    await hass.async_block_till_done()
+
+    def state(key: str) -> str:
+        return hass.states.get(f"{SENSOR_DOMAIN}.{DOMAIN}_{charger_name}_{key}").state
+
+    # the car status enum is written as its human readable value
+    assert state(CAR_STATUS) == CarStatus.CAR_CHARGING.value == "Car is charging"
+    assert state(CHARGER_MAX_CURRENT) == "2"
+    assert state(ENERGY_TOTAL) == "12.35"
@@ -0,0 +1,275 @@
+"""Test go-e Charger Cloud coordinator state handling."""
+
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.smartenergy_goecharger import async_setup
+from custom_components.smartenergy_goecharger.api import map_parameters
+from custom_components.smartenergy_goecharger.const import (
+    CAR_STATUS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CHARGERS,
+    CONF_FLEET_COORDINATOR,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    DOMAIN,
+    FLEET_COORDINATOR,
+    OFFLINE,
+    ONLINE,
+    STATUS,
+    CarStatus,
+)
+from custom_components.smartenergy_goecharger.number import NUMBER_INPUTS
+from custom_components.smartenergy_goecharger.scheduler import IDLE_INTERVAL_FACTOR
+from custom_components.smartenergy_goecharger.select import SELECT_INPUTS
+from custom_components.smartenergy_goecharger.sensor import CHARGER_SENSORS_CONFIG
+from custom_components.smartenergy_goecharger.state import get_status_keys
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .mock_api import mocked_api_requests
+
+GO_E_CHARGER_MOCK_REFERENCE = f"custom_components.{DOMAIN}.state.GoeChargerAsyncApi"
+CHARGER_1: dict = json.loads(load_fixture("charger.json"))[0]
+
+
+def test_get_status_keys_covers_platforms_and_commands() -> None:
+    """Test that the status filter covers every key read by the platforms and commands."""
+    platform_keys: set[str] = {
+        *CHARGER_SENSORS_CONFIG["sensors"],
+        *[number_input["id"] for number_input in NUMBER_INPUTS],
+        *[select_input["id"] for select_input in SELECT_INPUTS],
+    } - {CONF_NAME}
+    # parameters written by the commands, their confirmation compares the fetched values
+    command_keys: set[str] = set(
+        map_parameters({"amp": 6, "psm": 1, "frc": 0, "trx": 0, "acs": 0})
+    )
+
+    assert platform_keys | command_keys <= set(get_status_keys())
+
+
+def _create_fleet(fleet_size: int) -> list[list[dict]]:
+    return [[dict(CHARGER_1, name=f"charger{i}")] for i in range(fleet_size)]
+
+
+@pytest.mark.parametrize("fleet_size", [1, 5, 20])
+async def test_fetch_states_scoped_per_charger(
+    hass: HomeAssistant, fleet_size: int
+) -> None:
+    """Test that every coordinator tick polls only the charger it owns."""
+    counter: Counter = Counter()
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+            )
+        ),
+    ):
+        assert await async_setup(
+            hass, {DOMAIN: {CONF_CHARGERS: _create_fleet(fleet_size)}}
+        )
+        await hass.async_block_till_done()
+        counter.clear()
+
+        # one tick of every coordinator
+        for i in range(fleet_size):
+            await hass.data[DOMAIN][f"charger{i}_coordinator"].async_refresh()
+
+        assert counter["request_status"] == fleet_size
+
+        for i in range(fleet_size):
+            assert list(hass.data[DOMAIN][f"charger{i}_coordinator"].data.keys()) == [
+                f"charger{i}"
+            ]
+
+
+@pytest.mark.parametrize("fleet_size", [1, 5, 20])
+async def test_fetch_states_fleet_coordinator(
+    hass: HomeAssistant, fleet_size: int
+) -> None:
+    """Test that the shared fleet coordinator polls every charger once per tick."""
+    counter: Counter = Counter()
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+            )
+        ),
+    ):
+        assert await async_setup(
+            hass,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: _create_fleet(fleet_size),
+                    CONF_FLEET_COORDINATOR: True,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+        counter.clear()
+
+        coordinator = hass.data[DOMAIN][FLEET_COORDINATOR]
+        await coordinator.async_refresh()
+
+        assert counter["request_status"] == fleet_size
+
+        for i in range(fleet_size):
+            assert hass.data[DOMAIN][f"charger{i}_coordinator"] is coordinator
+            assert coordinator.data[f"charger{i}"][CONF_NAME] == f"charger{i}"
+
+
+async def test_async_setup_concurrent_startup(hass: HomeAssistant) -> None:
+    """Test that chargers are initialized concurrently, capped by max concurrent requests."""
+    fleet_size: int = 10
+    max_concurrent_requests: int = 4
+    counter: Counter = Counter()
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+                delays={"http://1.1.1.1": 0.01},
+            )
+        ),
+    ):
+        assert await async_setup(
+            hass,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: _create_fleet(fleet_size),
+                    CONF_MAX_CONCURRENT_REQUESTS: max_concurrent_requests,
+                }
+            },
+        )
+
+        # requests of several chargers overlapped, but never more than the cap
+        assert counter["request_status_max_in_flight"] == max_concurrent_requests
+        # ping and first refresh of every charger
+        assert counter["request_status"] == fleet_size * 2
+        await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("fleet_coordinator", [False, True])
+async def test_async_setup_skips_unreachable_charger(
+    hass: HomeAssistant, fleet_coordinator: bool
+) -> None:
+    """Test that an unreachable charger doesn't fail the setup of the other chargers."""
+    chargers: list[list[dict]] = _create_fleet(2) + [
+        [dict(CHARGER_1, name="unreachable_charger", host="http://1.1.1.2")]
+    ]
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                errors=["http://1.1.1.2"],
+            )
+        ),
+    ):
+        assert await async_setup(
+            hass,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: chargers,
+                    CONF_FLEET_COORDINATOR: fleet_coordinator,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert "unreachable_charger_coordinator" not in hass.data[DOMAIN]
+        for i in range(2):
+            coordinator = hass.data[DOMAIN][f"charger{i}_coordinator"]
+            assert coordinator.data[f"charger{i}"][STATUS] == ONLINE
+            assert hass.states.get(f"sensor.{DOMAIN}_charger{i}_{CAR_STATUS}")
+        assert not hass.states.get(f"sensor.{DOMAIN}_unreachable_charger_{CAR_STATUS}")
+
+
+async def test_fetch_states_concurrent(hass: HomeAssistant) -> None:
+    """Test that chargers are fetched concurrently and slow chargers time out."""
+    fleet_size: int = 10
+    delays: dict = {}
+    counter: Counter = Counter()
+    chargers: list[list[dict]] = _create_fleet(fleet_size) + [
+        [dict(CHARGER_1, name="slow_charger", host="http://1.1.1.2")]
+    ]
+
+    with patch(
+        GO_E_CHARGER_MOCK_REFERENCE,
+        Mock(
+            side_effect=partial(
+                mocked_api_requests,
+                data=json.loads(load_fixture("init_state.json")),
+                counter=counter,
+                delays=delays,
+            )
+        ),
+    ):
+        assert await async_setup(
+            hass,
+            {
+                DOMAIN: {
+                    CONF_CHARGERS: chargers,
+                    CONF_FLEET_COORDINATOR: True,
+                    CONF_MAX_CONCURRENT_REQUESTS: fleet_size + 1,
+                    CONF_REQUEST_TIMEOUT: 0.2,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        delays["http://1.1.1.1"] = 0.05
+        delays["http://1.1.1.2"] = 5
+        coordinator = hass.data[DOMAIN][FLEET_COORDINATOR]
+        counter.clear()
+        await coordinator.async_refresh()
+
+        # all chargers were requested at once, the slow one didn't block the others
+        assert counter["request_status_max_in_flight"] == fleet_size + 1
+        assert coordinator.data["slow_charger"][STATUS] == OFFLINE
+        for i in range(fleet_size):
+            assert coordinator.data[f"charger{i}"][STATUS] == ONLINE
+
+
+@patch(
+    GO_E_CHARGER_MOCK_REFERENCE,
+    Mock(
+        side_effect=partial(
+            mocked_api_requests,
+            data=dict(
+                json.loads(load_fixture("init_state.json")),
+                **{CAR_STATUS: CarStatus.CHARGER_READY_NO_CAR},
+            ),
+        )
+    ),
+)
+async def test_fetch_states_adaptive_polling(hass: HomeAssistant) -> None:
+    """Test that the coordinator update interval follows the car status."""
+    assert await async_setup(
+        hass,
+        {DOMAIN: {CONF_CHARGERS: _create_fleet(1), CONF_ADAPTIVE_POLLING: True}},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN]["charger0_coordinator"].update_interval == timedelta(
+        seconds=10 * IDLE_INTERVAL_FACTOR
+    )